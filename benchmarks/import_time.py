@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""
+Import-time benchmark for the Interview Assistant entry points.
+
+Runs each entry point in a fresh interpreter under ``python -X importtime``
+and reports the total import time, the packages that cost the most, and
+any heavy dependency that was imported eagerly although it should only be
+loaded on first use (google.genai, pdfplumber, python-docx, lxml).
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 7 --top 15
+    python benchmarks/import_time.py --json > import-times.json
+    python benchmarks/import_time.py --budget api=900 --budget cli-help=50
+
+Exits with status 1 when an entry point imports a lazy dependency or
+exceeds its --budget (median milliseconds).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point name -> interpreter arguments after -X importtime
+ENTRY_POINTS: Dict[str, List[str]] = {
+    "cli-help": ["cli.py", "--help"],
+    "cli": ["-c", "import cli, src.agent, src.parsers, src.models"],
+    "api": ["-c", "import src.api.main"],
+    "parse-worker": ["-c", "import src.parsers.pool"],
+}
+
+# Dependencies that must only be imported when first used
+LAZY_MODULES = ("google.genai", "pdfplumber", "pdfminer", "docx", "lxml.etree")
+
+
+class ImportRecord(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+
+
+class Measurement(NamedTuple):
+    entry_point: str
+    total_ms: float
+    modules: int
+    heaviest: List[Tuple[str, float]]
+    eager_lazy_modules: List[str]
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parse the ``-X importtime`` report written to stderr."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us)))
+    return records
+
+
+def measure(entry_point: str, top: int = 10) -> Measurement:
+    """Import an entry point once in a fresh interpreter and summarize the cost."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *ENTRY_POINTS[entry_point]],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{entry_point} failed to start:\n{result.stderr[-2000:]}")
+
+    records = parse_importtime(result.stderr)
+    # Self times summed by top-level package show what each dependency costs on its own
+    by_package: Dict[str, int] = {}
+    for record in records:
+        package = record.name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + record.self_us
+    heaviest = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    names = {record.name for record in records}
+    return Measurement(
+        entry_point=entry_point,
+        total_ms=sum(record.self_us for record in records) / 1000,
+        modules=len(records),
+        heaviest=[(package, self_us / 1000) for package, self_us in heaviest],
+        eager_lazy_modules=sorted(
+            name for name in LAZY_MODULES
+            if name in names or any(module.startswith(name + ".") for module in names)
+        ),
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the import time of each entry point")
+    parser.add_argument("entry_points", nargs="*", metavar="ENTRY_POINT",
+                        help=f"Entry points to measure: {', '.join(ENTRY_POINTS)} (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per entry point; the median is reported")
+    parser.add_argument("--top", type=int, default=8, help="Most expensive packages to list")
+    parser.add_argument("--budget", action="append", default=[], metavar="NAME=MS",
+                        help="Fail if an entry point's median import time exceeds MS milliseconds")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    unknown = set(args.entry_points) - set(ENTRY_POINTS)
+    if unknown:
+        parser.error(f"unknown entry points: {', '.join(sorted(unknown))}")
+
+    budgets = {}
+    for budget in args.budget:
+        name, _, ms = budget.partition("=")
+        budgets[name] = float(ms)
+
+    results = []
+    failed = False
+    for entry_point in args.entry_points or ENTRY_POINTS:
+        runs = [measure(entry_point, args.top) for _ in range(max(1, args.repeat))]
+        median_ms = statistics.median(run.total_ms for run in runs)
+        # Report the package breakdown of the run closest to the median
+        run = min(runs, key=lambda run: abs(run.total_ms - median_ms))
+        over_budget = entry_point in budgets and median_ms > budgets[entry_point]
+        failed = failed or over_budget or bool(run.eager_lazy_modules)
+        results.append({
+            "entry_point": entry_point,
+            "median_ms": round(median_ms, 1),
+            "min_ms": round(min(r.total_ms for r in runs), 1),
+            "modules": run.modules,
+            "budget_ms": budgets.get(entry_point),
+            "eager_lazy_modules": run.eager_lazy_modules,
+            "heaviest": [{"package": name, "ms": round(ms, 1)} for name, ms in run.heaviest],
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            budget = f" (budget {result['budget_ms']:.0f} ms)" if result["budget_ms"] else ""
+            print(f"{result['entry_point']}: median {result['median_ms']} ms, "
+                  f"min {result['min_ms']} ms, {result['modules']} modules{budget}")
+            for item in result["heaviest"]:
+                print(f"    {item['ms']:9.1f} ms  {item['package']}")
+            if result["eager_lazy_modules"]:
+                print(f"    imported eagerly: {', '.join(result['eager_lazy_modules'])}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
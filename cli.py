@@ -10,10 +10,6 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.agent import InterviewQuestionAgent
-from src.parsers import ResumeParser
-from src.models import RoundType, DifficultyLevel
-
 
 def main():
     """Main CLI function."""
@@ -23,7 +19,7 @@ def main():
     
     parser.add_argument(
         "resume",
-        help="Path to resume PDF file or '-' to use text from job description only"
+        help="Path to resume file (PDF, DOCX, or TXT) or '-' to use text from job description only"
     )
     
     parser.add_argument(
@@ -76,6 +72,11 @@ def main():
     
     args = parser.parse_args()
     
+    # Imported after argument parsing, so --help and usage errors return immediately
+    from src.agent import InterviewQuestionAgent
+    from src.parsers import ResumeParser
+    from src.models import RoundType, DifficultyLevel
+    
     try:
         # Parse resume
         if args.resume == "-":
@@ -88,7 +89,7 @@ def main():
             
             print(f"Parsing resume: {args.resume}")
             parser_obj = ResumeParser()
-            resume_data = parser_obj.parse_pdf(str(resume_path))
+            resume_data = parser_obj.parse(str(resume_path))
             resume_text = resume_data.raw_text
             print(f"✓ Resume parsed successfully")
             if resume_data.name:
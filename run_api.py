@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 """Script to start the Interview Assistant API server."""
 
+import argparse
 import sys
 import os
 
@@ -11,8 +12,26 @@ import uvicorn
 from src.config import settings
 
 
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Start the Interview Assistant API server")
+    parser.add_argument(
+        "--production",
+        action="store_true",
+        help="Preload the app and serve it from several worker processes"
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes in production mode (default: CPU count)")
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        help="Requests a worker serves before it is replaced (0 disables)"
+    )
+    return parser.parse_args()
+
+
 def main():
     """Start the API server."""
+    args = parse_args()
     print("=" * 80)
     print("Starting Interview Assistant API Server")
     print("=" * 80)
@@ -20,12 +39,19 @@ def main():
     print(f"Port: {settings.api_port}")
     print(f"Model: {settings.model_name}")
     print(f"Debug: {settings.debug}")
+    print(f"Mode: {'production' if args.production else 'development'}")
     print("=" * 80)
     print(f"\nAPI Documentation: http://localhost:{settings.api_port}/docs")
     print(f"Health Check: http://localhost:{settings.api_port}/health")
     print("\nPress Ctrl+C to stop the server")
     print("=" * 80 + "\n")
     
+    if args.production:
+        from src.api.server import PreforkServer
+        jitter = None if args.max_requests is None else args.max_requests // 10
+        PreforkServer(workers=args.workers, max_requests=args.max_requests, max_requests_jitter=jitter).run()
+        return
+    
     uvicorn.run(
         "src.api.main:app",
         host=settings.api_host,
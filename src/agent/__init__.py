@@ -1,5 +1,5 @@
 """Agent package for interview question generation."""
 
-from .interview_agent import InterviewQuestionAgent, InterviewAgentError
+from .interview_agent import InterviewQuestionAgent, InterviewAgentError, InterviewSession
 
-__all__ = ['InterviewQuestionAgent', 'InterviewAgentError']
+__all__ = ['InterviewQuestionAgent', 'InterviewAgentError', 'InterviewSession']
@@ -1,27 +1,36 @@
 """Gemini AI agent for generating interview questions."""
 
+import hashlib
+import io
 import json
 import logging
 import os
-from typing import List, Optional
-
-from google import genai
-from google.genai import types
-from google.genai import errors
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
 
 from ..models import (
     InterviewQuestion,
     QuestionGenerationRequest,
     QuestionGenerationResponse, 
     RoundType,
-    DifficultyLevel
+    DifficultyLevel,
+    SkillGap,
+    UploadedFile
 )
-from ..prompts.templates import PROMPT_TEMPLATES
+from ..cache import content_hash, get_uploaded_file_cache
+from ..parsers.skills import analyze_skill_gap
+from ..prompts.templates import FOLLOW_UP_PROMPT, PROMPT_TEMPLATES
 from ..config import settings
+from ..metrics import IN_FLIGHT, UPSTREAM_RESPONSES, record_cache, record_fallback, timed
+
+if TYPE_CHECKING:
+    from google.genai import types
 
 
 logger = logging.getLogger(__name__)
 
+# Stands in for the resume text when the original document is attached
+ATTACHED_RESUME_TEXT = "(The candidate's resume is attached as a document.)"
+
 
 class InterviewQuestionAgent:
     """AI agent for generating interview questions using Google Gemini."""
@@ -31,7 +40,8 @@ class InterviewQuestionAgent:
         api_key: Optional[str] = None,
         model_name: Optional[str] = None,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        backend: Optional[str] = None
     ):
         """
         Initialize the interview question agent.
@@ -41,6 +51,7 @@ class InterviewQuestionAgent:
             model_name: Gemini model to use (defaults to config)
             temperature: Temperature for generation (defaults to config)
             max_tokens: Max tokens to generate (defaults to config)
+            backend: "gemini", or "local" for the offline stand-in (defaults to config)
         """
         self.model_name = model_name or settings.model_name
         self.temperature = temperature or settings.temperature
@@ -49,10 +60,18 @@ class InterviewQuestionAgent:
         # Use provided API key or fall back to environment
         api_key = api_key or os.getenv('GEMINI_API_KEY') or settings.gemini_api_key
         
-        # Initialize the Gemini client
-        self.client = genai.Client(api_key=api_key)
+        # Initialize the Gemini client; uploaded files belong to the key's project
+        self.backend = backend or settings.gemini_backend
+        # google.genai is imported on first use; it dominates the package's import time
+        if self.backend == "local":
+            from .local_backend import get_local_client
+            self.client = get_local_client()
+        else:
+            from google import genai
+            self.client = genai.Client(api_key=api_key)
+        self._files_owner = f"{self.backend}:{hashlib.sha256((api_key or '').encode()).hexdigest()[:16]}"
 
-        logger.info(f"Initialized InterviewQuestionAgent with model: {self.model_name}")
+        logger.info(f"Initialized InterviewQuestionAgent with model: {self.model_name} ({self.backend})")
     
     def generate_questions(
         self,
@@ -61,22 +80,30 @@ class InterviewQuestionAgent:
         round_type: RoundType,
         difficulty: DifficultyLevel = DifficultyLevel.INTERMEDIATE,
         num_questions: int = 10,
-        focus_areas: Optional[List[str]] = None
+        focus_areas: Optional[List[str]] = None,
+        resume_document: Optional[bytes] = None,
+        resume_mime_type: Optional[str] = None
     ) -> QuestionGenerationResponse:
         """
         Generate interview questions based on resume and job description.
         
         Args:
-            resume_text: Parsed resume text
+            resume_text: Parsed resume text (may be empty when resume_document is given)
             job_description: Job description text
             round_type: Type of interview round
             difficulty: Difficulty level of questions
             num_questions: Number of questions to generate
-            focus_areas: Optional specific areas to focus on
+            focus_areas: Optional specific areas to focus on; derived from the
+                resume/JD skill gap when omitted
+            resume_document: Original resume file, sent to Gemini as a document
+                part instead of the resume text
+            resume_mime_type: MIME type of resume_document ("application/pdf" or "text/plain")
             
         Returns:
             QuestionGenerationResponse with generated questions
         """
+        from google.genai import errors, types
+        
         try:
             logger.info(
                 f"Generating {num_questions} {round_type} questions "
@@ -88,43 +115,43 @@ class InterviewQuestionAgent:
             if not prompt_template:
                 raise ValueError(f"No prompt template found for round type: {round_type}")
             
-            # Prepare focus areas text if provided
-            focus_text = ""
-            if focus_areas:
-                focus_text = f"\nFOCUS AREAS: {', '.join(focus_areas)}"
-            
-            # Prepare input variables for the prompt
-            input_vars = {
-                "resume": resume_text[:4000],  # Limit resume text to avoid token limits
-                "job_description": job_description[:2000], 
-                "difficulty": difficulty.value,
-                "num_questions": num_questions,
-            }
-            
-            # Add optional variables
-            if "focus_areas" in prompt_template.input_variables:
-                input_vars["focus_areas"] = focus_text
-            if "domain" in prompt_template.input_variables and focus_areas:
-                input_vars["domain"] = ", ".join(focus_areas)
+            stage_labels = {"round_type": round_type.value}
+            with timed("prompt_format", **stage_labels):
+                formatted_prompt, focus_areas, skill_gap = self._format_prompt(
+                    prompt_template,
+                    resume_text,
+                    job_description,
+                    difficulty,
+                    num_questions,
+                    focus_areas,
+                    resume_attached=resume_document is not None
+                )
             
-            # Format the prompt with variables
-            formatted_prompt = prompt_template.format(**input_vars)
+            # Attach the original document ahead of the prompt when given
+            contents = formatted_prompt
+            document_info = None
+            if resume_document is not None:
+                document_part, document_info = self._document_part(resume_document, resume_mime_type)
+                contents = [document_part, formatted_prompt]
             
             # Generate questions using Gemini with JSON output
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=formatted_prompt,
-                config=types.GenerateContentConfig(
-                    temperature=self.temperature,
-                    max_output_tokens=self.max_tokens,
-                    response_mime_type="application/json"
-                    # Note: response_schema is optional and can cause issues
-                    # The prompt template already instructs for proper JSON format
+            with IN_FLIGHT.track(operation="gemini_call"), timed("gemini_call", **stage_labels):
+                response = self.client.models.generate_content(
+                    model=self.model_name,
+                    contents=contents,
+                    config=types.GenerateContentConfig(
+                        temperature=self.temperature,
+                        max_output_tokens=self.max_tokens,
+                        response_mime_type="application/json"
+                        # Note: response_schema is optional and can cause issues
+                        # The prompt template already instructs for proper JSON format
+                    )
                 )
-            )
+            UPSTREAM_RESPONSES.inc(status="200")
             
             # Parse the response
-            questions = self._parse_questions(response.text, difficulty)
+            with timed("parse_questions", **stage_labels):
+                questions = self._parse_questions(response.text, difficulty)
             
             logger.info(f"Successfully generated {len(questions)} questions")
             
@@ -135,17 +162,120 @@ class InterviewQuestionAgent:
                 difficulty=difficulty,
                 metadata={
                     "model": self.model_name,
-                    "temperature": self.temperature
+                    "temperature": self.temperature,
+                    "focus_areas": focus_areas or [],
+                    "focus_areas_derived": skill_gap is not None,
+                    "skill_gap": skill_gap.model_dump() if skill_gap else None,
+                    "resume_document": document_info
                 }
             )
             
         except errors.APIError as e:
             logger.error(f"Gemini API error: {e.code} - {e.message}")
+            UPSTREAM_RESPONSES.inc(status=str(e.code))
             raise InterviewAgentError(f"API request failed: {e.message}")
         except Exception as e:
             logger.error(f"Error generating questions: {str(e)}")
             raise InterviewAgentError(f"Question generation failed: {str(e)}")
     
+    def _format_prompt(
+        self,
+        prompt_template,
+        resume_text: str,
+        job_description: str,
+        difficulty: DifficultyLevel,
+        num_questions: int,
+        focus_areas: Optional[List[str]],
+        resume_attached: bool = False
+    ) -> Tuple[str, Optional[List[str]], Optional[SkillGap]]:
+        """
+        Fill a round's prompt template.
+        
+        Args:
+            prompt_template: Template for the interview round
+            resume_text: Parsed resume text
+            job_description: Job description text
+            difficulty: Difficulty level of questions
+            num_questions: Number of questions to generate
+            focus_areas: Focus areas given by the caller; derived from the
+                resume/JD skill gap when omitted
+            resume_attached: Whether the resume is attached as a document
+                instead of being included as text
+            
+        Returns:
+            Tuple of the prompt, the focus areas used and the skill gap they were derived from
+        """
+        # Derive focus areas locally from the skill gap when the caller gave none
+        # (only possible when the resume text is known)
+        skill_gap = None
+        if not focus_areas and settings.auto_focus_areas and resume_text:
+            skill_gap = analyze_skill_gap(resume_text, job_description)
+            focus_areas = skill_gap.focus_areas or None
+            logger.info(f"Derived focus areas from skill gap: {focus_areas}")
+        
+        # Prepare focus areas text if provided
+        focus_text = ""
+        if focus_areas:
+            focus_text = f"\nFOCUS AREAS: {', '.join(focus_areas)}"
+        
+        # Prepare input variables for the prompt
+        if resume_attached:
+            resume_prompt_text = ATTACHED_RESUME_TEXT
+        else:
+            resume_prompt_text = resume_text[:4000]  # Limit resume text to avoid token limits
+        input_vars = {
+            "resume": resume_prompt_text,
+            "job_description": job_description[:2000], 
+            "difficulty": difficulty.value,
+            "num_questions": num_questions,
+        }
+        
+        # Add optional variables
+        if "focus_areas" in prompt_template.input_variables:
+            input_vars["focus_areas"] = focus_text
+        if "domain" in prompt_template.input_variables:
+            input_vars["domain"] = ", ".join(focus_areas) if focus_areas else "General"
+        
+        # Format the prompt with variables
+        return prompt_template.format(**input_vars), focus_areas, skill_gap
+    
+    def _document_part(self, data: bytes, mime_type: str) -> Tuple["types.Part", dict]:
+        """
+        Build the content part carrying a resume document.
+        
+        Small documents are sent inline. Larger ones are uploaded through the
+        Files API once per content hash and API key; later requests reference
+        the cached file handle instead of uploading again.
+        
+        Args:
+            data: Document bytes
+            mime_type: Document MIME type
+            
+        Returns:
+            Tuple of the part and a description of how it was sent, for metadata
+        """
+        from google.genai import types
+        
+        if len(data) <= settings.gemini_inline_max_bytes:
+            return types.Part.from_bytes(data=data, mime_type=mime_type), {"transport": "inline", "bytes": len(data)}
+        
+        uploaded_files = get_uploaded_file_cache()
+        key = (self._files_owner, content_hash(data))
+        uploaded = uploaded_files.get(key)
+        reused = uploaded is not None
+        record_cache("uploaded_file", "hit" if reused else "miss")
+        if not reused:
+            with timed("document_upload"):
+                handle = self.client.files.upload(
+                    file=io.BytesIO(data),
+                    config=types.UploadFileConfig(mime_type=mime_type)
+                )
+            uploaded = UploadedFile(name=handle.name, uri=handle.uri, mime_type=handle.mime_type)
+            uploaded_files.set(key, uploaded)
+            logger.info(f"Uploaded {len(data)} byte resume document as {uploaded.name}")
+        part = types.Part.from_uri(file_uri=uploaded.uri, mime_type=uploaded.mime_type or mime_type)
+        return part, {"transport": "upload", "bytes": len(data), "file": uploaded.name, "reused_upload": reused}
+    
     def _parse_questions(
         self,
         llm_response: str,
@@ -166,6 +296,7 @@ class InterviewQuestionAgent:
             # Handle None or empty response
             if not llm_response:
                 logger.error("Received empty or None response from Gemini API")
+                record_fallback("questions_empty_response")
                 return [
                     InterviewQuestion(
                         question="Unable to generate questions - API key may be invalid or quota exceeded",
@@ -248,12 +379,14 @@ class InterviewQuestionAgent:
                             )
                             questions.append(question)
                         
+                        record_fallback("questions_json_recovery")
                         return questions
                         
             except Exception as retry_e:
                 logger.error(f"JSON recovery attempt also failed: {str(retry_e)}")
             
             # Final fallback: create a single question with the raw response
+            record_fallback("questions_raw_text")
             response_preview = (llm_response or "No response")[:500]
             return [
                 InterviewQuestion(
@@ -290,6 +423,131 @@ class InterviewQuestionAgent:
         )
 
 
+class InterviewSession:
+    """
+    Multi-turn question generation for one candidate over a Gemini chat.
+    
+    The first turn sends the round prompt with the resume and job
+    description. Follow-up turns send only the interviewer's new request
+    ("3 more on Kubernetes", "harder follow-ups for Q4"); the chat keeps the
+    earlier turns, so the context is not rebuilt or re-sent by the caller,
+    and the unchanged conversation prefix stays eligible for Gemini's
+    implicit context caching.
+    
+    Turns stream the model's text as it arrives. Once a turn's stream is
+    exhausted, its parsed questions are in last_questions.
+    """
+    
+    def __init__(
+        self,
+        agent: InterviewQuestionAgent,
+        round_type: RoundType,
+        difficulty: DifficultyLevel = DifficultyLevel.INTERMEDIATE
+    ):
+        """
+        Args:
+            agent: Agent whose client, model and generation settings the session uses
+            round_type: Type of interview round
+            difficulty: Default difficulty level of questions
+        """
+        self.agent = agent
+        self.round_type = round_type
+        self.difficulty = difficulty
+        self.turns = 0
+        self.questions: List[InterviewQuestion] = []
+        self.last_questions: List[InterviewQuestion] = []
+        self.focus_areas: Optional[List[str]] = None
+        self.skill_gap: Optional[SkillGap] = None
+        
+        from google.genai import types
+        self.chat = agent.client.chats.create(
+            model=agent.model_name,
+            config=types.GenerateContentConfig(
+                temperature=agent.temperature,
+                max_output_tokens=agent.max_tokens,
+                response_mime_type="application/json"
+            )
+        )
+    
+    def start(
+        self,
+        resume_text: str,
+        job_description: str,
+        num_questions: int = 10,
+        focus_areas: Optional[List[str]] = None
+    ) -> Iterator[str]:
+        """
+        Begin the session with the round prompt.
+        
+        Args:
+            resume_text: Parsed resume text
+            job_description: Job description text
+            num_questions: Number of questions to generate
+            focus_areas: Optional specific areas to focus on; derived from the
+                resume/JD skill gap when omitted
+            
+        Returns:
+            Iterator over the response text as it streams
+        """
+        prompt_template = PROMPT_TEMPLATES.get(self.round_type.value)
+        if not prompt_template:
+            raise InterviewAgentError(f"No prompt template found for round type: {self.round_type}")
+        with timed("prompt_format", round_type=self.round_type.value):
+            prompt, self.focus_areas, self.skill_gap = self.agent._format_prompt(
+                prompt_template,
+                resume_text,
+                job_description,
+                self.difficulty,
+                num_questions,
+                focus_areas
+            )
+        return self._send(prompt)
+    
+    def follow_up(self, request: str, num_questions: Optional[int] = None) -> Iterator[str]:
+        """
+        Ask for more questions within the session.
+        
+        Args:
+            request: The interviewer's request, e.g. "give me 3 more on Kubernetes"
+            num_questions: Exact number of questions, when not left to the request
+            
+        Returns:
+            Iterator over the response text as it streams
+        """
+        if num_questions:
+            count = f"Generate exactly {num_questions} questions."
+        else:
+            count = "Generate as many questions as the interviewer asks for."
+        prompt = FOLLOW_UP_PROMPT.format(request=request, difficulty=self.difficulty.value, num_questions=count)
+        return self._send(prompt)
+    
+    def _send(self, message: str) -> Iterator[str]:
+        from google.genai import errors
+        
+        self.turns += 1
+        stage_labels = {"round_type": self.round_type.value}
+        chunks = []
+        try:
+            with IN_FLIGHT.track(operation="gemini_call"), timed("gemini_call", **stage_labels):
+                for chunk in self.chat.send_message_stream(message):
+                    if chunk.text:
+                        chunks.append(chunk.text)
+                        yield chunk.text
+            UPSTREAM_RESPONSES.inc(status="200")
+        except errors.APIError as e:
+            logger.error(f"Gemini API error: {e.code} - {e.message}")
+            UPSTREAM_RESPONSES.inc(status=str(e.code))
+            raise InterviewAgentError(f"API request failed: {e.message}")
+        except Exception as e:
+            logger.error(f"Error in session turn {self.turns}: {str(e)}")
+            raise InterviewAgentError(f"Question generation failed: {str(e)}")
+        
+        with timed("parse_questions", **stage_labels):
+            self.last_questions = self.agent._parse_questions("".join(chunks), self.difficulty)
+        self.questions.extend(self.last_questions)
+        logger.info(f"Session turn {self.turns} generated {len(self.last_questions)} questions")
+
+
 class InterviewAgentError(Exception):
     """Custom exception for interview agent errors."""
     pass
@@ -0,0 +1,158 @@
+"""Offline stand-in for the parts of the Gemini client the agent uses."""
+
+import json
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple
+
+from google.genai import types
+
+from ..parsers import ResumeParser, ResumeParserError
+from ..parsers.skills import get_skill_matcher
+
+
+logger = logging.getLogger(__name__)
+
+_NUM_QUESTIONS = re.compile(r"Generate exactly (\d+) questions")
+_DEFAULT_QUESTIONS = 5
+_STREAM_CHUNKS = 3
+
+
+class LocalFiles:
+    """In-memory replacement for ``client.files``; uploads live until the process exits."""
+
+    def __init__(self):
+        self._files: Dict[str, Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+        self.upload_count = 0
+
+    def upload(self, *, file, config=None) -> types.File:
+        if hasattr(file, "read"):
+            data = file.read()
+        else:
+            with open(file, "rb") as handle:
+                data = handle.read()
+        mime_type = getattr(config, "mime_type", None) or "application/octet-stream"
+        with self._lock:
+            self.upload_count += 1
+            name = f"files/local-{self.upload_count}"
+            self._files[name] = (data, mime_type)
+        logger.info(f"Stored {len(data)} byte upload as {name}")
+        return types.File(name=name, uri=f"local://{name}", mime_type=mime_type, size_bytes=len(data))
+
+    def read(self, uri: str) -> Tuple[bytes, str]:
+        """Return the bytes and mime type of an uploaded file by its uri."""
+        with self._lock:
+            return self._files[uri.removeprefix("local://")]
+
+
+class LocalModels:
+    """
+    Replacement for ``client.models`` that answers from the request alone.
+
+    Questions are built from the skills found in the prompt and any attached
+    documents, so responses are deterministic and need no network access.
+    """
+
+    def __init__(self, files: LocalFiles):
+        self._files = files
+        self._parser = ResumeParser()
+
+    def generate_content(self, *, model: str, contents, config=None) -> types.GenerateContentResponse:
+        texts = [self._part_text(part) for part in (contents if isinstance(contents, list) else [contents])]
+        prompt = "\n".join(texts)
+        match = _NUM_QUESTIONS.search(prompt)
+        num_questions = int(match.group(1)) if match else _DEFAULT_QUESTIONS
+
+        skills = get_skill_matcher().find(prompt) or ["your recent work"]
+        questions = []
+        for i in range(num_questions):
+            skill = skills[i % len(skills)]
+            questions.append({
+                "question": f"Walk me through a project where you used {skill}.",
+                "category": "Experience",
+                "context": "Generated by the local backend",
+                "follow_up_questions": [f"What would you do differently with {skill} today?"],
+                "expected_topics": [skill],
+            })
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(
+                role="model", parts=[types.Part.from_text(text=json.dumps(questions))]
+            ))]
+        )
+
+    def _part_text(self, part) -> str:
+        if isinstance(part, str):
+            return part
+        if part.text is not None:
+            return part.text
+        if part.inline_data is not None:
+            data = part.inline_data.data
+        elif part.file_data is not None:
+            data, _ = self._files.read(part.file_data.file_uri)
+        else:
+            return ""
+        try:
+            return self._parser.extract_text(data)
+        except ResumeParserError as e:
+            logger.warning(f"Local backend could not read attached document: {e}")
+            return ""
+
+
+class LocalChat:
+    """Replacement for a ``genai`` chat; each turn answers from the user turns so far."""
+
+    def __init__(self, models: LocalModels, model: str, config=None):
+        self._models = models
+        self._model = model
+        self._config = config
+        self._history: List[types.Content] = []
+
+    def send_message_stream(self, message) -> Iterator[types.GenerateContentResponse]:
+        # The new message goes first, so its question count and skills take precedence
+        part = types.Part.from_text(text=message) if isinstance(message, str) else message
+        earlier = [part for content in self._history if content.role == "user" for part in content.parts]
+        text = self._models.generate_content(model=self._model, contents=[part] + earlier, config=self._config).text
+        self._history.append(types.Content(role="user", parts=[part]))
+        self._history.append(types.Content(role="model", parts=[types.Part.from_text(text=text)]))
+
+        size = -(-len(text) // _STREAM_CHUNKS)
+        for start in range(0, len(text), size):
+            yield types.GenerateContentResponse(
+                candidates=[types.Candidate(content=types.Content(
+                    role="model", parts=[types.Part.from_text(text=text[start:start + size])]
+                ))]
+            )
+
+    def get_history(self, curated: bool = False) -> List[types.Content]:
+        return list(self._history)
+
+
+class LocalChats:
+    """Replacement for ``client.chats``."""
+
+    def __init__(self, models: LocalModels):
+        self._models = models
+
+    def create(self, *, model: str, config=None, history=None) -> LocalChat:
+        chat = LocalChat(self._models, model, config)
+        chat._history.extend(history or [])
+        return chat
+
+
+class LocalGeminiClient:
+    """Drop-in for ``genai.Client`` exposing ``models.generate_content``, ``chats.create`` and ``files.upload``."""
+
+    def __init__(self):
+        self.files = LocalFiles()
+        self.models = LocalModels(self.files)
+        self.chats = LocalChats(self.models)
+
+
+@lru_cache(maxsize=None)
+def get_local_client() -> LocalGeminiClient:
+    """Return the shared local client, so uploads outlive a single agent."""
+    return LocalGeminiClient()
+
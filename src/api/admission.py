@@ -0,0 +1,281 @@
+"""Admission control: concurrency limits with bounded wait queues and fast 503s."""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from ..config import settings
+from ..metrics import (
+    ADMISSION_ACTIVE,
+    ADMISSION_QUEUED,
+    ADMISSION_REJECTED,
+    ADMISSION_SATURATION,
+    timed,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Only API calls are limited; health checks, metrics, pages and static assets
+# must keep answering while the API is saturated
+_LIMITED_PREFIX = "/api/"
+
+
+class ConcurrencyLimiter:
+    """
+    Limit on concurrent requests with a bounded FIFO wait queue.
+
+    A request is admitted straight away while fewer than ``limit`` hold a
+    slot. Otherwise it waits in line, unless ``max_queue`` requests are
+    already waiting, and gives up after ``max_wait_seconds``. Both cases
+    raise AdmissionRejected so the caller can shed the request before doing
+    any work. A released slot goes directly to the longest waiter.
+
+    Saturation is active plus queued requests over the limit, so 1.0 means
+    every slot is busy and anything above it means requests are queueing.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, max_wait_seconds: float):
+        """
+        Args:
+            name: Limiter name used as the metrics label
+            limit: Requests allowed to run at once
+            max_queue: Requests allowed to wait for a slot
+            max_wait_seconds: Longest a request may wait before it is rejected
+        """
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._update_metrics()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def saturation(self) -> float:
+        return (self.active + self.queued) / self.limit
+
+    def stats(self) -> dict:
+        """Current occupancy, for the health endpoint."""
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "saturation": round(self.saturation(), 3),
+        }
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, waiting in line if necessary.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait timed out
+        """
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self._update_metrics()
+            return
+        if self.queued >= self.max_queue:
+            self._reject("queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self._update_metrics()
+        try:
+            with timed("admission_queue"):
+                await asyncio.wait({future}, timeout=self.max_wait_seconds)
+        except asyncio.CancelledError:
+            # The client went away while queued; hand back a slot it was just given
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            try:
+                self._waiters.remove(future)
+            except ValueError:
+                pass
+            self._update_metrics()
+        if future.cancelled():
+            self._reject("queue_timeout")
+
+    def release(self) -> None:
+        """Give up a slot, passing it to the next waiter if there is one."""
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                self._update_metrics()
+                return
+        self.active -= 1
+        self._update_metrics()
+
+    def _reject(self, reason: str) -> None:
+        ADMISSION_REJECTED.inc(limiter=self.name, reason=reason)
+        raise AdmissionRejected(self.name, reason)
+
+    def _update_metrics(self) -> None:
+        ADMISSION_ACTIVE.set(self.active, limiter=self.name)
+        ADMISSION_QUEUED.set(self.queued, limiter=self.name)
+        ADMISSION_SATURATION.set(self.saturation(), limiter=self.name)
+
+
+def _process_share(limit: int, processes: int) -> int:
+    """Return one process's part of a server-wide limit, rounded up so no limit drops to 0."""
+    return -(-limit // processes)
+
+
+class AdmissionControl:
+    """
+    Global and per-route concurrency limiters for API requests.
+
+    A request first passes its route's limiter, when the route has one, and
+    then the global limiter, so a burst on one expensive route queues behind
+    that route's limit without taking every global slot.
+
+    Limits are for the whole server. When it runs several worker processes,
+    each one enforces its share of every limit, so the workers together
+    admit about as many requests as configured.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        route_limits: Optional[Dict[str, int]] = None,
+        max_queue: Optional[int] = None,
+        max_queue_seconds: Optional[float] = None,
+        retry_after_seconds: Optional[int] = None,
+        processes: Optional[int] = None
+    ):
+        """
+        Args:
+            max_concurrent: Global concurrency limit (defaults to config; 0 disables)
+            route_limits: Concurrency limits for specific request paths (defaults to config)
+            max_queue: Requests allowed to wait per limiter (defaults to config)
+            max_queue_seconds: Longest wait for a slot (defaults to config)
+            retry_after_seconds: Retry-After sent with rejections (defaults to config)
+            processes: Worker processes the limits are split between (defaults to config)
+        """
+        max_concurrent = settings.admission_max_concurrent if max_concurrent is None else max_concurrent
+        route_limits = settings.admission_route_limits if route_limits is None else route_limits
+        max_queue = settings.admission_max_queue if max_queue is None else max_queue
+        max_queue_seconds = max_queue_seconds or settings.admission_max_queue_seconds
+        self.retry_after_seconds = retry_after_seconds or settings.admission_retry_after_seconds
+        processes = max(1, processes or settings.admission_processes)
+        max_concurrent = _process_share(max_concurrent, processes)
+        route_limits = {path: _process_share(limit, processes) for path, limit in route_limits.items()}
+        max_queue = _process_share(max_queue, processes)
+
+        self.global_limiter = None
+        if max_concurrent:
+            self.global_limiter = ConcurrencyLimiter("global", max_concurrent, max_queue, max_queue_seconds)
+        self.route_limiters = {
+            path: ConcurrencyLimiter(path, limit, max_queue, max_queue_seconds)
+            for path, limit in route_limits.items()
+            if limit
+        }
+
+    def limiters(self) -> List[ConcurrencyLimiter]:
+        """Every limiter, global first."""
+        return ([self.global_limiter] if self.global_limiter else []) + list(self.route_limiters.values())
+
+    def stats(self) -> dict:
+        """Occupancy of each limiter, keyed by name."""
+        return {limiter.name: limiter.stats() for limiter in self.limiters()}
+
+    async def acquire(self, path: str) -> List[ConcurrencyLimiter]:
+        """
+        Take a slot from every limiter that applies to a request path.
+
+        Args:
+            path: Request path
+
+        Returns:
+            The limiters acquired, to hand to release()
+
+        Raises:
+            AdmissionRejected: If any limiter rejects the request; nothing is held then
+        """
+        acquired = []
+        try:
+            for limiter in (self.route_limiters.get(path), self.global_limiter):
+                if limiter is not None:
+                    await limiter.acquire()
+                    acquired.append(limiter)
+        except BaseException:
+            self.release(acquired)
+            raise
+        return acquired
+
+    @staticmethod
+    def release(acquired: List[ConcurrencyLimiter]) -> None:
+        for limiter in reversed(acquired):
+            limiter.release()
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware admitting /api/ requests through AdmissionControl.
+
+    A request that cannot be admitted is answered at once with 503 and a
+    Retry-After header, before its body is read or any work is done, instead
+    of waiting until a proxy times it out.
+    """
+
+    def __init__(self, app, admission: Optional[AdmissionControl] = None):
+        """
+        Args:
+            app: ASGI application to wrap
+            admission: Limiters to apply (defaults to ones built from config)
+        """
+        self.app = app
+        self.admission = admission or AdmissionControl()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(_LIMITED_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            acquired = await self.admission.acquire(scope["path"])
+        except AdmissionRejected as e:
+            logger.warning(f"Shedding {scope['method']} {scope['path']}: {e}")
+            await self._reject(send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.admission.release(acquired)
+
+    async def _reject(self, send) -> None:
+        retry_after = self.admission.retry_after_seconds
+        body = json.dumps({
+            "detail": f"Server is at capacity; retry after {retry_after} seconds"
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted by a concurrency limiter."""
+
+    def __init__(self, limiter: str, reason: str):
+        super().__init__(f"{limiter} limiter rejected the request ({reason})")
+        self.limiter = limiter
+        self.reason = reason
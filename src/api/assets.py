@@ -0,0 +1,176 @@
+"""Fingerprinted, precompressed static assets served with long-lived caching."""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+from typing import Dict, NamedTuple, Optional
+
+from ..config import settings
+from .compression import COMPRESSIBLE_TYPES, accepted_encodings, brotli
+from .results import etag_matches
+
+
+logger = logging.getLogger(__name__)
+
+# name.<hash>.ext, where the hash is the first HASH_LENGTH hex digits of the content's SHA-256
+HASH_LENGTH = 12
+_FINGERPRINTED = re.compile(r"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})(?P<ext>\.[^./]+)$" % HASH_LENGTH)
+
+# Original and stale-fingerprint URLs must revalidate; the ETag keeps that cheap
+_REVALIDATE = "no-cache"
+
+
+class _Asset(NamedTuple):
+    path: str
+    digest: str
+    url_path: str
+    media_type: str
+    variants: Dict[str, bytes]  # encoding ("identity", "br", "gzip") -> body
+
+
+class StaticAssets:
+    """
+    ASGI app serving a static directory from memory, with fingerprinted URLs.
+
+    Every file is read once when the app is created. Its content hash goes
+    into its URL (css/custom.css becomes css/custom.<hash>.css) and
+    compressible files are precompressed with brotli and gzip at maximum
+    settings. Fingerprinted URLs never change content, so they are served
+    with an immutable Cache-Control. The original paths, and fingerprints
+    from an earlier deploy, still serve the current file but must be
+    revalidated with the ETag.
+
+    Templates get the fingerprinted URLs through url(), exposed to Jinja as
+    asset_url().
+    """
+
+    def __init__(self, directory: Optional[str] = None, prefix: str = "/static", max_age_seconds: Optional[int] = None):
+        """
+        Args:
+            directory: Directory to serve (defaults to config)
+            prefix: URL path the app is mounted at
+            max_age_seconds: Cache lifetime of fingerprinted URLs (defaults to config)
+        """
+        self.directory = directory or settings.static_dir
+        self.prefix = prefix.rstrip("/")
+        self.max_age_seconds = (
+            settings.static_asset_max_age_seconds if max_age_seconds is None else max_age_seconds
+        )
+        self._assets: Dict[str, _Asset] = {}
+        self._load()
+
+    def _load(self) -> None:
+        original = compressed = 0
+        for root, _, files in os.walk(self.directory):
+            for file_name in sorted(files):
+                full_path = os.path.join(root, file_name)
+                path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                with open(full_path, "rb") as handle:
+                    body = handle.read()
+                asset = self._build(path, body)
+                self._assets[path] = asset
+                original += len(body)
+                compressed += min(len(variant) for variant in asset.variants.values())
+        logger.info(
+            f"Loaded {len(self._assets)} static assets from {self.directory} "
+            f"({original} bytes, {compressed} bytes best-compressed)"
+        )
+
+    @staticmethod
+    def _build(path: str, body: bytes) -> _Asset:
+        digest = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+        stem, ext = os.path.splitext(path)
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if media_type.startswith("text/") or media_type == "application/javascript":
+            media_type += "; charset=utf-8"
+
+        variants = {"identity": body}
+        if media_type.encode().startswith(COMPRESSIBLE_TYPES):
+            candidates = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                candidates["br"] = brotli.compress(body, mode=brotli.MODE_TEXT, quality=11)
+            # Keep a variant only when it is actually smaller
+            variants.update({encoding: data for encoding, data in candidates.items() if len(data) < len(body)})
+        return _Asset(path, digest, f"{stem}.{digest}{ext}", media_type, variants)
+
+    def url(self, path: str) -> str:
+        """
+        Return the fingerprinted URL of an asset.
+
+        Args:
+            path: Path relative to the static directory, e.g. "css/custom.css"
+        """
+        path = path.lstrip("/")
+        asset = self._assets.get(path)
+        if asset is None:
+            logger.warning(f"Unknown static asset {path!r}; linking it without a fingerprint")
+            return f"{self.prefix}/{path}"
+        return f"{self.prefix}/{asset.url_path}"
+
+    def _resolve(self, path: str):
+        """Return (asset, fingerprinted) for a request path, or (None, False)."""
+        asset = self._assets.get(path)
+        if asset is not None:
+            return asset, False
+        match = _FINGERPRINTED.match(path)
+        if match is None:
+            return None, False
+        asset = self._assets.get(match["stem"] + match["ext"])
+        if asset is None:
+            return None, False
+        return asset, match["hash"] == asset.digest
+
+    async def __call__(self, scope, receive, send):
+        assert scope["type"] == "http"
+        # Mounted apps see the full path; root_path holds the mount prefix
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        asset, fingerprinted = self._resolve(path.lstrip("/"))
+
+        if scope["method"] not in ("GET", "HEAD"):
+            await self._send(send, 405, [(b"allow", b"GET, HEAD")], b"Method Not Allowed")
+            return
+        if asset is None:
+            await self._send(send, 404, [(b"content-type", b"text/plain; charset=utf-8")], b"Not Found")
+            return
+
+        request_headers = {name: value.decode("latin-1") for name, value in scope["headers"]}
+        encodings = accepted_encodings(
+            request_headers.get(b"accept-encoding", ""),
+            [encoding for encoding in ("br", "gzip") if encoding in asset.variants]
+        )
+        encoding = encodings[0] if encodings else "identity"
+        etag = f'"{asset.digest}"' if encoding == "identity" else f'"{asset.digest}-{encoding}"'
+        if fingerprinted:
+            cache_control = f"public, max-age={self.max_age_seconds}, immutable"
+        else:
+            cache_control = _REVALIDATE
+
+        headers = [
+            (b"etag", etag.encode()),
+            (b"cache-control", cache_control.encode()),
+        ]
+        if len(asset.variants) > 1:
+            headers.append((b"vary", b"Accept-Encoding"))
+        if etag_matches(request_headers.get(b"if-none-match"), etag):
+            await self._send(send, 304, headers, b"")
+            return
+
+        body = asset.variants[encoding]
+        headers.append((b"content-type", asset.media_type.encode()))
+        if encoding != "identity":
+            headers.append((b"content-encoding", encoding.encode()))
+        await self._send(send, 200, headers, b"" if scope["method"] == "HEAD" else body, len(body))
+
+    @staticmethod
+    async def _send(send, status: int, headers, body: bytes, content_length: Optional[int] = None) -> None:
+        if status != 304:
+            length = len(body) if content_length is None else content_length
+            headers = headers + [(b"content-length", str(length).encode())]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
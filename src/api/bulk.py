@@ -0,0 +1,201 @@
+"""Bulk resume parsing with NDJSON streaming output."""
+
+import asyncio
+import logging
+import zipfile
+from pathlib import PurePosixPath
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Tuple, Union
+
+from fastapi import HTTPException, UploadFile
+
+from ..config import settings
+from ..models import ResumeData
+from ..parsers.pool import get_parse_pool
+from .responses import dumps
+from .uploads import SpooledUpload, document_source, spool_upload
+
+
+logger = logging.getLogger(__name__)
+
+# A document's bytes, or a whole upload spooled to memory or disk
+BulkContent = Union[bytes, SpooledUpload]
+# (index, file name, document content, error message)
+BulkDocument = Tuple[int, str, Optional[BulkContent], Optional[str]]
+# (index, file name, parsed resume, error message)
+ParsedDocument = Tuple[int, str, Optional[ResumeData], Optional[str]]
+
+
+def resume_summary(resume_data: ResumeData) -> dict:
+    """Build the public summary of a parsed resume."""
+    return {
+        "name": resume_data.name,
+        "email": resume_data.email,
+        "skills": resume_data.skills,
+        "experience_years": resume_data.experience_years,
+        "text_preview": resume_data.raw_text[:500] + "...",
+        "parse_stats": (resume_data.metadata or {}).get("parse_stats")
+    }
+
+
+def _is_archive(stream) -> bool:
+    """Return True for ZIP archives that are not themselves DOCX documents."""
+    if not zipfile.is_zipfile(stream):
+        stream.seek(0)
+        return False
+    stream.seek(0)
+    with zipfile.ZipFile(stream) as archive:
+        is_docx = "word/document.xml" in archive.namelist()
+    stream.seek(0)
+    return not is_docx
+
+
+def _iter_archive(
+    archive: zipfile.ZipFile,
+    archive_name: str
+) -> Iterator[Tuple[str, Optional[zipfile.ZipInfo], Optional[str]]]:
+    """Yield (name, member, error) for each document inside a ZIP archive, without reading it."""
+    for info in archive.infolist():
+        path = PurePosixPath(info.filename)
+        if info.is_dir() or path.name.startswith(".") or "__MACOSX" in path.parts:
+            continue
+        name = f"{archive_name}/{info.filename}"
+        if info.file_size > settings.upload_max_bytes:
+            yield name, None, (
+                f"File exceeds the maximum allowed size of {settings.upload_max_bytes} bytes"
+            )
+            continue
+        yield name, info, None
+
+
+async def iter_bulk_documents(uploads: List[UploadFile]) -> AsyncIterator[BulkDocument]:
+    """
+    Yield every document in a bulk upload, expanding ZIP archives.
+
+    Problems with individual files are yielded as error entries instead of
+    failing the whole batch. Documents past the batch limit are reported as a
+    single error entry and not read.
+
+    Archive members are yielded as bytes. A plain file is yielded as its
+    SpooledUpload, so a large one reaches the parse worker as a file path;
+    the consumer closes it once parsed.
+    """
+    too_large = f"File exceeds the maximum allowed size of {settings.upload_max_bytes} bytes"
+    limit = settings.bulk_parse_max_files
+    index = 0
+
+    for upload in uploads:
+        name = upload.filename or f"file-{index}"
+        if index >= limit:
+            yield index, name, None, f"Bulk uploads are limited to {limit} resumes"
+            return
+        try:
+            spool = await spool_upload(upload, settings.bulk_upload_max_request_bytes)
+        except HTTPException as e:
+            yield index, name, None, e.detail
+            index += 1
+            continue
+
+        if not _is_archive(spool.file):
+            if spool.size > settings.upload_max_bytes:
+                spool.close()
+                yield index, name, None, too_large
+            else:
+                # The spool itself is handed on; whoever parses it closes it
+                yield index, name, spool, None
+            index += 1
+            continue
+
+        with spool, zipfile.ZipFile(spool.file) as archive:
+            for entry_name, info, error in _iter_archive(archive, name):
+                if index >= limit:
+                    yield index, entry_name, None, f"Bulk uploads are limited to {limit} resumes"
+                    return
+                data = None
+                if info is not None:
+                    # Inflating a member is CPU-bound; keep it off the event loop
+                    data = await asyncio.to_thread(archive.read, info)
+                yield index, entry_name, data, error
+                index += 1
+
+
+def _ndjson(record: dict) -> bytes:
+    return dumps(record) + b"\n"
+
+
+def _error_record(index: int, name: str, error: str) -> bytes:
+    return _ndjson({"index": index, "file_name": name, "status": "error", "error": error})
+
+
+def _close(content: Optional[BulkContent]) -> None:
+    if isinstance(content, SpooledUpload):
+        content.close()
+
+
+async def iter_parsed(
+    documents: AsyncIterator[BulkDocument],
+    parse: Optional[Callable[[BulkContent, str], Awaitable[ResumeData]]] = None
+) -> AsyncIterator[ParsedDocument]:
+    """
+    Parse documents in parallel and yield each result as it completes.
+
+    At most twice the pool size is in flight, so a large batch is never held
+    in memory all at once. Spooled uploads are closed once parsed.
+
+    Args:
+        documents: Documents from iter_bulk_documents
+        parse: Coroutine function parsing one document (defaults to the parse pool)
+    """
+    pool = get_parse_pool()
+    max_in_flight = pool.workers * 2
+    pending = {}
+
+    async def parse_in_pool(content: BulkContent, name: str) -> ResumeData:
+        return await pool.parse(document_source(content), name)
+
+    parse = parse or parse_in_pool
+
+    async def drain():
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        results = []
+        for task in done:
+            index, name, content = pending.pop(task)
+            _close(content)
+            try:
+                results.append((index, name, task.result(), None))
+            except Exception as e:
+                logger.warning(f"Bulk parse failed for {name}: {str(e)}")
+                results.append((index, name, None, str(e)))
+        return results
+
+    try:
+        async for index, name, content, error in documents:
+            if error:
+                yield index, name, None, error
+                continue
+            task = asyncio.ensure_future(parse(content, name))
+            pending[task] = (index, name, content)
+            if len(pending) >= max_in_flight:
+                for result in await drain():
+                    yield result
+
+        while pending:
+            for result in await drain():
+                yield result
+    finally:
+        for task, (_, _, content) in pending.items():
+            task.cancel()
+            _close(content)
+
+
+async def stream_parse_results(documents: AsyncIterator[BulkDocument]) -> AsyncIterator[bytes]:
+    """Parse documents in parallel and yield one NDJSON record per resume as each completes."""
+    async for index, name, resume_data, error in iter_parsed(documents):
+        if error:
+            yield _error_record(index, name, error)
+        else:
+            yield _ndjson({
+                "index": index,
+                "file_name": name,
+                "status": "ok",
+                "resume": resume_summary(resume_data)
+            })
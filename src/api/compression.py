@@ -0,0 +1,212 @@
+"""Response compression negotiated with Accept-Encoding (brotli or gzip)."""
+
+import zlib
+from typing import List, Optional, Sequence, Tuple
+
+from ..config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional; gzip is always available
+    brotli = None
+
+# Content types worth compressing; images, archives and PDFs are already compressed
+COMPRESSIBLE_TYPES = (
+    b"application/json",
+    b"application/x-ndjson",
+    b"application/javascript",
+    b"application/xml",
+    b"image/svg+xml",
+    b"text/",
+)
+
+
+def accepted_encodings(accept_encoding: str, available: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    List the available encodings an Accept-Encoding header allows, most preferred first.
+
+    Brotli is preferred over gzip when both are acceptable with the same
+    quality value. Encodings listed with q=0 are refused.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+        available: Candidate encodings in order of preference (defaults to
+            br, when brotli is installed, and gzip)
+
+    Returns:
+        Acceptable encodings; empty to send the response uncompressed
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    if available is None:
+        available = ["br", "gzip"] if brotli is not None else ["gzip"]
+    ranked = [(qualities.get(encoding, wildcard), -i, encoding) for i, encoding in enumerate(available)]
+    return [encoding for quality, _, encoding in sorted(ranked, reverse=True) if quality > 0]
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the response encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+
+    Returns:
+        "br", "gzip", or None to send the response uncompressed
+    """
+    encodings = accepted_encodings(accept_encoding)
+    return encodings[0] if encodings else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a complete body with "br" or "gzip"."""
+    return _Compressor(encoding).finish(body)
+
+
+class _Compressor:
+    """Incremental brotli or gzip compressor."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(mode=brotli.MODE_TEXT, quality=settings.compression_brotli_quality)
+        else:
+            # wbits 16 + MAX_WBITS writes a gzip header and trailer
+            self._zlib = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        """Compress a chunk; flush makes everything so far decodable by the client."""
+        if self.encoding == "br":
+            out = self._brotli.process(data)
+            return out + self._brotli.flush() if flush else out
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing text responses for clients that accept it.
+
+    Complete responses are compressed when they reach minimum_size bytes.
+    Streaming responses, such as the NDJSON bulk results, are compressed
+    chunk by chunk and flushed after each one, so records still reach the
+    client as soon as they are produced.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        """
+        Args:
+            app: ASGI application to wrap
+            minimum_size: Smallest complete body worth compressing (defaults to config)
+        """
+        self.app = app
+        self.minimum_size = settings.compression_minimum_bytes if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                passthrough = not self._compressible(message)
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    # Small complete response: not worth the encoding overhead
+                    await send(start_message)
+                    await send(message)
+                    passthrough = True
+                    return
+                compressor = _Compressor(encoding)
+                headers = self._compressed_headers(start_message["headers"], encoding)
+                if not more_body:
+                    body = compressor.finish(body)
+                    headers.append((b"content-length", str(len(body)).encode()))
+                await send({**start_message, "headers": headers})
+                if not more_body:
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                body = compressor.compress(body, flush=True)
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+                return
+
+            if more_body:
+                body = compressor.compress(body, flush=True)
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": compressor.finish(body)})
+
+        await self.app(scope, receive, compressing_send)
+
+    @staticmethod
+    def _compressible(start_message) -> bool:
+        if start_message["status"] < 200 or start_message["status"] in (204, 206, 304):
+            return False
+        content_type = b""
+        for name, value in start_message.get("headers", []):
+            name = name.lower()
+            if name == b"content-encoding" or name == b"content-range":
+                return False
+            if name == b"content-type":
+                content_type = value.lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    @staticmethod
+    def _compressed_headers(headers, encoding: str) -> List[Tuple[bytes, bytes]]:
+        result = []
+        vary = None
+        for name, value in headers:
+            lower = name.lower()
+            if lower == b"content-length":
+                continue
+            if lower == b"vary":
+                vary = value
+                continue
+            if lower == b"etag" and not value.startswith(b"W/"):
+                # The encoded body is a different representation; it only matches weakly
+                value = b"W/" + value
+            result.append((name, value))
+        vary_value = b"Accept-Encoding" if vary is None else vary + b", Accept-Encoding"
+        result.append((b"vary", vary_value))
+        result.append((b"content-encoding", encoding.encode()))
+        return result
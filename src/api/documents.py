@@ -0,0 +1,142 @@
+"""Loading, storing and resolving resumes and job descriptions by id."""
+
+import io
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Union
+
+from fastapi import HTTPException
+
+from ..cache import content_hash, get_resume_cache
+from ..config import settings
+from ..metrics import record_cache, timed
+from ..models import (
+    CachedResume,
+    DocumentKind,
+    JobDescriptionDigest,
+    QuestionGenerationResponse,
+    ResumeData,
+    StoredDocument,
+)
+from ..parsers import detect_format, get_parse_pool
+from ..parsers.resume_parser import PDF_FORMAT, TXT_FORMAT
+from ..storage import get_document_store
+from .bulk import resume_summary
+from .uploads import SpooledUpload, document_source
+
+
+logger = logging.getLogger(__name__)
+
+# Formats Gemini reads natively as documents; DOCX is always parsed locally
+DOCUMENT_MIME_TYPES = {PDF_FORMAT: "application/pdf", TXT_FORMAT: "text/plain"}
+
+
+async def load_resume(document: Union[bytes, SpooledUpload], file_name: Optional[str] = None) -> CachedResume:
+    """
+    Return the parse of an uploaded resume, reusing the cached parse of the
+    same or a near-duplicate document when there is one.
+    
+    A spooled upload reaches the parse worker as its temporary file's path
+    when it was too large to keep in memory. A fresh parse is also saved in
+    the document store, so its resume_id resolves in every worker process.
+    
+    Raises:
+        ResumeParserError: If the document cannot be parsed
+    """
+    resume_cache = get_resume_cache()
+    digest = document.digest if isinstance(document, SpooledUpload) else content_hash(document)
+    cached = resume_cache.find(digest)
+    if cached is not None:
+        record_cache("resume", "hit")
+        return cached
+    with timed("resume_parse"):
+        resume_data = await get_parse_pool().parse(document_source(document), file_name)
+    cached = resume_cache.add(digest, resume_data)
+    record_cache("resume", "near_duplicate" if cached.reused else "miss")
+    if not cached.reused:
+        store_document(cached.resume_id, DocumentKind.RESUME, file_name=file_name, resume=resume_data)
+    return cached
+
+
+async def load_resume_data(document: Union[bytes, SpooledUpload], file_name: Optional[str] = None) -> ResumeData:
+    """Return just the parsed resume from load_resume()."""
+    return (await load_resume(document, file_name)).resume
+
+
+def resume_document_mime_type(document: Union[bytes, SpooledUpload], file_name: Optional[str] = None) -> Optional[str]:
+    """
+    Return the MIME type for sending a resume to Gemini as a document, or
+    None if its format has to be parsed locally.
+    
+    Raises:
+        UnsupportedFormatError: If the content is not PDF, DOCX or UTF-8 text
+    """
+    stream = document.file if isinstance(document, SpooledUpload) else io.BytesIO(document)
+    return DOCUMENT_MIME_TYPES.get(detect_format(stream, file_name))
+
+
+def resume_cache_info(cached: CachedResume) -> dict:
+    """Describe how a resume was matched in the resume cache, for response metadata."""
+    return {
+        "resume_id": cached.resume_id,
+        "reused_parse": cached.reused,
+        "distance": cached.distance,
+        "similarity": cached.similarity
+    }
+
+
+def resolve_resume(resume_id: str) -> CachedResume:
+    """
+    Return a previously parsed resume by id, from the resume cache or the document store.
+    
+    Raises:
+        HTTPException: 404 if the id is unknown or has expired
+    """
+    resume_cache = get_resume_cache()
+    resume_data = resume_cache.get(resume_id)
+    if resume_data is None:
+        document = get_document_store().get(resume_id)
+        if document is None or document.kind != DocumentKind.RESUME:
+            raise HTTPException(status_code=404, detail=f"Resume '{resume_id}' not found; upload it again")
+        resume_data = document.resume
+        resume_cache.restore(resume_id, resume_data)
+    return CachedResume(resume_id=resume_id, resume=resume_data, reused=True)
+
+
+def store_document(
+    document_id: str,
+    kind: DocumentKind,
+    file_name: Optional[str] = None,
+    resume: Optional[ResumeData] = None,
+    job_description: Optional[JobDescriptionDigest] = None,
+    result: Optional[QuestionGenerationResponse] = None
+) -> StoredDocument:
+    """Save a parsed document or generation result under its id for the configured document lifetime."""
+    now = datetime.now(timezone.utc)
+    document = StoredDocument(
+        document_id=document_id,
+        kind=kind,
+        file_name=file_name,
+        created_at=now,
+        expires_at=now + timedelta(seconds=settings.document_ttl_seconds),
+        resume=resume,
+        job_description=job_description,
+        result=result,
+    )
+    get_document_store().put(document)
+    logger.info(f"Stored {kind.value} document {document_id}")
+    return document
+
+
+def document_info(document: StoredDocument) -> dict:
+    """Public view of a stored document: its id, expiry and parsed summary."""
+    return {
+        "document_id": document.document_id,
+        "kind": document.kind,
+        "file_name": document.file_name,
+        "created_at": document.created_at,
+        "expires_at": document.expires_at,
+        "resume": resume_summary(document.resume) if document.resume else None,
+        "job_description": document.job_description,
+        "result": document.result
+    }
@@ -0,0 +1,154 @@
+"""Idempotency-Key handling for the question generation endpoints."""
+
+import asyncio
+import hashlib
+import logging
+from typing import Any, Dict, Hashable, Optional
+
+from fastapi import HTTPException
+
+from ..cache import get_idempotency_cache
+from ..config import settings
+from ..models import IdempotencyRecord, QuestionGenerationResponse
+
+
+logger = logging.getLogger(__name__)
+
+# Header set on responses replayed for a retried Idempotency-Key
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+_MAX_KEY_LENGTH = 255
+
+# Claims held by requests running in this process; retries wait on them
+_in_flight: Dict[Hashable, asyncio.Future] = {}
+
+
+def request_fingerprint(**fields: Any) -> str:
+    """
+    Hash the inputs of a generation request.
+
+    Retries must send the same inputs as the request that first used the
+    key; comparing fingerprints detects a key reused for a different body.
+    Fields are hashed by value, so uploads should be passed as content hashes.
+    """
+    parts = [f"{name}={fields[name]!r}" for name in sorted(fields)]
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+class IdempotencyClaim:
+    """
+    A request's hold on an Idempotency-Key.
+
+    Either carries the response stored for the key (``replay``), or marks the
+    key as in progress until complete() records the response. Leaving the
+    claim's ``with`` block without completing releases the key, so a failed
+    request can be retried with it.
+    """
+
+    def __init__(
+        self,
+        cache_key: Optional[Hashable] = None,
+        fingerprint: Optional[str] = None,
+        replay: Optional[QuestionGenerationResponse] = None
+    ):
+        self.cache_key = cache_key
+        self.fingerprint = fingerprint
+        self.replay = replay
+        self._done = cache_key is None or replay is not None
+
+    def complete(self, response: QuestionGenerationResponse) -> None:
+        """Store the response so retries with the same key receive it."""
+        if self._done:
+            return
+        get_idempotency_cache().set(
+            self.cache_key, IdempotencyRecord(fingerprint=self.fingerprint, response=response)
+        )
+        self._finish()
+
+    def release(self) -> None:
+        """Give up the key without a response."""
+        if self._done:
+            return
+        get_idempotency_cache().pop(self.cache_key)
+        self._finish()
+
+    def _finish(self) -> None:
+        self._done = True
+        future = _in_flight.pop(self.cache_key, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    def __enter__(self) -> "IdempotencyClaim":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+async def claim_idempotency_key(
+    idempotency_key: Optional[str],
+    api_key: str,
+    fingerprint: str
+) -> IdempotencyClaim:
+    """
+    Claim an Idempotency-Key for a request, or find the response already stored for it.
+
+    Keys are scoped to the caller's API key. A retry that arrives while the
+    first request is still running in this process waits for it to finish;
+    one that reaches another worker is refused until the claim is completed,
+    released, or abandoned after the pending timeout.
+
+    Args:
+        idempotency_key: Idempotency-Key header value (None disables idempotency)
+        api_key: Gemini API key of the caller
+        fingerprint: request_fingerprint() of the request's inputs
+
+    Returns:
+        An IdempotencyClaim; its ``replay`` is set when the response is already stored
+
+    Raises:
+        HTTPException: 400 for an invalid key, 409 if the key was used with a
+            different request or that request is still in progress elsewhere
+    """
+    if idempotency_key is None:
+        return IdempotencyClaim()
+    idempotency_key = idempotency_key.strip()
+    if not idempotency_key or len(idempotency_key) > _MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Idempotency-Key must be between 1 and {_MAX_KEY_LENGTH} characters"
+        )
+
+    cache = get_idempotency_cache()
+    owner = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    cache_key = (owner, idempotency_key)
+    pending = IdempotencyRecord(fingerprint=fingerprint)
+    while True:
+        # Atomic across workers: exactly one request claims a free key. The
+        # pending entry expires on its own, so a claim abandoned by a crashed
+        # worker frees the key after the pending timeout.
+        if cache.add(cache_key, pending, ttl_seconds=settings.idempotency_pending_timeout_seconds):
+            # No await between the claim and this, so retries in this process find it
+            _in_flight[cache_key] = asyncio.get_running_loop().create_future()
+            return IdempotencyClaim(cache_key, fingerprint)
+
+        entry = cache.get(cache_key)
+        if entry is None:
+            # Released or expired since the claim failed; try again
+            continue
+        if entry.fingerprint != fingerprint:
+            raise HTTPException(
+                status_code=409,
+                detail="Idempotency-Key was already used with a different request"
+            )
+        if entry.response is not None:
+            logger.info(f"Replaying response for Idempotency-Key {idempotency_key!r}")
+            return IdempotencyClaim(cache_key, fingerprint, replay=entry.response)
+        waiter = _in_flight.get(cache_key)
+        if waiter is None:
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this Idempotency-Key is still in progress"
+            )
+        # Same process: wait for the first request, then look again
+        await asyncio.shield(waiter)
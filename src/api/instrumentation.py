@@ -0,0 +1,47 @@
+"""Request-level metrics and Server-Timing headers, collected by an ASGI middleware."""
+
+from ..metrics import HTTP_REQUESTS, IN_FLIGHT, request_timings
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting HTTP requests by route template, method and
+    status code, and tracking how many are in flight.
+
+    The route template (e.g. /api/v1/results/{result_id}) is used rather
+    than the raw path so ids do not create a new series per request.
+
+    Every response also gets a Server-Timing header with the stages timed
+    while it was produced, the caches consulted and any fallbacks taken.
+    Streamed responses only cover the work done before the first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def recording_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        with IN_FLIGHT.track(operation="http_request"), request_timings() as timings:
+            try:
+                await self.app(scope, receive, recording_send)
+            finally:
+                route = scope.get("route")
+                HTTP_REQUESTS.inc(
+                    route=getattr(route, "path", None) or "unmatched",
+                    method=scope["method"],
+                    status=str(status),
+                )
@@ -0,0 +1,136 @@
+"""Registration and lookup of job description digests."""
+
+import logging
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile
+
+from ..cache import get_job_description_cache
+from ..metrics import record_cache, timed
+from ..models import DocumentKind, JobDescriptionDigest
+from ..parsers import (
+    ParseBudgetExceededError,
+    ResumeParserError,
+    digest_job_description,
+    get_parse_pool,
+    job_description_id,
+)
+from ..storage import get_document_store
+from .uploads import spool_upload
+
+
+logger = logging.getLogger(__name__)
+
+
+def register_job_description(text: str) -> JobDescriptionDigest:
+    """
+    Return the digest of a job description, building and storing it on first sight.
+
+    Args:
+        text: Job description text
+
+    Returns:
+        JobDescriptionDigest stored under its content id
+    """
+    cache = get_job_description_cache()
+    jd_id = job_description_id(text)
+    digest = cache.get(jd_id)
+    record_cache("job_description", "miss" if digest is None else "hit")
+    if digest is None:
+        with timed("job_description_digest"):
+            digest = digest_job_description(text)
+        cache.set(jd_id, digest)
+        logger.info(
+            f"Registered job description {jd_id}: {digest.source_chars} characters "
+            f"digested to {len(digest.text)}"
+        )
+    return digest
+
+
+async def register_job_description_file(upload: UploadFile) -> JobDescriptionDigest:
+    """
+    Return the digest of an uploaded job description file.
+
+    A file whose bytes were seen before is not extracted again.
+
+    Raises:
+        HTTPException: 413 if the upload is larger than the cap
+        ResumeParserError: If text cannot be extracted from the file
+    """
+    cache = get_job_description_cache()
+    with timed("upload_read"):
+        jd_file = await spool_upload(upload)
+
+    with jd_file:
+        file_key = ("file", jd_file.digest)
+        jd_id = cache.get(file_key)
+        digest = cache.get(jd_id) if jd_id else None
+        record_cache("job_description_file", "miss" if digest is None else "hit")
+        if digest is None:
+            with timed("text_extract"):
+                text = await get_parse_pool().extract_text(jd_file.source(), upload.filename)
+            digest = register_job_description(text)
+            cache.set(file_key, digest.job_description_id)
+    return digest
+
+
+def get_job_description(jd_id: str) -> JobDescriptionDigest:
+    """
+    Return a registered job description digest, from the cache or the document store.
+
+    Raises:
+        HTTPException: 404 if the id is unknown or has expired
+    """
+    cache = get_job_description_cache()
+    digest = cache.get(jd_id)
+    if digest is None:
+        document = get_document_store().get(jd_id)
+        if document is None or document.kind != DocumentKind.JOB_DESCRIPTION:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Job description '{jd_id}' not found; register it again"
+            )
+        digest = document.job_description
+        cache.set(jd_id, digest)
+    return digest
+
+
+async def resolve_job_description(
+    text: Optional[str] = None,
+    upload: Optional[UploadFile] = None,
+    jd_id: Optional[str] = None
+) -> JobDescriptionDigest:
+    """
+    Return the digest for whichever job description source a request supplied.
+
+    A registered id wins over a file, and a file over text.
+
+    Raises:
+        HTTPException: 400 if no source is given or the file cannot be read,
+            404 for an unknown id, 422 if the file blew the parse budget
+    """
+    if jd_id:
+        return get_job_description(jd_id)
+
+    if upload and upload.filename:
+        logger.info(f"Processing job description file: {upload.filename}")
+        try:
+            return await register_job_description_file(upload)
+        except ParseBudgetExceededError as e:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Failed to extract text from job description file: {str(e)}"
+            )
+        except ResumeParserError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Failed to extract text from job description file: {str(e)}"
+            )
+
+    if text:
+        return register_job_description(text)
+
+    raise HTTPException(
+        status_code=400,
+        detail="Either job_description text, job_description_file or job_description_id must be provided"
+    )
@@ -1,23 +1,52 @@
 """FastAPI application for the Interview Assistant."""
 
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request
+from fastapi import FastAPI, File, UploadFile, Form, Header, HTTPException, Request, Response, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 import logging
 from typing import Optional, List
 import os
 
 from ..agent import InterviewQuestionAgent, InterviewAgentError
-from ..parsers import ResumeParser, ResumeParserError
+from ..parsers import ParseBudgetExceededError, ResumeParserError, get_parse_pool
+from ..cache import generation_key, get_generation_cache
+from ..storage import get_document_store
 from ..models import (
+    DocumentKind,
+    JobDescriptionDigest,
     QuestionGenerationRequest,
+    ResumeMode,
+    ResumeRanking,
     QuestionGenerationResponse,
     RoundType,
     DifficultyLevel
 )
 from ..config import settings
+from ..matching import rank_resumes
+from ..metrics import REGISTRY, current_timings, record_cache, record_fallback, timed
+from ..metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .admission import AdmissionControl, AdmissionControlMiddleware
+from .assets import StaticAssets
+from .bulk import iter_bulk_documents, iter_parsed, resume_summary, stream_parse_results
+from .documents import (
+    document_info,
+    load_resume,
+    load_resume_data,
+    resolve_resume,
+    resume_cache_info,
+    resume_document_mime_type,
+    store_document,
+)
+from .compression import CompressionMiddleware
+from .idempotency import REPLAYED_HEADER, claim_idempotency_key, request_fingerprint
+from .instrumentation import MetricsMiddleware
+from .job_descriptions import get_job_description, resolve_job_description
+from .responses import FastJSONResponse, ModelResponse
+from .results import conditional_response, get_result, save_result
+from .sessions import run_session
+from .uploads import RequestSizeLimitMiddleware, spool_upload
 
 
 # Configure logging
@@ -34,12 +63,15 @@ app = FastAPI(
     description="AI-powered interview question generator",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse
 )
 
-# Mount static files and templates
+# Mount static files and templates; templates link assets by fingerprinted URL
+static_assets = StaticAssets(prefix="/static")
 templates = Jinja2Templates(directory="templates")
-app.mount("/static", StaticFiles(directory="static"), name="static")
+templates.env.globals["asset_url"] = static_assets.url
+app.mount("/static", static_assets, name="static")
 
 
 # Add CORS middleware
@@ -50,16 +82,31 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    RequestSizeLimitMiddleware,
+    path_limits={
+        "/api/v1/parse-resumes": settings.bulk_upload_max_request_bytes,
+        "/api/v1/match-resumes": settings.bulk_upload_max_request_bytes
+    }
+)
+# Shed load past the concurrency limits with 503 + Retry-After; the 503s are
+# still compressed and counted by the outer middlewares
+admission = AdmissionControl()
+app.add_middleware(AdmissionControlMiddleware, admission=admission)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
-# Initialize services
-resume_parser = ResumeParser()
+# Initialize services; parsing runs in supervised worker processes
+parse_pool = get_parse_pool()
+generation_cache = get_generation_cache()
+document_store = get_document_store()
 
 
 @app.get("/", response_class=HTMLResponse)
 async def web_home(request: Request):
     """Serve the main web interface."""
-    return templates.TemplateResponse("index.html", {"request": request})
+    return templates.TemplateResponse(request, "index.html")
 
 
 @app.get("/api")
@@ -78,15 +125,25 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "model": settings.model_name
+        "model": settings.model_name,
+        "parse_pool": parse_pool.stats(),
+        "admission": admission.stats()
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics for this process: stage latencies, errors, cache hits and in-flight work."""
+    return Response(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.post("/api/v1/generate-questions", response_model=QuestionGenerationResponse)
 async def generate_questions_from_upload(
-    resume: UploadFile = File(..., description="Resume file (PDF, DOCX, or TXT)"),
+    resume: Optional[UploadFile] = File(None, description="Resume file (PDF, DOCX, or TXT)"),
+    resume_id: Optional[str] = Form(None, description="Id of a stored or previously parsed resume"),
     job_description: Optional[str] = Form(None, description="Job description text"),
-    job_description_file: Optional[UploadFile] = File(None, description="Job description file (PDF or DOCX)"),
+    job_description_file: Optional[UploadFile] = File(None, description="Job description file (PDF, DOCX, or TXT)"),
+    job_description_id: Optional[str] = Form(None, description="Id of a registered job description"),
     round_type: RoundType = Form(..., description="Interview round type"),
     difficulty: DifficultyLevel = Form(
         DifficultyLevel.INTERMEDIATE,
@@ -94,119 +151,180 @@ async def generate_questions_from_upload(
     ),
     num_questions: int = Form(10, ge=1, le=50, description="Number of questions"),
     focus_areas: Optional[str] = Form(None, description="Comma-separated focus areas"),
-    api_key: str = Form(..., description="Gemini API key")
+    resume_mode: Optional[ResumeMode] = Form(
+        None,
+        description="text to parse the resume locally, document to send the original file to Gemini"
+    ),
+    api_key: str = Form(..., description="Gemini API key"),
+    idempotency_key: Optional[str] = Header(None, description="Client key making retries return the first response")
 ):
     """
     Generate interview questions from uploaded resume and job description.
     
     Args:
-        resume: Resume file (PDF, DOCX, or TXT)
+        resume: Resume file (PDF, DOCX, or TXT - optional if resume_id provided)
+        resume_id: Id returned by /api/v1/documents or a previous response, used instead of a file
         job_description: Text description of the job (optional if job_description_file provided)
-        job_description_file: Job description file (PDF or DOCX - optional if job_description provided)
+        job_description_file: Job description file (PDF, DOCX, or TXT - optional if job_description provided)
+        job_description_id: Id returned by /api/v1/job-descriptions, used instead of text or a file
         round_type: Type of interview (technical, behavioral, etc.)
         difficulty: Difficulty level of questions
         num_questions: How many questions to generate
         focus_areas: Optional comma-separated list of focus areas
+        resume_mode: How an uploaded resume reaches the model (defaults to config);
+            document mode skips local parsing for PDF and text files
+        idempotency_key: Optional Idempotency-Key header; a retry with the same key and
+            inputs receives the first response instead of generating again, and
+            reusing the key for different inputs is rejected with 409
         
     Returns:
         QuestionGenerationResponse with generated questions
     """
+    resume_file = None
     try:
-        # Validate that at least one job description source is provided
-        if not job_description and not job_description_file:
-            raise HTTPException(
-                status_code=400,
-                detail="Either job_description text or job_description_file must be provided"
-            )
-        
-        # Validate resume file type
-        supported_formats = ['.pdf', '.docx', '.txt']
-        file_lower = resume.filename.lower()
-        if not any(file_lower.endswith(fmt) for fmt in supported_formats):
-            raise HTTPException(
-                status_code=400,
-                detail="Only PDF, DOCX, and TXT files are supported for resumes"
-            )
+        # Resolve the job description to its registered digest; a known id or
+        # previously seen file skips extraction entirely
+        jd_digest = await resolve_job_description(job_description, job_description_file, job_description_id)
+        job_description = jd_digest.text
         
-        # Read and parse resume
-        logger.info(f"Processing resume: {resume.filename}")
-        resume_bytes = await resume.read()
-        
-        try:
-            resume_data = resume_parser.parse_resume_bytes(resume_bytes, resume.filename)
-        except ResumeParserError as e:
-            raise HTTPException(status_code=400, detail=f"Resume parsing error: {str(e)}")
-        
-        # Process job description - either from text or file
-        if job_description_file and job_description_file.filename:
-            logger.info(f"Processing job description file: {job_description_file.filename}")
-            
-            # Validate JD file type - only PDF and DOCX allowed
-            jd_file_lower = job_description_file.filename.lower()
-            if not (jd_file_lower.endswith('.pdf') or jd_file_lower.endswith('.docx')):
-                raise HTTPException(
-                    status_code=400,
-                    detail="Only PDF and DOCX files are supported for job description"
-                )
-            
-            jd_bytes = await job_description_file.read()
-            
-            try:
-                job_description = resume_parser.extract_text_from_file(jd_bytes, job_description_file.filename)
-                logger.info(f"Successfully extracted job description from file ({len(job_description)} characters)")
-            except Exception as e:
-                logger.error(f"Error extracting job description: {str(e)}")
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to extract text from job description file: {str(e)}"
-                )
+        # Use a stored resume when referenced by id; otherwise stream the upload to a
+        # size-capped spool and either send it to Gemini as a document or parse it
+        # in a supervised worker process
+        resume_mode = resume_mode or ResumeMode(settings.resume_mode)
+        if not resume_id:
+            if resume is None or not resume.filename:
+                raise HTTPException(status_code=400, detail="Either resume or resume_id must be provided")
+            logger.info(f"Processing resume: {resume.filename}")
+            with timed("upload_read"):
+                resume_file = await spool_upload(resume)
         
         # Parse focus areas if provided
         focus_list = None
         if focus_areas:
             focus_list = [area.strip() for area in focus_areas.split(',')]
         
-        # Generate questions
-        logger.info(f"Generating {num_questions} {round_type} questions")
+        # A retry with the same Idempotency-Key gets the first request's response
+        claim = await claim_idempotency_key(idempotency_key, api_key, request_fingerprint(
+            resume=resume_id or (resume.filename, resume_file.digest),
+            job_description_id=jd_digest.job_description_id,
+            round_type=round_type.value,
+            difficulty=difficulty.value,
+            num_questions=num_questions,
+            focus_areas=tuple(focus_list or ()),
+            resume_mode=resume_mode.value
+        ))
+        if claim.replay is not None:
+            return ModelResponse(claim.replay, headers={REPLAYED_HEADER: "true"})
         
-        try:
-            # Create question agent with provided API key
-            question_agent = InterviewQuestionAgent(api_key=api_key)
+        with claim:
+            cached_resume = None
+            resume_document = None
+            resume_mime_type = None
+            try:
+                if resume_id:
+                    cached_resume = resolve_resume(resume_id)
+                else:
+                    if resume_mode == ResumeMode.DOCUMENT:
+                        resume_mime_type = resume_document_mime_type(resume_file, resume.filename)
+                        if not resume_mime_type:
+                            record_fallback("document_mode_local_parse")
+                    if resume_mime_type:
+                        # Gemini needs the bytes themselves; only document mode reads them here
+                        resume_document = resume_file.read()
+                    else:
+                        cached_resume = await load_resume(resume_file, resume.filename)
+            except ParseBudgetExceededError as e:
+                raise HTTPException(status_code=422, detail=f"Resume parsing error: {str(e)}")
+            except ResumeParserError as e:
+                raise HTTPException(status_code=400, detail=f"Resume parsing error: {str(e)}")
             
-            response = question_agent.generate_questions(
-                resume_text=resume_data.raw_text,
-                job_description=job_description,
-                round_type=round_type,
-                difficulty=difficulty,
+            # Reuse questions already generated for this resume (or a near duplicate of it)
+            if resume_document is not None:
+                resume_info = {"document_id": "doc_" + resume_file.digest[:16]}
+                resume_key = resume_info["document_id"]
+            else:
+                resume_info = resume_cache_info(cached_resume)
+                resume_key = cached_resume.resume_id
+            cache_key = generation_key(
+                resume_key,
+                job_description,
+                round_type=round_type.value,
+                difficulty=difficulty.value,
                 num_questions=num_questions,
-                focus_areas=focus_list
+                focus_areas=tuple(focus_list or ())
             )
-        except InterviewAgentError as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Question generation error: {str(e)}"
-            )
-        
-        logger.info(f"Successfully generated {response.total_questions} questions")
-        return response
+            response = generation_cache.get(cache_key)
+            cached_generation = response is not None
+            record_cache("generation", "hit" if cached_generation else "miss")
+            
+            if response is None:
+                logger.info(f"Generating {num_questions} {round_type} questions")
+                
+                try:
+                    # Create question agent with provided API key
+                    question_agent = InterviewQuestionAgent(api_key=api_key)
+                    
+                    # The Gemini client blocks; keep the event loop free for other requests
+                    response = await run_in_threadpool(
+                        question_agent.generate_questions,
+                        resume_text=cached_resume.resume.raw_text if cached_resume else "",
+                        job_description=job_description,
+                        round_type=round_type,
+                        difficulty=difficulty,
+                        num_questions=num_questions,
+                        focus_areas=focus_list,
+                        resume_document=resume_document,
+                        resume_mime_type=resume_mime_type
+                    )
+                except InterviewAgentError as e:
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Question generation error: {str(e)}"
+                    )
+                logger.info(f"Successfully generated {response.total_questions} questions")
+            else:
+                logger.info(f"Reusing {response.total_questions} cached questions for resume {resume_key}")
+            
+            timings = current_timings()
+            response = response.model_copy()
+            response.metadata = {
+                **(response.metadata or {}),
+                "resume": resume_info,
+                "resume_mode": ResumeMode.TEXT.value if resume_document is None else ResumeMode.DOCUMENT.value,
+                "job_description_id": jd_digest.job_description_id,
+                "cached_generation": cached_generation,
+                "timings": timings.as_dict() if timings else None
+            }
+            if not cached_generation:
+                # Store the result so it can be fetched again by id without regenerating;
+                # cache hits carry the same result_id
+                response = save_result(response)
+                generation_cache.set(cache_key, response)
+            claim.complete(response)
+            return ModelResponse(response)
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    finally:
+        if resume_file is not None:
+            resume_file.close()
 
 
 @app.post("/api/v1/generate-questions-json", response_model=QuestionGenerationResponse)
 async def generate_questions_from_json(
     request: QuestionGenerationRequest,
-    api_key: str = Form(..., description="Gemini API key")
+    api_key: str = Form(..., description="Gemini API key"),
+    idempotency_key: Optional[str] = Header(None, description="Client key making retries return the first response")
 ):
     """
     Generate interview questions from JSON request.
     
     Args:
         request: QuestionGenerationRequest object
+        idempotency_key: Optional Idempotency-Key header, as for /api/v1/generate-questions
         
     Returns:
         QuestionGenerationResponse with generated questions
@@ -217,14 +335,37 @@ async def generate_questions_from_json(
             f"at {request.difficulty} level"
         )
         
-        # Create question agent with provided API key
-        question_agent = InterviewQuestionAgent(api_key=api_key)
+        claim = await claim_idempotency_key(
+            idempotency_key, api_key, request_fingerprint(request=request.model_dump_json())
+        )
+        if claim.replay is not None:
+            return ModelResponse(claim.replay, headers={REPLAYED_HEADER: "true"})
         
-        response = question_agent.generate_from_request(request)
+        with claim:
+            jd_digest = await resolve_job_description(request.job_description, jd_id=request.job_description_id)
+            updates = {"job_description": jd_digest.text}
+            if request.resume_id:
+                updates["resume_text"] = resolve_resume(request.resume_id).resume.raw_text
+            request = request.model_copy(update=updates)
+            
+            # Create question agent with provided API key
+            question_agent = InterviewQuestionAgent(api_key=api_key)
+            
+            response = await run_in_threadpool(question_agent.generate_from_request, request)
+            timings = current_timings()
+            response.metadata = {
+                **(response.metadata or {}),
+                "job_description_id": jd_digest.job_description_id,
+                "timings": timings.as_dict() if timings else None
+            }
+            response = save_result(response)
+            claim.complete(response)
         
         logger.info(f"Successfully generated {response.total_questions} questions")
-        return response
+        return ModelResponse(response)
         
+    except HTTPException:
+        raise
     except InterviewAgentError as e:
         raise HTTPException(
             status_code=500,
@@ -235,6 +376,22 @@ async def generate_questions_from_json(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@app.websocket("/api/v1/sessions")
+async def interview_session(websocket: WebSocket):
+    """
+    Interactive interview session for follow-up questions.
+    
+    Send a "start" message with the fields of a generate-questions-json request
+    and an api_key, then "follow_up" messages such as
+    {"type": "follow_up", "message": "3 more on Kubernetes"}. Only the new
+    request travels with each follow-up; the resume, job description and
+    earlier questions stay in the session's Gemini chat. Each turn streams
+    "delta" messages and ends with a "questions" message. Each turn is
+    admitted through the same limiters as API requests.
+    """
+    await run_session(websocket, admission=admission)
+
+
 @app.post("/api/v1/parse-resume")
 async def parse_resume_endpoint(resume: UploadFile = File(...)):
     """
@@ -247,26 +404,20 @@ async def parse_resume_endpoint(resume: UploadFile = File(...)):
         Parsed resume data
     """
     try:
-        supported_formats = ['.pdf', '.docx', '.txt']
-        file_lower = resume.filename.lower()
-        if not any(file_lower.endswith(fmt) for fmt in supported_formats):
-            raise HTTPException(
-                status_code=400,
-                detail="Only PDF, DOCX, and TXT files are supported"
-            )
-        
         logger.info(f"Parsing resume: {resume.filename}")
-        resume_bytes = await resume.read()
         
-        resume_data = resume_parser.parse_resume_bytes(resume_bytes, resume.filename)
+        with await spool_upload(resume) as resume_file:
+            cached_resume = await load_resume(resume_file, resume.filename)
         
         return {
-            "name": resume_data.name,
-            "email": resume_data.email,
-            "skills": resume_data.skills,
-            "text_preview": resume_data.raw_text[:500] + "..."
+            **resume_summary(cached_resume.resume),
+            "cache": resume_cache_info(cached_resume)
         }
         
+    except HTTPException:
+        raise
+    except ParseBudgetExceededError as e:
+        raise HTTPException(status_code=422, detail=f"Resume parsing error: {str(e)}")
     except ResumeParserError as e:
         raise HTTPException(status_code=400, detail=f"Resume parsing error: {str(e)}")
     except Exception as e:
@@ -274,13 +425,217 @@ async def parse_resume_endpoint(resume: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@app.post("/api/v1/parse-resumes")
+async def parse_resumes_endpoint(
+    resumes: List[UploadFile] = File(..., description="Resume files (PDF, DOCX, TXT) or ZIP archives of them")
+):
+    """
+    Parse many resumes in parallel and stream the results as NDJSON.
+    
+    Each line is one JSON record with the file's index and name, a status of
+    "ok" or "error", and either the parsed resume summary or the error.
+    Records are emitted as soon as each resume finishes, not in upload order.
+    
+    Args:
+        resumes: Resume files, or ZIP archives containing resume files
+        
+    Returns:
+        Streaming NDJSON response with one record per resume
+    """
+    logger.info(f"Bulk parsing {len(resumes)} uploaded files")
+    return StreamingResponse(
+        stream_parse_results(iter_bulk_documents(resumes)),
+        media_type="application/x-ndjson"
+    )
+
+
+@app.post("/api/v1/match-resumes", response_model=ResumeRanking)
+async def match_resumes_endpoint(
+    resumes: List[UploadFile] = File(..., description="Resume files (PDF, DOCX, TXT) or ZIP archives of them"),
+    job_description: Optional[str] = Form(None, description="Job description text"),
+    job_description_file: Optional[UploadFile] = File(None, description="Job description file (PDF, DOCX, or TXT)"),
+    job_description_id: Optional[str] = Form(None, description="Id of a registered job description"),
+    top_k: Optional[int] = Form(None, ge=1, description="Return only the best k matches")
+):
+    """
+    Rank many resumes against one job description without any LLM calls.
+    
+    Resumes are scored by TF-IDF cosine similarity to the job description,
+    and each match lists the job's skills the resume has and lacks.
+    
+    Args:
+        resumes: Resume files, or ZIP archives containing resume files
+        job_description: Text description of the job (optional if job_description_file provided)
+        job_description_file: Job description file (optional if job_description provided)
+        job_description_id: Id returned by /api/v1/job-descriptions; its digest is scored against
+        top_k: Return only the best k matches
+        
+    Returns:
+        ResumeRanking with matches ordered by descending score
+    """
+    if job_description_id:
+        job_description = get_job_description(job_description_id).text
+    elif not job_description and not job_description_file:
+        raise HTTPException(
+            status_code=400,
+            detail="Either job_description text, job_description_file or job_description_id must be provided"
+        )
+    elif job_description_file and job_description_file.filename:
+        try:
+            with await spool_upload(job_description_file) as jd_file:
+                job_description = await parse_pool.extract_text(
+                    jd_file.source(), job_description_file.filename
+                )
+        except ParseBudgetExceededError as e:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Failed to extract text from job description file: {str(e)}"
+            )
+        except ResumeParserError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Failed to extract text from job description file: {str(e)}"
+            )
+    
+    logger.info(f"Matching {len(resumes)} uploaded files against a job description")
+    parsed = []
+    errors = []
+    async for index, name, resume_data, error in iter_parsed(iter_bulk_documents(resumes), load_resume_data):
+        if error:
+            errors.append({"index": index, "file_name": name, "error": error})
+        else:
+            parsed.append((index, name, resume_data))
+    # Results arrive in completion order; rank in upload order so ties are stable
+    parsed.sort(key=lambda item: item[0])
+    
+    ranking = rank_resumes(job_description, [resume_data for _, _, resume_data in parsed], top_k=top_k)
+    for match in ranking.matches:
+        match.index, match.file_name, _ = parsed[match.index]
+    ranking.errors = sorted(errors, key=lambda error: error["index"])
+    return ModelResponse(ranking)
+
+
+@app.post("/api/v1/documents", status_code=201)
+async def create_document_endpoint(
+    kind: DocumentKind = Form(..., description="Document kind: resume or job_description"),
+    file: Optional[UploadFile] = File(None, description="Document file (PDF, DOCX, or TXT)"),
+    text: Optional[str] = Form(None, description="Document text, instead of a file")
+):
+    """
+    Parse and store a resume or job description, returning its id.
+    
+    Pass the id as resume_id or job_description_id to the generation
+    endpoints to iterate on settings without re-uploading or re-parsing.
+    Documents expire after the configured lifetime.
+    
+    Args:
+        kind: Whether the document is a resume or a job description
+        file: Document file (optional if text provided)
+        text: Document text (optional if file provided)
+        
+    Returns:
+        The document id, expiry and parsed summary
+    """
+    if kind == DocumentKind.RESULT:
+        raise HTTPException(status_code=400, detail="Results are stored by the generation endpoints")
+    has_file = file is not None and file.filename
+    if not has_file and not text:
+        raise HTTPException(status_code=400, detail="Either file or text must be provided")
+    
+    if kind == DocumentKind.JOB_DESCRIPTION:
+        digest = await resolve_job_description(text, file if has_file else None)
+        document = store_document(
+            digest.job_description_id, kind,
+            file_name=file.filename if has_file else None,
+            job_description=digest
+        )
+        return document_info(document)
+    
+    try:
+        if has_file:
+            with await spool_upload(file) as resume_file:
+                cached_resume = await load_resume(resume_file, file.filename)
+        else:
+            cached_resume = await load_resume(text.encode(), "resume.txt")
+    except ParseBudgetExceededError as e:
+        raise HTTPException(status_code=422, detail=f"Resume parsing error: {str(e)}")
+    except ResumeParserError as e:
+        raise HTTPException(status_code=400, detail=f"Resume parsing error: {str(e)}")
+    
+    document = store_document(
+        cached_resume.resume_id, kind,
+        file_name=file.filename if has_file else None,
+        resume=cached_resume.resume
+    )
+    return document_info(document)
+
+
+@app.get("/api/v1/documents/{document_id}")
+async def get_document_endpoint(document_id: str):
+    """Return a stored document's id, expiry and parsed summary."""
+    document = document_store.get(document_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail=f"Document '{document_id}' not found")
+    return document_info(document)
+
+
+@app.delete("/api/v1/documents/{document_id}", status_code=204)
+async def delete_document_endpoint(document_id: str):
+    """Delete a stored document."""
+    if not document_store.delete(document_id):
+        raise HTTPException(status_code=404, detail=f"Document '{document_id}' not found")
+
+
+@app.get("/api/v1/results/{result_id}", response_model=QuestionGenerationResponse)
+async def get_result_endpoint(result_id: str, request: Request):
+    """
+    Return a stored generation result by the result_id in its metadata.
+    
+    Results never change once stored, so the response carries a strong ETag
+    (one per content encoding) and cache headers; a request whose
+    If-None-Match matches gets an empty 304 response.
+    """
+    return conditional_response(
+        get_result(result_id),
+        request.headers.get("if-none-match"),
+        request.headers.get("accept-encoding")
+    )
+
+
+@app.post("/api/v1/job-descriptions", response_model=JobDescriptionDigest)
+async def register_job_description_endpoint(
+    job_description: Optional[str] = Form(None, description="Job description text"),
+    job_description_file: Optional[UploadFile] = File(None, description="Job description file (PDF, DOCX, or TXT)")
+):
+    """
+    Register a job description once and get back its compact digest and id.
+    
+    Pass the returned job_description_id to the generation endpoints so the
+    job description is not re-sent or re-parsed for every candidate.
+    
+    Args:
+        job_description: Text description of the job (optional if job_description_file provided)
+        job_description_file: Job description file (optional if job_description provided)
+        
+    Returns:
+        JobDescriptionDigest with the title, required skills, key responsibilities and id
+    """
+    return ModelResponse(await resolve_job_description(job_description, job_description_file))
+
+
+@app.get("/api/v1/job-descriptions/{job_description_id}", response_model=JobDescriptionDigest)
+async def get_job_description_endpoint(job_description_id: str):
+    """Return a registered job description digest."""
+    return ModelResponse(get_job_description(job_description_id))
+
+
 @app.get("/error", response_class=HTMLResponse)
 async def error_page(request: Request, message: str = "An unexpected error occurred"):
     """Serve error page."""
     return templates.TemplateResponse(
+        request,
         "error.html", 
         {
-            "request": request, 
             "error_message": message,
             "error_code": "UI_ERROR"
         }
@@ -296,9 +651,9 @@ async def global_exception_handler(request, exc):
     accept_header = request.headers.get("accept", "")
     if "text/html" in accept_header:
         return templates.TemplateResponse(
+            request,
             "error.html",
             {
-                "request": request,
                 "error_message": "Something went wrong. Please try again.",
                 "error_code": f"ERROR_{exc.__class__.__name__.upper()}"
             },
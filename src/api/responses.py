@@ -0,0 +1,39 @@
+"""JSON response classes that skip FastAPI's generic encoder."""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Encode JSON-compatible content to bytes with orjson, or the standard library without it."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: renders dicts and lists with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ModelResponse(JSONResponse):
+    """
+    Response for a Pydantic model, serialized straight to JSON bytes by
+    model_dump_json().
+
+    Endpoints with a response_model return this so the model is not first
+    converted to a dict and then encoded a second time.
+    """
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json().encode()
@@ -0,0 +1,99 @@
+"""Generation results stored under ids and served with conditional GETs."""
+
+import hashlib
+import logging
+import secrets
+from typing import Optional
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+
+from ..config import settings
+from ..models import DocumentKind, QuestionGenerationResponse
+from ..storage import get_document_store
+from .compression import compress, negotiate_encoding
+from .documents import store_document
+
+
+logger = logging.getLogger(__name__)
+
+
+def save_result(response: QuestionGenerationResponse) -> QuestionGenerationResponse:
+    """
+    Store a generation result under a new id.
+    
+    Returns:
+        The stored response, with the id recorded as metadata["result_id"]
+    """
+    result_id = "res_" + secrets.token_hex(8)
+    response = response.model_copy(update={"metadata": {**(response.metadata or {}), "result_id": result_id}})
+    store_document(result_id, DocumentKind.RESULT, result=response)
+    return response
+
+
+def get_result(result_id: str) -> QuestionGenerationResponse:
+    """
+    Return a stored generation result.
+    
+    Raises:
+        HTTPException: 404 if the id is unknown or has expired
+    """
+    document = get_document_store().get(result_id)
+    if document is None or document.kind != DocumentKind.RESULT:
+        raise HTTPException(status_code=404, detail=f"Result '{result_id}' not found")
+    return document.result
+
+
+def entity_tag(body: bytes, encoding: Optional[str] = None) -> str:
+    """Return a strong ETag for a response body, distinct per content encoding."""
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    return f'"{digest}"' if encoding is None else f'"{digest}-{encoding}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+    
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    tag the compression middleware weakened still matches.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def conditional_response(
+    model: BaseModel,
+    if_none_match: Optional[str],
+    accept_encoding: Optional[str] = None
+) -> Response:
+    """
+    Serve an immutable model with an ETag and cache headers, or 304 if the client already has it.
+    
+    The body is compressed here rather than by the compression middleware,
+    so each encoding gets its own strong ETag (as static assets do) instead
+    of the weak tag the middleware gives responses it compresses.
+    
+    Args:
+        model: Model to serialize
+        if_none_match: The request's If-None-Match header
+        accept_encoding: The request's Accept-Encoding header
+    """
+    body = model.model_dump_json().encode()
+    encoding = None
+    if len(body) >= settings.compression_minimum_bytes:
+        encoding = negotiate_encoding(accept_encoding or "")
+    headers = {
+        "ETag": entity_tag(body, encoding),
+        "Cache-Control": f"private, max-age={settings.result_cache_max_age_seconds}, immutable",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if encoding is not None:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,227 @@
+"""Prefork production server: one preloaded app, many uvicorn worker processes."""
+
+import importlib.util
+import logging
+import os
+import random
+import signal
+import stat
+import tempfile
+import time
+from typing import Dict, Optional
+
+import uvicorn
+from uvicorn.importer import import_from_string
+
+from ..config import settings
+from ..metrics import REGISTRY, clear_shared_metrics, mark_process_dead
+
+
+logger = logging.getLogger(__name__)
+
+# A worker that exits this soon after starting is restarted after a pause, not immediately
+_MIN_WORKER_LIFETIME_SECONDS = 1.0
+
+# Imported lazily by the app but needed by every worker's first generation
+_PRELOAD_MODULES = ("google.genai",)
+
+
+def resolve_loop(loop: str) -> str:
+    """Resolve "auto" to uvloop when it is installed, asyncio otherwise."""
+    if loop != "auto":
+        return loop
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def resolve_http(http: str) -> str:
+    """Resolve "auto" to httptools when it is installed, h11 otherwise."""
+    if http != "auto":
+        return http
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def private_state_dir(state_dir: Optional[str] = None) -> str:
+    """
+    Return a directory only the current user can write, for the shared state files.
+
+    Without a directory a new one is created with tempfile.mkdtemp, so its
+    name is unpredictable and its mode is 0700. A given directory is created
+    with mode 0700 if missing; an existing one must be a real directory owned
+    by the current user and not writable by anyone else.
+
+    Raises:
+        PermissionError: If the given directory is not private to the current user
+    """
+    if not state_dir:
+        return tempfile.mkdtemp(prefix=f"interview-assistant-{settings.api_port}-")
+    os.makedirs(state_dir, mode=0o700, exist_ok=True)
+    info = os.lstat(state_dir)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o022:
+        raise PermissionError(
+            f"State directory {state_dir} must be a directory owned by this user "
+            f"and not writable by group or others"
+        )
+    return state_dir
+
+
+def configure_shared_state(state_dir: Optional[str] = None, workers: int = 1) -> str:
+    """
+    Point the document store and shared caches at files every worker opens,
+    and split the parse processes and admission limits between the workers.
+
+    Every worker starts its own parse pool, so an unset parse_workers is
+    divided by the number of workers instead of giving each one a process
+    per CPU. Likewise each worker admits its share of the server-wide
+    admission limits. Must run before the app is imported, since the stores
+    and limiters are created on import. Settings that are already
+    configured are kept.
+
+    Args:
+        state_dir: Directory for the SQLite files (defaults to config, then a new private temp dir)
+        workers: Number of server worker processes
+
+    Returns:
+        The state directory used
+
+    Raises:
+        PermissionError: If the state directory is not private to the current user
+    """
+    state_dir = private_state_dir(state_dir or settings.server_state_dir)
+    if not settings.document_store_path:
+        settings.document_store_path = os.path.join(state_dir, "documents.sqlite3")
+    if not settings.shared_cache_path:
+        settings.shared_cache_path = os.path.join(state_dir, "cache.sqlite3")
+    if not settings.parse_workers:
+        settings.parse_workers = max(1, (os.cpu_count() or 1) // workers)
+    settings.admission_processes = workers
+    return state_dir
+
+
+class PreforkServer:
+    """
+    Supervisor that binds the listening socket, imports the app once and
+    forks worker processes that serve it.
+
+    Workers share the socket and the kernel spreads connections across them.
+    A worker that reaches its request limit shuts down gracefully and is
+    replaced. A worker that dies is also replaced. SIGINT and SIGTERM stop
+    every worker and then the supervisor.
+    """
+
+    def __init__(
+        self,
+        app_path: str = "src.api.main:app",
+        workers: Optional[int] = None,
+        max_requests: Optional[int] = None,
+        max_requests_jitter: Optional[int] = None,
+        loop: Optional[str] = None,
+        http: Optional[str] = None
+    ):
+        """
+        Args:
+            app_path: Import string of the ASGI app
+            workers: Worker processes (defaults to config, then the CPU count)
+            max_requests: Requests a worker serves before it is replaced (defaults to config; 0 disables)
+            max_requests_jitter: Random extra requests per worker, so workers do not recycle together
+            loop: Event loop implementation (defaults to config)
+            http: HTTP protocol implementation (defaults to config)
+        """
+        self.app_path = app_path
+        self.workers = workers or settings.server_workers or os.cpu_count() or 1
+        self.max_requests = settings.server_max_requests if max_requests is None else max_requests
+        self.max_requests_jitter = (
+            settings.server_max_requests_jitter if max_requests_jitter is None else max_requests_jitter
+        )
+        self.loop = resolve_loop(loop or settings.server_loop)
+        self.http = resolve_http(http or settings.server_http)
+        self._children: Dict[int, float] = {}
+        self._stopping = False
+        self._metrics_dir: Optional[str] = None
+
+    def run(self) -> None:
+        """Serve until SIGINT or SIGTERM."""
+        state_dir = configure_shared_state(workers=self.workers)
+        # Each worker writes its metrics here; /metrics on any worker serves the sum
+        self._metrics_dir = os.path.join(state_dir, "metrics")
+        clear_shared_metrics(self._metrics_dir)
+        # Preload: heavy imports happen once here and are shared copy-on-write
+        app = import_from_string(self.app_path)
+        for module in _PRELOAD_MODULES:
+            importlib.import_module(module)
+        config = uvicorn.Config(
+            app,
+            host=settings.api_host,
+            port=settings.api_port,
+            loop=self.loop,
+            http=self.http,
+            log_level=settings.log_level.lower(),
+        )
+        sock = config.bind_socket()
+        logger.info(
+            f"Starting {self.workers} workers on {settings.api_host}:{settings.api_port} "
+            f"(loop={self.loop}, http={self.http}, max_requests={self.max_requests}, "
+            f"parse_workers={settings.parse_workers} each, state={state_dir})"
+        )
+
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        for _ in range(self.workers):
+            self._spawn(config, sock)
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = self._children.pop(pid, None)
+            if started is None:
+                continue
+            mark_process_dead(self._metrics_dir, pid)
+            if self._stopping:
+                continue
+            exit_code = os.waitstatus_to_exitcode(status)
+            if exit_code != 0:
+                logger.warning(f"Worker {pid} exited with status {exit_code}; replacing it")
+            else:
+                logger.info(f"Worker {pid} recycled; replacing it")
+            if time.monotonic() - started < _MIN_WORKER_LIFETIME_SECONDS:
+                time.sleep(_MIN_WORKER_LIFETIME_SECONDS)
+            self._spawn(config, sock)
+
+        sock.close()
+        logger.info("All workers stopped")
+
+    def _spawn(self, config: uvicorn.Config, sock) -> None:
+        limit = None
+        if self.max_requests:
+            limit = self.max_requests + random.randint(0, self.max_requests_jitter)
+        pid = os.fork()
+        if pid == 0:
+            # Worker: default signal handling, uvicorn installs its own graceful handlers
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            exit_code = 0
+            try:
+                REGISTRY.share(self._metrics_dir, settings.server_metrics_flush_seconds)
+                config.limit_max_requests = limit
+                uvicorn.Server(config).run(sockets=[sock])
+            except BaseException:
+                logger.exception("Worker crashed")
+                exit_code = 1
+            finally:
+                # os._exit skips cleanup, so publish the final values first
+                REGISTRY.flush()
+                os._exit(exit_code)
+        self._children[pid] = time.monotonic()
+        logger.info(f"Started worker {pid} (request limit {limit})")
+
+    def _handle_stop(self, signum, frame) -> None:
+        if self._stopping:
+            return
+        logger.info(f"Received signal {signum}; stopping workers")
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
@@ -0,0 +1,164 @@
+"""Interview sessions over WebSocket: follow-up questions generated in one Gemini chat."""
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterator, Optional
+
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from starlette.status import WS_1008_POLICY_VIOLATION
+
+from ..agent import InterviewAgentError, InterviewQuestionAgent, InterviewSession
+from ..config import settings
+from ..metrics import IN_FLIGHT
+from ..models import QuestionGenerationResponse, SessionFollowUpRequest, SessionStartRequest
+from .admission import AdmissionControl, AdmissionRejected
+from .documents import resolve_resume
+from .job_descriptions import resolve_job_description
+
+
+logger = logging.getLogger(__name__)
+
+
+async def run_session(websocket: WebSocket, admission: Optional[AdmissionControl] = None) -> None:
+    """
+    Serve one interview session until the client ends it or disconnects.
+
+    Client messages are JSON objects with a "type":
+
+    - "start": a SessionStartRequest (resume, job description, round,
+      difficulty, count, focus areas and api_key); must come first
+    - "follow_up": a SessionFollowUpRequest with the interviewer's request
+    - "end": close the session
+
+    Each turn streams {"type": "delta", "turn", "text"} messages as the model
+    writes, then one {"type": "questions", "turn", ...} message with the
+    parsed QuestionGenerationResponse fields. Problems, including a turn shed
+    by admission control, are reported as {"type": "error", "detail"} and
+    leave the session open.
+
+    A session idle for session_idle_timeout_seconds is closed, and one that
+    asks for more than session_max_turns turns is closed with 1008.
+
+    Args:
+        websocket: The session's connection
+        admission: Limiters each turn must be admitted through (None admits every turn)
+    """
+    await websocket.accept()
+    session = None
+    max_turns = settings.session_max_turns
+    with IN_FLIGHT.track(operation="session"):
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        websocket.receive_json(), timeout=settings.session_idle_timeout_seconds or None
+                    )
+                except json.JSONDecodeError:
+                    await _send_error(websocket, "Messages must be JSON objects")
+                    continue
+                except asyncio.TimeoutError:
+                    logger.info(f"Closing session idle for {settings.session_idle_timeout_seconds}s")
+                    await websocket.close(reason="Session idle timeout")
+                    return
+                kind = message.get("type") if isinstance(message, dict) else None
+
+                if kind == "follow_up" and session is not None and max_turns and session.turns >= max_turns:
+                    logger.info(f"Closing session after its {max_turns} turn limit")
+                    await websocket.close(
+                        code=WS_1008_POLICY_VIOLATION,
+                        reason=f"Sessions are limited to {max_turns} turns"
+                    )
+                    return
+
+                try:
+                    if kind == "end":
+                        break
+                    if kind == "start" and session is None:
+                        request = SessionStartRequest.model_validate(message)
+                        async with _admitted(admission, websocket):
+                            session = await _start(websocket, request)
+                    elif kind == "follow_up" and session is not None:
+                        follow_up = SessionFollowUpRequest.model_validate(message)
+                        async with _admitted(admission, websocket):
+                            await _stream_turn(websocket, session, session.follow_up(
+                                follow_up.message, follow_up.num_questions
+                            ))
+                    elif kind == "start":
+                        await _send_error(websocket, "The session has already started")
+                    elif kind == "follow_up":
+                        await _send_error(websocket, "Start the session before asking follow-ups")
+                    else:
+                        await _send_error(websocket, f"Unknown message type: {kind!r}")
+                except ValidationError as e:
+                    await _send_error(websocket, e.errors(include_url=False, include_context=False, include_input=False))
+                except HTTPException as e:
+                    await _send_error(websocket, e.detail)
+                except InterviewAgentError as e:
+                    await _send_error(websocket, f"Question generation error: {str(e)}")
+                except AdmissionRejected as e:
+                    logger.warning(f"Shedding session turn: {e}")
+                    await _send_error(
+                        websocket,
+                        f"Server is at capacity; retry after {admission.retry_after_seconds} seconds"
+                    )
+        except WebSocketDisconnect:
+            logger.info(f"Session client disconnected after {session.turns if session else 0} turns")
+            return
+    await websocket.close()
+
+
+@asynccontextmanager
+async def _admitted(admission: Optional[AdmissionControl], websocket: WebSocket) -> AsyncIterator[None]:
+    """Hold admission slots for one turn; the middleware only sees HTTP requests."""
+    if admission is None:
+        yield
+        return
+    acquired = await admission.acquire(websocket.url.path)
+    try:
+        yield
+    finally:
+        admission.release(acquired)
+
+
+async def _start(websocket: WebSocket, request: SessionStartRequest) -> InterviewSession:
+    jd_digest = await resolve_job_description(request.job_description, jd_id=request.job_description_id)
+    resume_text = request.resume_text
+    if request.resume_id:
+        resume_text = resolve_resume(request.resume_id).resume.raw_text
+
+    agent = InterviewQuestionAgent(api_key=request.api_key)
+    session = InterviewSession(agent, request.round_type, request.difficulty)
+    turn = await run_in_threadpool(
+        session.start, resume_text, jd_digest.text, request.num_questions, request.focus_areas
+    )
+    logger.info(f"Started {request.round_type.value} session for job description {jd_digest.job_description_id}")
+    await _stream_turn(websocket, session, turn, job_description_id=jd_digest.job_description_id)
+    return session
+
+
+async def _stream_turn(websocket: WebSocket, session: InterviewSession, turn: Iterator[str], **metadata) -> None:
+    # The chat client blocks, so the stream is consumed in the threadpool
+    async for text in iterate_in_threadpool(turn):
+        await websocket.send_json({"type": "delta", "turn": session.turns, "text": text})
+
+    response = QuestionGenerationResponse(
+        questions=session.last_questions,
+        total_questions=len(session.last_questions),
+        round_type=session.round_type,
+        difficulty=session.difficulty,
+        metadata={
+            "model": session.agent.model_name,
+            "focus_areas": session.focus_areas or [],
+            "session_questions": len(session.questions),
+            **metadata
+        }
+    )
+    await websocket.send_json({"type": "questions", "turn": session.turns, **response.model_dump(mode="json")})
+
+
+async def _send_error(websocket: WebSocket, detail) -> None:
+    await websocket.send_json({"type": "error", "detail": detail})
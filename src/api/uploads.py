@@ -0,0 +1,209 @@
+"""Size-capped, streaming handling of uploaded files."""
+
+import hashlib
+import io
+import json
+import logging
+import tempfile
+from typing import BinaryIO, Dict, Optional, Union
+
+from fastapi import HTTPException, UploadFile
+
+from ..config import settings
+from ..parsers.resume_parser import DocumentSource
+
+
+logger = logging.getLogger(__name__)
+
+# Bytes copied per read when spooling an upload
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+_BODY_METHODS = {"POST", "PUT", "PATCH"}
+
+
+def _too_large(limit: int, label: str = "Request body") -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"{label} exceeds the maximum allowed size of {limit} bytes"
+    )
+
+
+class SpooledUpload:
+    """
+    An uploaded file held in memory, or in a named temporary file once it
+    grows past the spool threshold.
+
+    The content hash is computed while the file streams in. Parse workers
+    receive the temporary file's path rather than a copy of its bytes, so
+    a large upload is never read into memory in this process.
+    """
+
+    def __init__(self, file_name: Optional[str] = None, max_memory_bytes: Optional[int] = None):
+        """
+        Args:
+            file_name: Original file name
+            max_memory_bytes: Size above which the content moves to disk (defaults to config)
+        """
+        self.file_name = file_name
+        self.max_memory_bytes = max_memory_bytes or settings.upload_spool_memory_bytes
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._file: BinaryIO = io.BytesIO()
+        self.rolled_over = False
+
+    def write(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+        self.size += len(chunk)
+        if not self.rolled_over and self.size > self.max_memory_bytes:
+            spooled = tempfile.NamedTemporaryFile(prefix="upload-")
+            spooled.write(self._file.getbuffer())
+            self._file = spooled
+            self.rolled_over = True
+        self._file.write(chunk)
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 hex digest of the content, as cache.content_hash computes it."""
+        return self._hash.hexdigest()
+
+    @property
+    def file(self) -> BinaryIO:
+        """The content as a seekable stream, positioned at the start."""
+        self._file.seek(0)
+        return self._file
+
+    def source(self) -> DocumentSource:
+        """
+        The content in the cheapest form a parser accepts: the bytes of a
+        small in-memory upload, otherwise the temporary file's path.
+        """
+        if self.rolled_over:
+            self._file.flush()
+            return self._file.name
+        return self._file.getvalue()
+
+    def read(self) -> bytes:
+        """Read the whole content into memory."""
+        return self.file.read()
+
+    def close(self) -> None:
+        """Release the content; a temporary file is deleted."""
+        self._file.close()
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def document_source(document: Union[bytes, SpooledUpload]) -> DocumentSource:
+    """Return what to hand a parser for document bytes or a spooled upload."""
+    return document.source() if isinstance(document, SpooledUpload) else document
+
+
+async def spool_upload(
+    upload: UploadFile,
+    max_bytes: Optional[int] = None
+) -> SpooledUpload:
+    """
+    Stream an upload into a SpooledUpload, enforcing a size cap.
+
+    Small files stay in memory; anything above the spool threshold rolls over
+    to disk, so a burst of large uploads does not exhaust worker RAM. The
+    upload is rejected as soon as it crosses the cap.
+
+    Args:
+        upload: Uploaded file from the request
+        max_bytes: Maximum file size in bytes (defaults to config)
+
+    Returns:
+        SpooledUpload holding the content; the caller closes it
+
+    Raises:
+        HTTPException: 413 if the upload is larger than the cap
+    """
+    max_bytes = max_bytes or settings.upload_max_bytes
+    label = f"File '{upload.filename}'" if upload.filename else "Uploaded file"
+
+    if upload.size is not None and upload.size > max_bytes:
+        raise _too_large(max_bytes, label)
+
+    spool = SpooledUpload(upload.filename)
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            if spool.size + len(chunk) > max_bytes:
+                raise _too_large(max_bytes, label)
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+
+    return spool
+
+
+class RequestSizeLimitMiddleware:
+    """
+    ASGI middleware that rejects request bodies above a size cap while they stream in.
+
+    Requests that declare a larger Content-Length are refused before any body
+    is read; chunked or undeclared bodies are cut off once they cross the cap.
+    """
+
+    def __init__(
+        self,
+        app,
+        max_body_bytes: Optional[int] = None,
+        path_limits: Optional[Dict[str, int]] = None
+    ):
+        """
+        Args:
+            app: ASGI application to wrap
+            max_body_bytes: Default body cap in bytes (defaults to config)
+            path_limits: Caps for specific request paths, overriding the default
+        """
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in _BODY_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.path_limits.get(scope["path"]) or self.max_body_bytes or settings.upload_max_request_bytes
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > limit:
+                logger.warning(f"Rejected request to {scope['path']}: body of {int(value)} bytes")
+                await self._reject(send, limit)
+                return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _too_large(limit)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    async def _reject(send, limit: int) -> None:
+        body = json.dumps({"detail": _too_large(limit).detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
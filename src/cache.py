@@ -0,0 +1,547 @@
+"""Caches for parsed resumes, job description digests, generated questions and uploaded files."""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple, Union
+
+from pydantic import TypeAdapter, ValidationError
+
+from .config import settings
+from .models import (
+    CachedResume,
+    IdempotencyRecord,
+    JobDescriptionDigest,
+    QuestionGenerationResponse,
+    ResumeData,
+    UploadedFile,
+)
+from .parsers.fingerprint import FINGERPRINT_BITS, hamming_distance, simhash, similarity
+
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a fixed time."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        """
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl_seconds: Seconds an entry lives after it is set
+            on_evict: Called with (key, value) when an entry expires or is evicted
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._evict(key)
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._evict(next(iter(self._entries)))
+
+    def add(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> bool:
+        """
+        Set a key only if it holds no live entry.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Lifetime of this entry (defaults to the cache's)
+
+        Returns:
+            True if the value was stored, False if the key was already taken
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return False
+            ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._evict(next(iter(self._entries)))
+            return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def values(self) -> List[Any]:
+        """Return the live values, oldest first."""
+        now = time.monotonic()
+        with self._lock:
+            return [value for expires_at, value in self._entries.values() if expires_at > now]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self, key: Hashable) -> None:
+        _, value = self._entries.pop(key)
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+
+class SQLiteCache:
+    """
+    TTLCache-compatible cache kept in a SQLite file, so every worker process
+    on the host shares its entries.
+
+    Values are stored as JSON and validated back into value_type on read,
+    never unpickled, so whoever can write the file cannot run code in the
+    server. An entry that does not validate is treated as missing. Once the
+    cache is full, the entries closest to expiry are evicted, not the least
+    recently used ones, because reads do not write.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        max_entries: int,
+        ttl_seconds: float,
+        value_type: Any = Any
+    ):
+        """
+        Args:
+            path: Database file path, shared by the worker processes
+            namespace: Name separating this cache's entries from other caches in the file
+            max_entries: Entries kept before the oldest are evicted
+            ttl_seconds: Seconds an entry lives after it is set
+            value_type: Type of the values, e.g. a pydantic model (defaults to plain JSON values)
+        """
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._adapter = TypeAdapter(value_type)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not cross a fork; each worker opens its own
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (namespace, expires_at)")
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value FROM cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (self.namespace, repr(key), time.time()),
+            ).fetchone()
+        return default if row is None else self._load(row[0], default)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, repr(key), self._adapter.dump_json(value), now + self.ttl_seconds),
+            )
+            self._trim(conn, now)
+
+    def add(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> bool:
+        """
+        Set a key only if it holds no live entry, atomically across processes.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Lifetime of this entry (defaults to the cache's)
+
+        Returns:
+            True if the value was stored, False if the key was already taken
+        """
+        now = time.time()
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            conn = self._connection()
+            # An expired entry does not hold the key
+            conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ? AND expires_at <= ?",
+                (self.namespace, repr(key), now),
+            )
+            cursor = conn.execute(
+                "INSERT INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO NOTHING",
+                (self.namespace, repr(key), self._adapter.dump_json(value), now + ttl_seconds),
+            )
+            added = cursor.rowcount == 1
+            if added:
+                self._trim(conn, now)
+        return added
+
+    def _trim(self, conn: sqlite3.Connection, now: float) -> None:
+        """Delete expired entries, then the ones closest to expiry beyond max_entries."""
+        conn.execute("DELETE FROM cache WHERE namespace = ? AND expires_at <= ?", (self.namespace, now))
+        conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND key IN (SELECT key FROM cache WHERE namespace = ? "
+            "ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.max_entries),
+        )
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, repr(key)),
+            ).fetchone()
+            conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, repr(key)))
+        if row is None or row[1] <= time.time():
+            return default
+        return self._load(row[0], default)
+
+    def _load(self, data: bytes, default: Any) -> Any:
+        try:
+            return self._adapter.validate_json(data)
+        except ValidationError as e:
+            logger.warning(f"Ignoring unreadable {self.namespace} cache entry: {e.error_count()} errors")
+            return default
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+
+    def values(self) -> List[Any]:
+        """Return the live values, unreadable ones skipped."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT value FROM cache WHERE namespace = ? AND expires_at > ?",
+                (self.namespace, time.time()),
+            ).fetchall()
+        missing = object()
+        return [value for value in (self._load(row[0], missing) for row in rows) if value is not missing]
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ? AND expires_at > ?",
+                (self.namespace, time.time()),
+            ).fetchone()
+        return row[0]
+
+
+def _shared_or_local_cache(namespace: str, max_entries: int, ttl_seconds: float, value_type: Any):
+    """Return a SQLiteCache in the shared cache file when one is configured, a TTLCache otherwise."""
+    if settings.shared_cache_path:
+        return SQLiteCache(settings.shared_cache_path, namespace, max_entries, ttl_seconds, value_type)
+    return TTLCache(max_entries, ttl_seconds)
+
+
+class SimHashIndex:
+    """
+    Index of SimHash fingerprints supporting nearest-neighbour lookup by Hamming distance.
+
+    Fingerprints are split into max_distance + 1 bands; by the pigeonhole
+    principle any fingerprint within max_distance bits shares at least one
+    band exactly, so only keys in matching band buckets are compared.
+    """
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        width, extra = divmod(FINGERPRINT_BITS, bands)
+        self._bands: List[Tuple[int, int]] = []
+        shift = 0
+        for band in range(bands):
+            band_width = width + (1 if band < extra else 0)
+            self._bands.append((shift, (1 << band_width) - 1))
+            shift += band_width
+        self._buckets: List[Dict[int, Set[Hashable]]] = [{} for _ in self._bands]
+        self._fingerprints: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: Hashable, fingerprint: int) -> None:
+        with self._lock:
+            self._fingerprints[key] = fingerprint
+            for buckets, (shift, mask) in zip(self._buckets, self._bands):
+                buckets.setdefault(fingerprint >> shift & mask, set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        with self._lock:
+            fingerprint = self._fingerprints.pop(key, None)
+            if fingerprint is None:
+                return
+            for buckets, (shift, mask) in zip(self._buckets, self._bands):
+                band = fingerprint >> shift & mask
+                bucket = buckets.get(band)
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del buckets[band]
+
+    def nearest(self, fingerprint: int) -> Optional[Tuple[Hashable, int]]:
+        """Return (key, distance) of the closest fingerprint within max_distance, if any."""
+        with self._lock:
+            candidates = set()
+            for buckets, (shift, mask) in zip(self._buckets, self._bands):
+                candidates.update(buckets.get(fingerprint >> shift & mask, ()))
+            best = None
+            for key in candidates:
+                distance = hamming_distance(fingerprint, self._fingerprints[key])
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (key, distance)
+            return best
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._fingerprints
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._fingerprints)
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+
+def content_hash(data: bytes) -> str:
+    """Return the SHA-256 hex digest of document bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def resume_fingerprint(resume_data: ResumeData) -> int:
+    """Return the SimHash of a parsed resume, reusing the one computed by the parser."""
+    fingerprint = (resume_data.metadata or {}).get("fingerprint")
+    return int(fingerprint, 16) if fingerprint else simhash(resume_data.raw_text)
+
+
+class ResumeCache:
+    """
+    Cache of parsed resumes keyed by content and by near-duplicate fingerprint.
+
+    Uploads with identical bytes are served without parsing. A new parse
+    whose fingerprint is within max_distance bits of a known resume is
+    mapped onto that resume, so its parse and cached generations are reused.
+
+    With a shared cache file, resumes, content hashes and fingerprints are
+    kept in it, so a near duplicate is found whichever worker parsed the
+    first upload. Each process still searches its own SimHashIndex, brought
+    up to date with the shared fingerprints before every lookup.
+    """
+
+    def __init__(
+        self,
+        max_distance: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        path: Optional[str] = None
+    ):
+        """
+        Args:
+            max_distance: Largest Hamming distance treated as a duplicate (defaults to config)
+            max_entries: Resumes kept in the cache (defaults to config)
+            ttl_seconds: Seconds a resume stays cached (defaults to config)
+            path: Shared cache file (defaults to config; unset keeps the cache in this process)
+        """
+        max_distance = settings.resume_cache_max_distance if max_distance is None else max_distance
+        max_entries = max_entries or settings.resume_cache_max_entries
+        ttl_seconds = ttl_seconds or settings.resume_cache_ttl_seconds
+        path = path or settings.shared_cache_path
+        self.index = SimHashIndex(max_distance)
+        if path:
+            self._resumes = SQLiteCache(path, "resumes", max_entries, ttl_seconds, ResumeData)
+            # Several byte-different uploads can map onto one resume
+            self._content = SQLiteCache(path, "resume_content", max_entries * 4, ttl_seconds, Tuple[str, int])
+            # (resume_id, fingerprint) by resume_id, read back into the local index
+            self._fingerprints = SQLiteCache(
+                path, "resume_fingerprints", max_entries, ttl_seconds, Tuple[str, int]
+            )
+        else:
+            self._resumes = TTLCache(max_entries, ttl_seconds, on_evict=lambda key, _: self.index.remove(key))
+            self._content = TTLCache(max_entries * 4, ttl_seconds)
+            self._fingerprints = None
+
+    def find(self, digest: str) -> Optional[CachedResume]:
+        """
+        Return the cached resume for exactly these document bytes, if any.
+
+        Args:
+            digest: content_hash() of the uploaded document
+        """
+        match = self._content.get(digest)
+        if match is None:
+            return None
+        resume_id, distance = match
+        resume_data = self._resumes.get(resume_id)
+        if resume_data is None:
+            self._content.pop(digest)
+            return None
+        return CachedResume(
+            resume_id=resume_id,
+            resume=resume_data,
+            distance=distance,
+            similarity=similarity(distance),
+            reused=True,
+        )
+
+    def add(self, digest: str, resume_data: ResumeData) -> CachedResume:
+        """
+        Record a freshly parsed resume, or map it onto a near-duplicate already cached.
+
+        Args:
+            digest: content_hash() of the uploaded document
+            resume_data: The parse of that document
+
+        Returns:
+            CachedResume naming the resume to use; reused is True when an
+            earlier near-duplicate's parse was returned instead
+        """
+        fingerprint = resume_fingerprint(resume_data)
+        self._sync_index()
+        nearest = self.index.nearest(fingerprint)
+        while nearest is not None:
+            resume_id, distance = nearest
+            cached = self._resumes.get(resume_id)
+            if cached is not None:
+                logger.info(f"Resume {digest[:16]} is a near duplicate of {resume_id} (distance {distance})")
+                self._content.set(digest, (resume_id, distance))
+                return CachedResume(
+                    resume_id=resume_id,
+                    resume=cached,
+                    distance=distance,
+                    similarity=similarity(distance),
+                    reused=True,
+                )
+            # Expired, or evicted by another process since the index was synced
+            self.index.remove(resume_id)
+            nearest = self.index.nearest(fingerprint)
+
+        resume_id = digest[:16]
+        self._store(resume_id, resume_data, fingerprint)
+        self._content.set(digest, (resume_id, 0))
+        return CachedResume(resume_id=resume_id, resume=resume_data)
+
+    def _store(self, resume_id: str, resume_data: ResumeData, fingerprint: int) -> None:
+        self._resumes.set(resume_id, resume_data)
+        self.index.add(resume_id, fingerprint)
+        if self._fingerprints is not None:
+            self._fingerprints.set(resume_id, (resume_id, fingerprint))
+
+    def _sync_index(self) -> None:
+        """Make the local index match the shared fingerprints, if the cache is shared."""
+        if self._fingerprints is None:
+            return
+        shared = dict(self._fingerprints.values())
+        for resume_id in self.index.keys():
+            if resume_id not in shared:
+                self.index.remove(resume_id)
+        for resume_id, fingerprint in shared.items():
+            if resume_id not in self.index:
+                self.index.add(resume_id, fingerprint)
+
+    def get(self, resume_id: str) -> Optional[ResumeData]:
+        """Return a cached resume by id."""
+        return self._resumes.get(resume_id)
+
+    def restore(self, resume_id: str, resume_data: ResumeData) -> None:
+        """Put a resume loaded from elsewhere (e.g. the document store) back under its id."""
+        self._store(resume_id, resume_data, resume_fingerprint(resume_data))
+
+    def __len__(self) -> int:
+        return len(self._resumes)
+
+
+def generation_key(resume_id: str, job_description: str, **options: Any) -> str:
+    """
+    Build the generation cache key for a resume, job description and generation options.
+
+    Args:
+        resume_id: Resume id from the resume cache
+        job_description: Job description text
+        **options: Round type, difficulty, question count, focus areas, ...
+    """
+    parts = [resume_id, hashlib.sha256(job_description.encode()).hexdigest()]
+    parts.extend(f"{name}={options[name]!r}" for name in sorted(options))
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_resume_cache() -> ResumeCache:
+    """Return the shared resume cache."""
+    return ResumeCache()
+
+
+@lru_cache(maxsize=None)
+def get_generation_cache():
+    """Return the shared cache of generated question responses."""
+    return _shared_or_local_cache(
+        "generations",
+        settings.generation_cache_max_entries,
+        settings.generation_cache_ttl_seconds,
+        QuestionGenerationResponse,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_job_description_cache():
+    """Return the shared cache of job description digests, keyed by job description id."""
+    return _shared_or_local_cache(
+        "job_descriptions",
+        settings.job_description_cache_max_entries,
+        settings.job_description_cache_ttl_seconds,
+        # Digests by id, and ids by uploaded file hash
+        Union[JobDescriptionDigest, str],
+    )
+
+
+@lru_cache(maxsize=None)
+def get_uploaded_file_cache():
+    """Return the shared cache of Gemini file handles, keyed by API key and content hash."""
+    return _shared_or_local_cache(
+        "uploaded_files",
+        settings.gemini_file_cache_max_entries,
+        settings.gemini_file_cache_ttl_seconds,
+        UploadedFile,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_idempotency_cache():
+    """Return the shared cache of Idempotency-Key claims and the responses they produced."""
+    return _shared_or_local_cache(
+        "idempotency", settings.idempotency_max_entries, settings.idempotency_ttl_seconds, IdempotencyRecord
+    )
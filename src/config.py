@@ -1,7 +1,7 @@
 """Configuration management using Pydantic settings."""
 
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -18,6 +18,122 @@ class Settings(BaseSettings):
     api_port: int = 8000
     debug: bool = False
     
+    # Production server (run_api.py --production): worker processes forked from
+    # an app imported once in the supervisor; each worker is replaced after
+    # serving server_max_requests (plus up to server_max_requests_jitter) requests
+    server_workers: Optional[int] = None  # Defaults to the CPU count
+    server_max_requests: int = 10000
+    server_max_requests_jitter: int = 1000
+    server_loop: str = "auto"  # "auto" picks uvloop when installed
+    server_http: str = "auto"  # "auto" picks httptools when installed
+    server_state_dir: Optional[str] = None  # Shared cache and store files; must be private (defaults to a new temp dir)
+    # Workers write their metric values to the state dir this often; /metrics merges every worker
+    server_metrics_flush_seconds: float = 1.0
+    
+    # Static assets are fingerprinted by content hash and precompressed at
+    # startup; fingerprinted URLs are cached by browsers for this long
+    static_dir: str = "static"
+    static_asset_max_age_seconds: int = 365 * 24 * 60 * 60
+    
+    # Document parsing limits
+    parse_max_pages: int = 50
+    parse_max_bytes: int = 10 * 1024 * 1024
+    parse_timeout_seconds: float = 30.0
+    parse_max_uncompressed_bytes: int = 50 * 1024 * 1024
+    # Strip repeated headers/footers, page numbers and whitespace noise after extraction
+    parse_normalize_text: bool = True
+    
+    # Response compression (brotli when the client accepts it, gzip otherwise)
+    compression_minimum_bytes: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4  # Fast setting suited to dynamic responses
+    
+    # Admission control for /api/ requests, server-wide: at most
+    # admission_max_concurrent run at once and up to admission_max_queue more
+    # wait in line for at most admission_max_queue_seconds; everything else is
+    # rejected with 503 and Retry-After. Routes in admission_route_limits also
+    # get their own, tighter concurrency limit. 0 disables a limit. Each of the
+    # admission_processes worker processes (set by the production server)
+    # enforces its share of every limit.
+    admission_max_concurrent: int = 64
+    admission_max_queue: int = 128
+    admission_max_queue_seconds: float = 10.0
+    admission_retry_after_seconds: int = 5
+    admission_processes: int = 1
+    admission_route_limits: Dict[str, int] = {
+        "/api/v1/generate-questions": 16,
+        "/api/v1/generate-questions-json": 16,
+        "/api/v1/parse-resumes": 4,
+        "/api/v1/match-resumes": 4,
+    }
+    
+    # Upload limits
+    upload_max_bytes: int = 10 * 1024 * 1024
+    upload_max_request_bytes: int = 25 * 1024 * 1024
+    upload_spool_memory_bytes: int = 1024 * 1024
+    
+    # Parse workers (parse_workers defaults to the CPU count, divided between
+    # the server workers in production mode); a worker that exceeds its hard
+    # time or memory budget is killed and replaced
+    parse_workers: Optional[int] = None
+    parse_worker_timeout_seconds: float = 45.0
+    parse_worker_memory_mb: int = 1024
+    bulk_parse_max_files: int = 500
+    bulk_upload_max_request_bytes: int = 200 * 1024 * 1024
+    
+    # Resume and generation caches; uploads whose SimHash fingerprints differ by
+    # at most resume_cache_max_distance bits reuse the earlier parse and generations
+    resume_cache_max_distance: int = 3
+    resume_cache_max_entries: int = 1000
+    resume_cache_ttl_seconds: float = 24 * 60 * 60
+    generation_cache_max_entries: int = 500
+    generation_cache_ttl_seconds: float = 24 * 60 * 60
+    # Registered job description digests, shared by every candidate for the role
+    job_description_cache_max_entries: int = 1000
+    job_description_cache_ttl_seconds: float = 7 * 24 * 60 * 60
+    
+    # Document store for resumes and job descriptions referenced by id; SQLite
+    # when document_store_path is set, otherwise in memory
+    document_store_path: Optional[str] = None
+    document_store_max_entries: int = 10000
+    document_ttl_seconds: float = 7 * 24 * 60 * 60
+    # Generation results are stored as documents and never change once stored,
+    # so clients may cache them for this long
+    result_cache_max_age_seconds: int = 24 * 60 * 60
+    # SQLite file for the generation, job description and uploaded file caches,
+    # shared by every worker process; in-process caches when unset
+    shared_cache_path: Optional[str] = None
+    # Idempotency-Key on the generation endpoints: completed responses are
+    # replayed to retries for the retention window; a claim left pending
+    # longer than the pending timeout (e.g. by a crashed worker) is abandoned
+    idempotency_ttl_seconds: float = 24 * 60 * 60
+    idempotency_max_entries: int = 10000
+    idempotency_pending_timeout_seconds: float = 300
+    
+    # Interview sessions (WebSocket): a session that sends nothing for the idle
+    # timeout is closed, and one is closed with 1008 once it asks for more than
+    # session_max_turns turns. Every turn takes an admission slot. 0 disables a limit.
+    session_idle_timeout_seconds: float = 300
+    session_max_turns: int = 20
+    
+    # Skill extraction (defaults to the taxonomy bundled with the parser)
+    skills_taxonomy_path: Optional[str] = None
+    # Derive focus areas (and the domain) from a resume/JD skill gap when none are given
+    auto_focus_areas: bool = True
+    auto_focus_areas_max: int = 5
+    
+    # Resume delivery: "text" parses locally; "document" sends the original PDF
+    # or text file to Gemini (DOCX always falls back to text). Documents up to
+    # gemini_inline_max_bytes go inline; larger ones are uploaded once and the
+    # file handle is reused until shortly before Gemini expires it (48 hours).
+    # Inline parts are base64-encoded, so keep this well under Gemini's 20 MB
+    # request limit
+    resume_mode: str = "text"
+    gemini_backend: str = "gemini"  # "local" answers offline, for tests and development
+    gemini_inline_max_bytes: int = 4 * 1024 * 1024
+    gemini_file_cache_max_entries: int = 1000
+    gemini_file_cache_ttl_seconds: float = 47 * 60 * 60
+    
     # Logging
     log_level: str = "INFO"
     
@@ -0,0 +1,124 @@
+"""Rank resumes against a job description with TF-IDF cosine similarity."""
+
+import logging
+import time
+from typing import TYPE_CHECKING, Optional, Sequence
+
+from .models import ResumeData, ResumeMatch, ResumeRanking
+from .parsers.skills import SkillMatcher, get_skill_matcher
+from .parsers.terms import HASH_BITS, TermVector, term_vector
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+def resume_term_vector(resume: ResumeData) -> TermVector:
+    """Return the term vector of a resume, computing it on first use and keeping it on the resume."""
+    if resume._term_vector is None:
+        resume._term_vector = term_vector(resume.raw_text)
+    return resume._term_vector
+
+
+def tfidf_scores(query: TermVector, documents: Sequence[TermVector]) -> "np.ndarray":
+    """
+    Score documents against a query by TF-IDF cosine similarity.
+
+    The query (row 0) and every document are stacked into one sparse
+    coordinate list (row, column, count); document frequencies, weights,
+    norms and dot products are then computed with vectorized bincount
+    passes instead of per-document loops.
+
+    Args:
+        query: Term vector of the job description
+        documents: Term vectors of the documents to score
+
+    Returns:
+        Array of cosine similarities in [0, 1], one per document
+    """
+    import numpy as np
+
+    vectors = [query, *documents]
+    n_rows = len(vectors)
+    lengths = np.fromiter((len(columns) for columns, _ in vectors), dtype=np.int64, count=n_rows)
+    if not len(documents) or not lengths.sum():
+        return np.zeros(len(documents))
+
+    rows = np.repeat(np.arange(n_rows), lengths)
+    columns = np.concatenate([columns for columns, _ in vectors])
+    counts = np.concatenate([counts for _, counts in vectors])
+
+    # Smoothed IDF and sublinear TF, as in the usual TF-IDF formulation
+    document_frequency = np.bincount(columns, minlength=1 << HASH_BITS)
+    idf = np.log((1 + n_rows) / (1 + document_frequency[columns])) + 1
+    weights = (1 + np.log(counts)) * idf
+
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n_rows))
+
+    # Dense query vector; every document entry is dotted against it at once
+    dense_query = np.zeros(1 << HASH_BITS)
+    dense_query[columns[:lengths[0]]] = weights[:lengths[0]]
+    dots = np.bincount(rows, weights=weights * dense_query[columns], minlength=n_rows)
+
+    denominator = norms[1:] * norms[0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(denominator > 0, dots[1:] / denominator, 0.0)
+    return np.clip(scores, 0.0, 1.0)
+
+
+def rank_resumes(
+    job_description: str,
+    resumes: Sequence[ResumeData],
+    skill_matcher: Optional[SkillMatcher] = None,
+    top_k: Optional[int] = None
+) -> ResumeRanking:
+    """
+    Rank parsed resumes by how well they fit a job description.
+
+    Args:
+        job_description: Job description text
+        resumes: Resumes parsed by ResumeParser
+        skill_matcher: Skill matcher used on the job description (defaults to the shared one)
+        top_k: Return only the best k matches (defaults to all)
+
+    Returns:
+        ResumeRanking with matches ordered by descending score
+    """
+    import numpy as np
+
+    started = time.monotonic()
+    skill_matcher = skill_matcher or get_skill_matcher()
+    job_skills = skill_matcher.find(job_description)
+
+    scores = tfidf_scores(
+        term_vector(job_description),
+        [resume_term_vector(resume) for resume in resumes],
+    )
+    # Stable sort keeps upload order among equal scores
+    order = np.argsort(-scores, kind="stable")
+    if top_k is not None:
+        order = order[:top_k]
+
+    matches = []
+    for index in order.tolist():
+        resume = resumes[index]
+        resume_skills = {skill.lower() for skill in resume.skills}
+        matches.append(ResumeMatch(
+            index=index,
+            name=resume.name,
+            email=resume.email,
+            score=round(float(scores[index]), 4),
+            matched_skills=[skill for skill in job_skills if skill.lower() in resume_skills],
+            missing_skills=[skill for skill in job_skills if skill.lower() not in resume_skills],
+        ))
+
+    score_ms = round((time.monotonic() - started) * 1000, 1)
+    logger.info(f"Ranked {len(resumes)} resumes in {score_ms}ms")
+    return ResumeRanking(
+        job_skills=job_skills,
+        matches=matches,
+        total_resumes=len(resumes),
+        score_ms=score_ms,
+    )
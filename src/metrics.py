@@ -0,0 +1,630 @@
+"""Prometheus metrics: a small in-process registry, the service's metrics and a timing helper."""
+
+import glob
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Exposition format content type served by /metrics
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a cached lookup (~1ms) up to a slow Gemini call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Sample = Tuple[str, str, float, Tuple[str, ...]]
+# Metric name -> (kind, values by label tuple), as written by Registry.flush()
+Snapshot = Dict[str, Tuple[str, Dict[Tuple[str, ...], object]]]
+
+# Per-process JSON files in a shared metrics directory; exited processes are folded into one
+_SNAPSHOT_PATTERN = "metrics-*.json"
+_EXITED_SNAPSHOT = "metrics-exited.json"
+
+# Observations made while recording() is active, for shipping out of worker processes
+_recording: ContextVar[Optional[List[Sample]]] = ContextVar("metrics_recording", default=None)
+# Stage breakdown of the HTTP request being served, if any
+_request_timings: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _add_values(kind: str, total: Dict[Tuple[str, ...], object], values: Dict[Tuple[str, ...], object]) -> None:
+    """Add one process's counter or histogram values into a running total."""
+    for key, value in values.items():
+        if kind != "histogram":
+            total[key] = total.get(key, 0.0) + value
+            continue
+        state = total.get(key)
+        if state is None:
+            total[key] = [list(value[0]), value[1], value[2]]
+            continue
+        state[0] = [a + b for a, b in zip(state[0], value[0])]
+        state[1] += value[1]
+        state[2] += value[2]
+
+
+def _snapshot_path(directory: str, process_id: object) -> str:
+    return os.path.join(directory, f"metrics-{process_id}.json")
+
+
+def _read_snapshot(path: str) -> Snapshot:
+    """
+    Read a snapshot written by _write_snapshot.
+
+    Files are plain JSON, never unpickled, so a file that is malformed or
+    was planted by someone else is skipped rather than trusted.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return {
+            name: (entry["kind"], {tuple(key): value for key, value in entry["values"]})
+            for name, entry in data.items()
+        }
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+        logger.warning(f"Skipping unreadable metrics file {path}: {str(e)}")
+        return {}
+
+
+def _write_snapshot(path: str, snapshot: Snapshot) -> None:
+    """Replace a snapshot file atomically, so readers never see a partial write."""
+    data = {
+        name: {"kind": kind, "values": [[list(key), value] for key, value in values.items()]}
+        for name, (kind, values) in snapshot.items()
+    }
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+
+class Registry:
+    """
+    Collection of metrics rendered together in the Prometheus text format.
+
+    By default the values are this process's own. After share(), the
+    registry also writes them to a directory common to every server worker
+    and renders the sum over all workers, so a scrape that lands on any
+    worker sees the whole server.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, "Metric"] = {}
+        self._lock = threading.Lock()
+        self._shared_dir: Optional[str] = None
+        self._process_id: object = None
+        self._flush_lock = threading.Lock()
+
+    def register(self, metric: "Metric") -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional["Metric"]:
+        return self._metrics.get(name)
+
+    def share(self, directory: str, flush_seconds: float = 1.0, process_id: object = None) -> None:
+        """
+        Publish this process's values to a directory shared by every worker.
+
+        Values are written on every render and, when flush_seconds is set,
+        by a background thread at that interval. Call it in each worker
+        after forking, so the thread runs in the worker.
+
+        Args:
+            directory: Directory holding one file per process
+            flush_seconds: Interval between background writes (0 disables the thread)
+            process_id: Name of this process's file (defaults to the pid)
+        """
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self._shared_dir = directory
+        self._process_id = process_id or os.getpid()
+        if flush_seconds:
+            threading.Thread(
+                target=self._flush_periodically,
+                args=(flush_seconds,),
+                name="metrics-flush",
+                daemon=True,
+            ).start()
+
+    def _flush_periodically(self, interval: float) -> None:
+        while True:
+            time.sleep(interval)
+            self.flush()
+
+    def flush(self) -> None:
+        """Write this process's values to the shared directory, if sharing."""
+        if self._shared_dir is None:
+            return
+        with self._lock:
+            metrics = list(self._metrics.values())
+        snapshot = {metric.name: (metric.kind, metric.snapshot()) for metric in metrics}
+        try:
+            with self._flush_lock:
+                _write_snapshot(_snapshot_path(self._shared_dir, self._process_id), snapshot)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {self._shared_dir}: {str(e)}")
+
+    def _collect(self) -> Dict[str, List[Dict[Tuple[str, ...], object]]]:
+        """Return every process's values per metric name, read from the shared directory."""
+        self.flush()
+        values: Dict[str, List[Dict[Tuple[str, ...], object]]] = {}
+        for path in sorted(glob.glob(os.path.join(self._shared_dir, _SNAPSHOT_PATTERN))):
+            for name, (_, metric_values) in _read_snapshot(path).items():
+                values.setdefault(name, []).append(metric_values)
+        return values
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        shared = self._collect() if self._shared_dir is not None else None
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if shared is None:
+                lines.extend(metric.samples())
+            else:
+                lines.extend(metric.samples(metric.merge(shared.get(metric.name, []))))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class Metric:
+    """Base class for labelled metrics."""
+
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional[Registry] = None
+    ):
+        """
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every sample carries
+            registry: Registry to add the metric to (defaults to the global one)
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        unknown = set(labels) - set(self.labelnames)
+        if unknown:
+            raise ValueError(f"Unknown labels for {self.name}: {sorted(unknown)}")
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _record(self, op: str, value: float, key: Tuple[str, ...]) -> None:
+        self.apply(op, value, key)
+        samples = _recording.get()
+        if samples is not None:
+            samples.append((self.name, op, value, key))
+
+    def apply(self, op: str, value: float, key: Tuple[str, ...]) -> None:
+        """Apply one recorded operation to this metric's values."""
+        raise NotImplementedError
+
+    def value(self, **labels) -> float:
+        """Return the current value for a label set (0 if never recorded)."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def snapshot(self) -> Dict[Tuple[str, ...], object]:
+        """Return a copy of this process's values."""
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, values: Sequence[Dict[Tuple[str, ...], object]]) -> Dict[Tuple[str, ...], object]:
+        """Combine several processes' values into one set, summing by default."""
+        total: Dict[Tuple[str, ...], object] = {}
+        for process_values in values:
+            _add_values(self.kind, total, process_values)
+        return total
+
+    def samples(self, values: Optional[Dict[Tuple[str, ...], object]] = None) -> List[str]:
+        """Render this process's values, or the given merged values."""
+        if values is None:
+            values = self.snapshot()
+        items = sorted(values.items())
+        return [f"{self.name}{_label_text(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        self._record("inc", amount, self._key(labels))
+
+    def apply(self, op: str, value: float, key: Tuple[str, ...]) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+
+class Gauge(Metric):
+    """
+    Value that can go up and down.
+
+    Across processes a gauge is summed, like requests in progress, unless
+    multiprocess_mode is "max", for values every process computes from
+    the same shared state.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional[Registry] = None,
+        multiprocess_mode: str = "sum"
+    ):
+        super().__init__(name, documentation, labelnames, registry)
+        if multiprocess_mode not in ("sum", "max"):
+            raise ValueError(f"Unknown multiprocess_mode for {name}: {multiprocess_mode}")
+        self.multiprocess_mode = multiprocess_mode
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        self._record("inc", amount, self._key(labels))
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self._record("inc", -amount, self._key(labels))
+
+    def set(self, value: float, **labels) -> None:
+        self._record("set", value, self._key(labels))
+
+    def apply(self, op: str, value: float, key: Tuple[str, ...]) -> None:
+        with self._lock:
+            self._values[key] = value if op == "set" else self._values.get(key, 0.0) + value
+
+    def merge(self, values: Sequence[Dict[Tuple[str, ...], object]]) -> Dict[Tuple[str, ...], object]:
+        if self.multiprocess_mode == "sum":
+            return super().merge(values)
+        merged: Dict[Tuple[str, ...], object] = {}
+        for process_values in values:
+            for key, value in process_values.items():
+                merged[key] = max(merged.get(key, value), value)
+        return merged
+
+    @contextmanager
+    def track(self, **labels) -> Iterator[None]:
+        """Count the enclosed block as in progress."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional[Registry] = None
+    ):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        self._record("observe", value, self._key(labels))
+
+    def apply(self, op: str, value: float, key: Tuple[str, ...]) -> None:
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def value(self, **labels) -> float:
+        """Return the number of observations for a label set."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def snapshot(self) -> Dict[Tuple[str, ...], object]:
+        with self._lock:
+            return {key: [[*state[0]], state[1], state[2]] for key, state in self._values.items()}
+
+    def samples(self, values: Optional[Dict[Tuple[str, ...], object]] = None) -> List[str]:
+        if values is None:
+            values = self.snapshot()
+        items = sorted(values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _label_text((*self.labelnames, "le"), (*key, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _label_text(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+@contextmanager
+def recording() -> Iterator[List[Sample]]:
+    """Collect the metric operations made inside the block, e.g. in a worker process."""
+    samples: List[Sample] = []
+    token = _recording.set(samples)
+    try:
+        yield samples
+    finally:
+        _recording.reset(token)
+
+
+def replay(samples: Sequence[Sample], registry: Optional[Registry] = None) -> None:
+    """
+    Apply operations collected by recording() in another process to this
+    process's metrics and to the current request's timings.
+    """
+    registry = registry or REGISTRY
+    timings = _request_timings.get()
+    for name, op, value, key in samples:
+        metric = registry.get(name)
+        if metric is not None:
+            metric.apply(op, value, tuple(key))
+        if timings is None:
+            continue
+        if name == STAGE_SECONDS.name:
+            timings.add_stage(key[0], value)
+        elif name == PARSE_FALLBACKS.name:
+            timings.fallbacks.append(key[0])
+
+
+def clear_shared_metrics(directory: str) -> None:
+    """Create a shared metrics directory, removing the files of a previous run."""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, "metrics-*")):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def mark_process_dead(directory: str, process_id: object) -> None:
+    """
+    Fold an exited process's file into the shared total of exited processes.
+
+    Its counters and histograms are kept, so totals never go backwards when
+    a worker is replaced; its gauges are dropped, since nothing it was doing
+    is still in progress.
+
+    Args:
+        directory: Shared metrics directory
+        process_id: Name of the exited process's file (its pid)
+    """
+    path = _snapshot_path(directory, process_id)
+    snapshot = _read_snapshot(path)
+    if not snapshot:
+        return
+    exited_path = os.path.join(directory, _EXITED_SNAPSHOT)
+    exited = _read_snapshot(exited_path)
+    for name, (kind, values) in snapshot.items():
+        if kind == "gauge":
+            continue
+        _add_values(kind, exited.setdefault(name, (kind, {}))[1], values)
+    try:
+        _write_snapshot(exited_path, exited)
+        os.remove(path)
+    except OSError as e:
+        logger.warning(f"Could not fold metrics of exited process {process_id}: {str(e)}")
+
+
+STAGE_SECONDS = Histogram(
+    "interview_stage_duration_seconds",
+    "Time spent per request stage",
+    ["stage", "round_type", "format"],
+)
+ERRORS = Counter(
+    "interview_errors_total",
+    "Errors raised per stage, by exception class",
+    ["stage", "error"],
+)
+UPSTREAM_RESPONSES = Counter(
+    "interview_gemini_responses_total",
+    "Gemini API responses by HTTP status code",
+    ["status"],
+)
+PARSE_FALLBACKS = Counter(
+    "interview_parse_fallbacks_total",
+    "Slower or lossy fallback paths taken while parsing documents or model output",
+    ["fallback"],
+)
+CACHE_REQUESTS = Counter(
+    "interview_cache_requests_total",
+    "Cache lookups by cache and result",
+    ["cache", "result"],
+)
+IN_FLIGHT = Gauge(
+    "interview_in_flight",
+    "Operations currently in progress",
+    ["operation"],
+)
+PARSE_POOL_KILLED = Counter(
+    "interview_parse_pool_killed_total",
+    "Parse workers killed and replaced, by cause (timeout, memory, died)",
+    ["reason"],
+)
+HTTP_REQUESTS = Counter(
+    "interview_http_requests_total",
+    "HTTP requests by route, method and status code",
+    ["route", "method", "status"],
+)
+ADMISSION_ACTIVE = Gauge(
+    "interview_admission_active",
+    "Requests holding a concurrency slot, by limiter",
+    ["limiter"],
+)
+ADMISSION_QUEUED = Gauge(
+    "interview_admission_queued",
+    "Requests waiting for a concurrency slot, by limiter",
+    ["limiter"],
+)
+ADMISSION_SATURATION = Gauge(
+    "interview_admission_saturation",
+    "Active plus queued requests over the concurrency limit; above 1 means requests are queueing",
+    ["limiter"],
+    multiprocess_mode="max",
+)
+ADMISSION_REJECTED = Counter(
+    "interview_admission_rejected_total",
+    "Requests shed with 503, by limiter and reason (queue_full, queue_timeout)",
+    ["limiter", "reason"],
+)
+
+
+class RequestTimings:
+    """Per-request breakdown of stage durations, cache outcomes and fallbacks."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.cache: Dict[str, str] = {}
+        self.fallbacks: List[str] = []
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> dict:
+        """Milliseconds per stage plus cache and fallback use, for response metadata."""
+        return {
+            "stages_ms": {stage: round(seconds * 1000, 1) for stage, seconds in self.stages.items()},
+            "total_ms": round(self.total_seconds() * 1000, 1),
+            "cache": dict(self.cache),
+            "fallbacks": list(self.fallbacks),
+        }
+
+    def server_timing(self) -> str:
+        """Render the breakdown as a Server-Timing header value."""
+        entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.stages.items()]
+        entries.extend(f'cache-{cache.replace("_", "-")};desc="{result}"' for cache, result in self.cache.items())
+        if self.fallbacks:
+            entries.append(f'fallback;desc="{",".join(self.fallbacks)}"')
+        entries.append(f"total;dur={self.total_seconds() * 1000:.1f}")
+        return ", ".join(entries)
+
+
+@contextmanager
+def request_timings() -> Iterator[RequestTimings]:
+    """Collect the stage breakdown of everything timed inside the block."""
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Return the timings of the request being served, if any."""
+    return _request_timings.get()
+
+
+def record_cache(cache: str, result: str) -> None:
+    """Count a cache lookup and note its outcome on the current request."""
+    CACHE_REQUESTS.inc(cache=cache, result=result)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.cache[cache] = result
+
+
+def record_fallback(fallback: str) -> None:
+    """Count a fallback path and note it on the current request."""
+    PARSE_FALLBACKS.inc(fallback=fallback)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.fallbacks.append(fallback)
+
+
+class Timer:
+    """Elapsed time of a timed() block, readable once the block exits."""
+
+    seconds: float = 0.0
+
+    @property
+    def ms(self) -> float:
+        return round(self.seconds * 1000, 1)
+
+
+@contextmanager
+def timed(stage: str, **labels) -> Iterator[Timer]:
+    """
+    Time a block as a request stage.
+
+    The duration is observed in the stage histogram whether the block
+    succeeds or fails; an exception is also counted under its class name.
+
+    Args:
+        stage: Stage name, e.g. "upload_read" or "gemini_call"
+        **labels: round_type and/or format, when known
+
+    Yields:
+        Timer whose seconds attribute is set when the block exits
+    """
+    timer = Timer()
+    started = time.perf_counter()
+    try:
+        yield timer
+    except Exception as e:
+        ERRORS.inc(stage=stage, error=type(e).__name__)
+        raise
+    finally:
+        timer.seconds = time.perf_counter() - started
+        STAGE_SECONDS.observe(timer.seconds, stage=stage, **labels)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.add_stage(stage, timer.seconds)
@@ -1,7 +1,8 @@
 """Data models for interview assistant using Pydantic."""
 
-from pydantic import BaseModel, Field
-from typing import List, Optional, Literal
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+from typing import Dict, List, Optional, Literal
+from datetime import datetime
 from enum import Enum
 
 
@@ -31,6 +32,50 @@ class ResumeData(BaseModel):
     experience_years: Optional[int] = None
     education: List[str] = Field(default_factory=list)
     work_history: List[str] = Field(default_factory=list)
+    sections: Dict[str, str] = Field(default_factory=dict)
+    metadata: Optional[dict] = None
+    # Term counts used for match scoring, computed on first use
+    _term_vector: Optional[tuple] = PrivateAttr(default=None)
+
+
+class CachedResume(BaseModel):
+    """A resume served from the resume cache, possibly as a near duplicate of an earlier upload."""
+    resume_id: str
+    resume: ResumeData
+    distance: int = 0
+    similarity: float = 1.0
+    reused: bool = False
+
+
+class ResumeMatch(BaseModel):
+    """How well one resume fits a job description."""
+    index: int
+    file_name: Optional[str] = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+    score: float
+    matched_skills: List[str] = Field(default_factory=list)
+    missing_skills: List[str] = Field(default_factory=list)
+
+
+class ResumeRanking(BaseModel):
+    """Resumes ranked against a job description, best match first."""
+    job_skills: List[str] = Field(default_factory=list)
+    matches: List[ResumeMatch] = Field(default_factory=list)
+    total_resumes: int = 0
+    score_ms: float = 0.0
+    errors: List[dict] = Field(default_factory=list)
+
+
+class SkillGap(BaseModel):
+    """Skills a job description asks for compared with those on a resume."""
+    job_skills: List[str] = Field(default_factory=list)
+    resume_skills: List[str] = Field(default_factory=list)
+    matched_skills: List[str] = Field(default_factory=list)
+    missing_skills: List[str] = Field(default_factory=list)
+    extra_skills: List[str] = Field(default_factory=list)
+    focus_areas: List[str] = Field(default_factory=list)
+    domain: Optional[str] = None
 
 
 class JobDescription(BaseModel):
@@ -52,14 +97,60 @@ class InterviewQuestion(BaseModel):
     expected_topics: List[str] = Field(default_factory=list)
 
 
+class JobDescriptionDigest(BaseModel):
+    """Compact form of a job description, stored under a content id and sent in prompts."""
+    job_description_id: str
+    title: Optional[str] = None
+    required_skills: List[str] = Field(default_factory=list)
+    experience: Optional[str] = None
+    responsibilities: List[str] = Field(default_factory=list)
+    requirements: List[str] = Field(default_factory=list)
+    text: str
+    source_chars: int = 0
+
+
+class DocumentKind(str, Enum):
+    """Kinds of documents kept in the document store."""
+    RESUME = "resume"
+    JOB_DESCRIPTION = "job_description"
+    RESULT = "result"
+
+
+class ResumeMode(str, Enum):
+    """How an uploaded resume reaches the model."""
+    TEXT = "text"  # Extracted locally by ResumeParser and sent as prompt text
+    DOCUMENT = "document"  # Original file sent to Gemini as an inline or uploaded part
+
+
 class QuestionGenerationRequest(BaseModel):
     """Request model for question generation."""
-    resume_text: str
-    job_description: str
+    resume_text: Optional[str] = None
+    resume_id: Optional[str] = None
+    job_description: Optional[str] = None
+    job_description_id: Optional[str] = None
     round_type: RoundType
     difficulty: DifficultyLevel = DifficultyLevel.INTERMEDIATE
     num_questions: int = Field(default=10, ge=1, le=50)
     focus_areas: Optional[List[str]] = None
+    
+    @model_validator(mode="after")
+    def _require_documents(self):
+        if not self.resume_text and not self.resume_id:
+            raise ValueError("Either resume_text or resume_id must be provided")
+        if not self.job_description and not self.job_description_id:
+            raise ValueError("Either job_description or job_description_id must be provided")
+        return self
+
+
+class SessionStartRequest(QuestionGenerationRequest):
+    """First message of an interview session: a generation request plus the Gemini API key."""
+    api_key: str
+
+
+class SessionFollowUpRequest(BaseModel):
+    """A later turn of an interview session; only the new request is sent."""
+    message: str = Field(..., min_length=1)
+    num_questions: Optional[int] = Field(default=None, ge=1, le=50)
 
 
 class QuestionGenerationResponse(BaseModel):
@@ -69,3 +160,28 @@ class QuestionGenerationResponse(BaseModel):
     round_type: RoundType
     difficulty: DifficultyLevel
     metadata: Optional[dict] = None
+
+
+class UploadedFile(BaseModel):
+    """Handle of a document uploaded to the Gemini Files API, cached for reuse."""
+    name: str
+    uri: str
+    mime_type: Optional[str] = None
+
+
+class IdempotencyRecord(BaseModel):
+    """An Idempotency-Key claim: the request's fingerprint and, once it completes, its response."""
+    fingerprint: str
+    response: Optional[QuestionGenerationResponse] = None
+
+
+class StoredDocument(BaseModel):
+    """A parsed resume, job description digest or generation result kept in the document store."""
+    document_id: str
+    kind: DocumentKind
+    file_name: Optional[str] = None
+    created_at: datetime
+    expires_at: datetime
+    resume: Optional[ResumeData] = None
+    job_description: Optional[JobDescriptionDigest] = None
+    result: Optional[QuestionGenerationResponse] = None
@@ -1,5 +1,45 @@
 """Parser package for handling resumes and documents."""
 
-from .resume_parser import ResumeParser, ResumeParserError
+from .resume_parser import (
+    ResumeParser,
+    ResumeParserError,
+    UnsupportedFormatError,
+    detect_format,
+    preload_document_libraries,
+)
+from .pool import ParseBudgetExceededError, ParsePool, get_parse_pool
+from .fingerprint import hamming_distance, simhash
+from .job_description import digest_job_description, job_description_id
+from .normalize import normalize_pages
+from .sections import ResumeSections, classify_heading, segment_resume
+from .skills import (
+    SkillMatcher,
+    analyze_skill_gap,
+    get_skill_matcher,
+    load_skill_categories,
+    load_skill_taxonomy,
+)
 
-__all__ = ['ResumeParser', 'ResumeParserError']
+__all__ = [
+    'ResumeParser',
+    'ResumeParserError',
+    'UnsupportedFormatError',
+    'detect_format',
+    'preload_document_libraries',
+    'ParseBudgetExceededError',
+    'ParsePool',
+    'get_parse_pool',
+    'SkillMatcher',
+    'get_skill_matcher',
+    'load_skill_categories',
+    'load_skill_taxonomy',
+    'analyze_skill_gap',
+    'ResumeSections',
+    'classify_heading',
+    'segment_resume',
+    'normalize_pages',
+    'digest_job_description',
+    'job_description_id',
+    'simhash',
+    'hamming_distance',
+]
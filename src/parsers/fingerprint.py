@@ -0,0 +1,66 @@
+"""SimHash fingerprints for spotting near-duplicate documents."""
+
+import hashlib
+import re
+from collections import Counter
+from typing import List
+
+
+# Number of bits in a fingerprint
+FINGERPRINT_BITS = 64
+# Words per shingle; re-exports that reflow or reorder lines still share most shingles
+SHINGLE_SIZE = 3
+
+_WORD = re.compile(r"\w+")
+
+
+def _shingles(text: str) -> List[str]:
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return words
+    return [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+
+def simhash(text: str) -> int:
+    """
+    Compute a 64-bit SimHash of a document's word shingles.
+
+    Documents that differ only slightly (a changed phone number, re-export
+    from another editor) get fingerprints a few bits apart.
+
+    Args:
+        text: Normalized document text
+
+    Returns:
+        Fingerprint as an unsigned 64-bit integer (0 for empty text)
+    """
+    weights = Counter(_shingles(text))
+    if not weights:
+        return 0
+
+    # Tally hash bytes per position, then count set bits per byte value once,
+    # instead of looping over all 64 bits for every shingle
+    byte_counts = [Counter() for _ in range(FINGERPRINT_BITS // 8)]
+    for shingle, weight in weights.items():
+        digest = hashlib.blake2b(shingle.encode(), digest_size=FINGERPRINT_BITS // 8).digest()
+        for position, value in enumerate(digest):
+            byte_counts[position][value] += weight
+
+    total = sum(weights.values())
+    fingerprint = 0
+    for position, counts in enumerate(byte_counts):
+        for bit in range(8):
+            ones = sum(count for value, count in counts.items() if value >> bit & 1)
+            if 2 * ones > total:
+                fingerprint |= 1 << (position * 8 + bit)
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Return the number of bits that differ between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+def similarity(distance: int) -> float:
+    """Convert a Hamming distance into a 0-1 similarity score."""
+    return round(1 - distance / FINGERPRINT_BITS, 4)
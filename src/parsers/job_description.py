@@ -0,0 +1,146 @@
+"""Compact digests of job descriptions for reuse across many generation requests."""
+
+import hashlib
+import re
+from typing import Dict, List, Optional
+
+from ..models import JobDescriptionDigest
+from .skills import SkillMatcher, get_skill_matcher
+
+
+# Caps that keep a digest well under the prompt budget for a job description
+MAX_DIGEST_ITEMS = 8
+MAX_ITEM_LENGTH = 160
+# Prose kept when a job description has no recognizable responsibilities or requirements
+MAX_DESCRIPTION_LENGTH = 2000
+
+RESPONSIBILITIES = "responsibilities"
+REQUIREMENTS = "requirements"
+OTHER = "other"
+
+_HEADINGS = re.compile(
+    r"(?P<responsibilities>(?:key |main |core )?(?:responsibilities|duties)"
+    r"|what you(?:'ll| will) do|the role|your role|in this role.*|day[- ]to[- ]day|about the role)"
+    r"|(?P<requirements>(?:minimum |basic |preferred )?(?:requirements|qualifications)"
+    r"|what you(?:'ll| will)? (?:need|bring)|must[- ]haves?|nice[- ]to[- ]haves?|skills(?: required)?"
+    r"|who you are|you have)"
+    r"|(?P<other>benefits|perks|about us|about the company|who we are|why join us|compensation"
+    r"|equal opportunity.*|how to apply)",
+    re.IGNORECASE,
+)
+_TITLE_LINE = re.compile(r"^(?:job title|title|position|role)\s*[:\-]\s*(?P<title>.+)$", re.IGNORECASE)
+_BULLET = re.compile(r"^\s*(?:[-*•▪●◦‣⁃–>]|\d+[.)])\s+")
+_EXPERIENCE = re.compile(r"(\d{1,2})\s*\+?\s*(?:-|–|to)?\s*(?:\d{1,2}\s*)?\+?\s*years?", re.IGNORECASE)
+
+
+def job_description_id(text: str) -> str:
+    """Return the content id of a job description text."""
+    normalized = " ".join(text.split()).lower()
+    return "jd_" + hashlib.sha256(normalized.encode()).hexdigest()[:16]
+
+
+def _heading(line: str) -> Optional[str]:
+    """Return the digest section a heading line introduces, if it is one."""
+    candidate = line.strip().rstrip(":").strip()
+    if not candidate or len(candidate) > 60:
+        return None
+    match = _HEADINGS.fullmatch(candidate)
+    return match.lastgroup if match else None
+
+
+def _clip(line: str, limit: int = MAX_ITEM_LENGTH) -> str:
+    return line if len(line) <= limit else line[:limit - 3].rstrip() + "..."
+
+
+def digest_job_description(
+    text: str,
+    skill_matcher: Optional[SkillMatcher] = None
+) -> JobDescriptionDigest:
+    """
+    Reduce a job description to its title, required skills and key responsibilities.
+
+    Lines are assigned to responsibilities or requirements by the heading
+    they follow; boilerplate sections (benefits, about us, ...) are dropped.
+    Without recognizable headings, bullet lines are treated as
+    responsibilities. A prose description with neither is kept as written
+    (up to MAX_DESCRIPTION_LENGTH characters) so the prompt does not lose
+    what the role involves. If the digest would not be shorter than the
+    original, the original text is kept as the prompt form.
+
+    Args:
+        text: Job description text
+        skill_matcher: Skill matcher to use (defaults to the shared matcher)
+
+    Returns:
+        JobDescriptionDigest whose text field is the compact prompt form
+    """
+    skill_matcher = skill_matcher or get_skill_matcher()
+    title = None
+    current = None
+    items: Dict[str, List[str]] = {RESPONSIBILITIES: [], REQUIREMENTS: []}
+    bullets: List[str] = []
+    relevant_lines: List[str] = []
+
+    for raw_line in text.split("\n"):
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        title_match = _TITLE_LINE.match(line)
+        if title_match and title is None:
+            title = title_match.group("title").strip()
+            continue
+
+        heading = _heading(line)
+        if heading:
+            current = heading
+            continue
+
+        if title is None and current is None and len(line) <= 80 and not _BULLET.match(line):
+            title = line.rstrip(":")
+            continue
+        if current != OTHER:
+            relevant_lines.append(line)
+
+        is_bullet = bool(_BULLET.match(line))
+        content = _BULLET.sub("", line).strip()
+        if current in items:
+            items[current].append(_clip(content))
+        elif current is None and is_bullet:
+            bullets.append(_clip(content))
+
+    responsibilities = (items[RESPONSIBILITIES] or bullets)[:MAX_DIGEST_ITEMS]
+    requirements = items[REQUIREMENTS][:MAX_DIGEST_ITEMS]
+    # Skills and experience come from the role itself, not the company boilerplate
+    relevant_text = "\n".join([title or "", *relevant_lines])
+    required_skills = skill_matcher.find(relevant_text)
+    experience_match = _EXPERIENCE.search(relevant_text)
+    experience = f"{experience_match.group(1)}+ years" if experience_match else None
+
+    parts = [f"Title: {title or 'Not specified'}"]
+    if required_skills:
+        parts.append(f"Required skills: {', '.join(required_skills)}")
+    if experience:
+        parts.append(f"Experience: {experience}")
+    if responsibilities:
+        parts.append("Key responsibilities:\n" + "\n".join(f"- {item}" for item in responsibilities))
+    if requirements:
+        parts.append("Requirements:\n" + "\n".join(f"- {item}" for item in requirements))
+    if not responsibilities and not requirements and relevant_lines:
+        parts.append("Description:\n" + _clip("\n".join(relevant_lines), MAX_DESCRIPTION_LENGTH))
+
+    digest_text = "\n".join(parts)
+    # A short job description is already compact; never send more than the original
+    if len(digest_text) >= len(text.strip()):
+        digest_text = text.strip()
+
+    return JobDescriptionDigest(
+        job_description_id=job_description_id(text),
+        title=title,
+        required_skills=required_skills,
+        experience=experience,
+        responsibilities=responsibilities,
+        requirements=requirements,
+        text=digest_text,
+        source_chars=len(text),
+    )
@@ -0,0 +1,117 @@
+"""Text normalization applied to extracted documents before prompting."""
+
+import re
+from collections import Counter
+from typing import List, Set, Tuple
+
+
+# Lines at the top and bottom of each page that are checked for repeated headers/footers
+EDGE_LINES = 3
+# Exact duplicates shorter than this are kept (dates, short skill lines, ...)
+MIN_DUPLICATE_LENGTH = 20
+
+_SPACES = re.compile(r"[ \t\f\v\u00a0\u2000-\u200b\u3000]+")
+# Bullet glyphs, including the private-use symbols Word's Symbol/Wingdings fonts produce
+_BULLET_GLYPHS = re.compile(
+    r"^(?:[\u2022\u25e6\u25aa\u25ab\u25cf\u25cb\u25a0\u25a1\u2666\u25c6\u25c7"
+    r"\u27a2\u27a4\u25ba\u25b6\u2713\u2714\u2717\u2756\u2043\u2023\u2219\u00b7*]"
+    r"|[\uf000-\uf0ff])+\s*"
+)
+_PAGE_NUMBER = re.compile(
+    r"^(?:page\s*)?[-–—(]?\s*\d{1,3}\s*[-–—)]?(?:\s*(?:of|/)\s*\d{1,3})?$",
+    re.IGNORECASE,
+)
+# Page numbers inside a longer header/footer line, e.g. "Jane Doe | Page 2 of 3"
+_EMBEDDED_PAGE_NUMBER = re.compile(
+    r"\bpage\s*\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?\b|\b\d{1,3}\s*(?:of|/)\s*\d{1,3}\b",
+    re.IGNORECASE,
+)
+
+
+def _edge_key(line: str) -> str:
+    """Key used to match header/footer lines across pages, ignoring page numbers only."""
+    return _EMBEDDED_PAGE_NUMBER.sub("#", line.lower())
+
+
+def _edge_indexes(lines: List[str]) -> Set[int]:
+    """Indexes of the first and last EDGE_LINES non-empty lines of a page."""
+    content = [i for i, line in enumerate(lines) if line]
+    return set(content[:EDGE_LINES] + content[-EDGE_LINES:])
+
+
+def _clean_line(line: str) -> str:
+    """Collapse whitespace and replace bullet glyphs with a plain "- " marker."""
+    line = _SPACES.sub(" ", line).strip()
+    if line and _BULLET_GLYPHS.match(line):
+        stripped = _BULLET_GLYPHS.sub("", line)
+        line = f"- {stripped}" if stripped else ""
+    return line
+
+
+def normalize_pages(pages: List[str]) -> Tuple[str, dict]:
+    """
+    Normalize extracted text so more real content fits in the prompt budget.
+
+    Lines repeated at the top or bottom of most pages (candidate name,
+    contact line, "Page 2 of 3") are kept only on the first page, and only
+    where they sit in the top or bottom EDGE_LINES of a page; bare page
+    numbers are dropped everywhere. Whitespace runs are collapsed, bullet
+    glyphs become "- ", blank lines collapse to one, and long lines that
+    appear more than once are kept only the first time.
+
+    Args:
+        pages: Extracted text per page (a single entry for unpaginated documents)
+
+    Returns:
+        Tuple of (normalized text, stats dict describing what was removed)
+    """
+    page_lines = [[_clean_line(line) for line in page.split("\n")] for page in pages]
+
+    repeated = set()
+    if len(page_lines) > 1:
+        edge_counts: Counter = Counter()
+        for lines in page_lines:
+            edge_counts.update({_edge_key(lines[i]) for i in _edge_indexes(lines)})
+        threshold = max(2, (len(page_lines) + 1) // 2)
+        repeated = {key for key, count in edge_counts.items() if count >= threshold}
+
+    stats = {
+        "pages": len(pages),
+        "chars_before": sum(len(page) for page in pages) + max(len(pages) - 1, 0),
+        "repeated_lines_removed": 0,
+        "page_number_lines_removed": 0,
+        "duplicate_lines_removed": 0,
+    }
+    seen_repeated = set()
+    seen_lines = set()
+    output: List[str] = []
+
+    for lines in page_lines:
+        edges = _edge_indexes(lines) if repeated else set()
+        for i, line in enumerate(lines):
+            if not line:
+                if output and output[-1]:
+                    output.append("")
+                continue
+            if _PAGE_NUMBER.match(line):
+                stats["page_number_lines_removed"] += 1
+                continue
+            # Only lines at a page's top or bottom can be headers or footers;
+            # the same text in the body (a repeated date range) is content
+            key = _edge_key(line) if i in edges else None
+            if key in repeated:
+                if key in seen_repeated:
+                    stats["repeated_lines_removed"] += 1
+                    continue
+                seen_repeated.add(key)
+            if len(line) >= MIN_DUPLICATE_LENGTH:
+                if line in seen_lines:
+                    stats["duplicate_lines_removed"] += 1
+                    continue
+                seen_lines.add(line)
+            output.append(line)
+
+    text = "\n".join(output).strip()
+    stats["chars_after"] = len(text)
+    stats["chars_removed"] = max(stats["chars_before"] - stats["chars_after"], 0)
+    return text, stats
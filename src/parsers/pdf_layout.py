@@ -0,0 +1,38 @@
+"""pdfplumber page and layout device that skip images and vector graphics.
+
+Kept apart from resume_parser so pdfplumber and pdfminer are only imported
+once a PDF is actually parsed.
+"""
+
+from pdfplumber.page import Page, PDFPageAggregatorWithMarkedContent
+from pdfminer.pdfinterp import PDFPageInterpreter
+
+
+class TextOnlyAggregator(PDFPageAggregatorWithMarkedContent):
+    """Layout device that keeps characters and drops images and vector graphics."""
+
+    def render_image(self, *args, **kwargs) -> None:
+        """Skip image objects; only text is used downstream."""
+        return None
+
+    def paint_path(self, *args, **kwargs) -> None:
+        """Skip lines, rects and curves; only text is used downstream."""
+        return None
+
+
+class TextOnlyPage(Page):
+    """pdfplumber page whose layout is built without image and graphics objects."""
+
+    @property
+    def layout(self):
+        if hasattr(self, "_layout"):
+            return self._layout
+        device = TextOnlyAggregator(
+            self.pdf.rsrcmgr,
+            pageno=self.page_number,
+            laparams=self.pdf.laparams,
+        )
+        interpreter = PDFPageInterpreter(self.pdf.rsrcmgr, device)
+        interpreter.process_page(self.page_obj)
+        self._layout = device.get_result()
+        return self._layout
@@ -0,0 +1,283 @@
+"""Supervised worker processes that parse documents under a time and memory budget."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from functools import lru_cache
+from typing import Optional, Set
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+from ..config import settings
+from ..metrics import IN_FLIGHT, PARSE_POOL_KILLED, recording, replay
+from ..models import ResumeData
+from .resume_parser import DocumentSource, ResumeParser, ResumeParserError, preload_document_libraries
+
+
+logger = logging.getLogger(__name__)
+
+# Operations a worker can run, by name
+PARSE = "parse"
+EXTRACT_TEXT = "extract_text"
+
+
+@lru_cache(maxsize=None)
+def _worker_parser() -> ResumeParser:
+    """Return the parser owned by the current worker process."""
+    return ResumeParser()
+
+
+def parse_in_worker(source: DocumentSource, file_name: Optional[str] = None) -> ResumeData:
+    """Parse one resume inside a worker process."""
+    return _worker_parser().parse(source, file_name)
+
+
+def extract_text_in_worker(source: DocumentSource, file_name: Optional[str] = None) -> str:
+    """Extract the text of one document inside a worker process."""
+    return _worker_parser().extract_text(source, file_name)
+
+
+_OPERATIONS = {
+    PARSE: parse_in_worker,
+    EXTRACT_TEXT: extract_text_in_worker,
+}
+
+
+def _limit_memory(memory_bytes: Optional[int]) -> None:
+    """Cap the address space of the current process so runaway allocations fail fast."""
+    if resource is None or not memory_bytes:
+        return
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            memory_bytes = min(memory_bytes, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, hard))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Could not set parse worker memory limit: {str(e)}")
+
+
+def _worker_main(conn, memory_bytes: Optional[int]) -> None:
+    """
+    Serve parse requests from the supervisor until the pipe closes.
+
+    Each request is an (operation, source, file_name) tuple, where source is
+    document bytes or the path of a file to read; each reply is a
+    (status, payload, metric samples) tuple where status is "ok", "error"
+    or "memory". The samples carry the metrics recorded during the
+    operation back to the supervisor's registry.
+    """
+    # Workers exist to parse documents: import the libraries once, before
+    # the address-space limit applies, instead of during the first parse
+    preload_document_libraries()
+    _limit_memory(memory_bytes)
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+
+        operation, source, file_name = message
+        with recording() as samples:
+            try:
+                reply = ("ok", _OPERATIONS[operation](source, file_name), samples)
+            except MemoryError:
+                reply = ("memory", None, samples)
+            except Exception as e:
+                reply = ("error", e, samples)
+
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # Exceptions that cannot be pickled are reported by message
+            conn.send(("error", ResumeParserError(str(reply[1] if reply[0] == "error" else e)), samples))
+
+
+class _Worker:
+    """One parse process and the supervisor's end of its pipe."""
+
+    def __init__(self, context, memory_bytes: Optional[int]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, memory_bytes),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ParsePool:
+    """
+    Pool of supervised worker processes that parse resumes in parallel.
+
+    Every parse runs in an isolated process under a hard wall-clock and
+    address-space budget. A worker that exceeds its budget or dies is killed
+    and replaced, and the caller gets a ParseBudgetExceededError.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        memory_mb: Optional[int] = None
+    ):
+        """
+        Initialize the pool; worker processes start on first use.
+
+        Args:
+            workers: Number of worker processes (defaults to config, then CPU count)
+            timeout_seconds: Hard wall-clock limit per parse (defaults to config)
+            memory_mb: Address-space limit per worker in MB (defaults to config)
+        """
+        self.workers = workers or settings.parse_workers or os.cpu_count() or 1
+        self.timeout_seconds = timeout_seconds or settings.parse_worker_timeout_seconds
+        self.memory_mb = memory_mb or settings.parse_worker_memory_mb
+        self.killed_parses = 0
+        # Spawned workers do not inherit the server's threads or event loop
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._all: Set[_Worker] = set()
+        self._lock = threading.Lock()
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._context, self.memory_mb * 1024 * 1024)
+        with self._lock:
+            self._all.add(worker)
+        return worker
+
+    def _acquire(self) -> _Worker:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_start = len(self._all) < self.workers
+        if can_start:
+            worker = self._spawn()
+            logger.info(f"Started parse worker {worker.process.pid}")
+            return worker
+        return self._idle.get()
+
+    def _replace(self, worker: _Worker, reason: str, file_name: Optional[str], cause: str) -> None:
+        """Kill a worker that blew its budget and put a fresh one in its place."""
+        logger.warning(f"Killing parse worker {worker.process.pid} for {file_name or 'document'}: {reason}")
+        PARSE_POOL_KILLED.inc(reason=cause)
+        worker.kill()
+        with self._lock:
+            self._all.discard(worker)
+            self.killed_parses += 1
+        self._idle.put(self._spawn())
+
+    def _run(self, operation: str, source: DocumentSource, file_name: Optional[str]):
+        with IN_FLIGHT.track(operation=operation):
+            return self._run_in_worker(operation, source, file_name)
+
+    def _run_in_worker(self, operation: str, source: DocumentSource, file_name: Optional[str]):
+        worker = self._acquire()
+        try:
+            worker.conn.send((operation, source, file_name))
+            if not worker.conn.poll(self.timeout_seconds):
+                reason = f"exceeded the {self.timeout_seconds}s time limit"
+                self._replace(worker, reason, file_name, "timeout")
+                worker = None
+                raise ParseBudgetExceededError(f"Document parsing {reason}")
+            status, payload, samples = worker.conn.recv()
+        except (EOFError, OSError):
+            reason = "worker process died"
+            self._replace(worker, reason, file_name, "died")
+            worker = None
+            raise ParseBudgetExceededError(f"Document parsing failed: {reason}")
+
+        replay(samples)
+        if status == "memory":
+            reason = f"exceeded the {self.memory_mb}MB memory limit"
+            self._replace(worker, reason, file_name, "memory")
+            raise ParseBudgetExceededError(f"Document parsing {reason}")
+
+        self._idle.put(worker)
+        if status == "error":
+            raise payload
+        return payload
+
+    async def parse(self, source: DocumentSource, file_name: Optional[str] = None) -> ResumeData:
+        """
+        Parse a resume in a worker process.
+
+        A path is opened by the worker itself, so a large document is never
+        copied through the pipe.
+
+        Args:
+            source: Document bytes or a file path (streams cannot cross the process boundary)
+            file_name: Original file name, used for logging and error messages
+
+        Returns:
+            ResumeData object with extracted information
+
+        Raises:
+            ParseBudgetExceededError: If the parse exceeds the time or memory budget
+            ResumeParserError: If the document cannot be parsed
+        """
+        return await asyncio.to_thread(self._run, PARSE, source, file_name)
+
+    async def extract_text(self, source: DocumentSource, file_name: Optional[str] = None) -> str:
+        """
+        Extract the text of a document in a worker process.
+
+        Raises:
+            ParseBudgetExceededError: If the parse exceeds the time or memory budget
+            ResumeParserError: If the document cannot be parsed
+        """
+        return await asyncio.to_thread(self._run, EXTRACT_TEXT, source, file_name)
+
+    def stats(self) -> dict:
+        """Return worker and killed-parse counts."""
+        with self._lock:
+            started = len(self._all)
+        return {
+            "workers": self.workers,
+            "started": started,
+            "killed_parses": self.killed_parses,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            workers, self._all = self._all, set()
+        self._idle = queue.Queue()
+        for worker in workers:
+            worker.stop()
+
+
+@lru_cache(maxsize=None)
+def get_parse_pool() -> ParsePool:
+    """Return the shared parse pool."""
+    return ParsePool()
+
+
+class ParseBudgetExceededError(ResumeParserError):
+    """Raised when a parse is killed for exceeding its time or memory budget."""
+    pass
@@ -1,320 +1,530 @@
 """Resume parser module for extracting text from PDF, DOCX, and TXT files."""
 
-import pdfplumber
+import io
+import zipfile
+from contextlib import contextmanager
+import os
 import re
-from typing import Optional
+import time
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 import logging
-from docx import Document
 
+from .fingerprint import simhash
+from .normalize import normalize_pages
+from .sections import segment_resume
+from .skills import SkillMatcher, get_skill_matcher
+from ..metrics import record_fallback, timed
 from ..models import ResumeData
+from ..config import settings
 
 
 logger = logging.getLogger(__name__)
 
+# Document formats recognised by the extraction pipeline
+PDF_FORMAT = "pdf"
+DOCX_FORMAT = "docx"
+TXT_FORMAT = "txt"
+SUPPORTED_FORMATS = (PDF_FORMAT, DOCX_FORMAT, TXT_FORMAT)
 
-class ResumeParser:
-    """Parse PDF resumes and extract structured information."""
+# Anything a parser entry point accepts as a document
+DocumentSource = Union[bytes, str, Path, BinaryIO]
+
+_PDF_MAGIC = b"%PDF-"
+_ZIP_MAGIC = b"PK\x03\x04"
+_OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+# The PDF spec tolerates leading garbage before the header
+_SNIFF_BYTES = 1024
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = f"{_W_NS}p"
+_W_T = f"{_W_NS}t"
+_W_TAB = f"{_W_NS}tab"
+_W_BR = f"{_W_NS}br"
+_W_CR = f"{_W_NS}cr"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+_MB = 1024 * 1024
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):  # pragma: no cover - not available on Windows
+    _PAGE_SIZE = 4096
+
+
+def preload_document_libraries() -> None:
+    """
+    Import the PDF and DOCX libraries ahead of the first parse.
+    
+    They are otherwise imported on first use, so entry points that never
+    see a PDF or DOCX do not pay for them.
+    """
+    import pdfplumber  # noqa: F401
+    import docx  # noqa: F401
+    from . import pdf_layout  # noqa: F401
+    from lxml import etree  # noqa: F401
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """Return the current resident set size, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _RssSampler:
+    """
+    Peak resident set size over one parse, sampled after each chunk.
+    
+    ru_maxrss is a process-lifetime high-water mark, so in a long-lived parse
+    worker it would report the largest parse ever seen rather than this one.
+    """
     
     def __init__(self):
-        """Initialize the resume parser."""
-        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-        self.phone_pattern = re.compile(r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+        self.start = self.peak = _current_rss_bytes()
     
-    def parse_pdf(self, pdf_path: str) -> ResumeData:
-        """
-        Parse a PDF resume and extract text content.
+    def sample(self) -> None:
+        if self.peak is not None:
+            self.peak = max(self.peak, _current_rss_bytes() or 0)
+    
+    def stats(self) -> dict:
+        if self.peak is None:
+            return {"peak_rss_mb": None, "rss_growth_mb": None}
+        return {
+            "peak_rss_mb": round(self.peak / _MB, 1),
+            "rss_growth_mb": round((self.peak - self.start) / _MB, 1),
+        }
+
+
+def detect_format(stream: BinaryIO, file_name: Optional[str] = None) -> str:
+    """
+    Detect a document's format from its leading bytes.
+    
+    The file name is only used to word error messages; a PDF uploaded as
+    ``resume.docx`` is still parsed as a PDF.
+    
+    Args:
+        stream: Seekable binary stream positioned at the start of the document
+        file_name: Original file name, if known
         
-        Args:
-            pdf_path: Path to the PDF file
-            
-        Returns:
-            ResumeData object with extracted information
-            
-        Raises:
-            FileNotFoundError: If the PDF file doesn't exist
-            Exception: If PDF parsing fails
-        """
-        path = Path(pdf_path)
-        if not path.exists():
-            raise FileNotFoundError(f"Resume file not found: {pdf_path}")
+    Returns:
+        One of ``SUPPORTED_FORMATS``
         
+    Raises:
+        UnsupportedFormatError: If the content is not PDF, DOCX or UTF-8 text
+    """
+    head = stream.read(_SNIFF_BYTES)
+    stream.seek(0)
+    label = file_name or "document"
+    
+    if _PDF_MAGIC in head:
+        return PDF_FORMAT
+    if head.startswith(_ZIP_MAGIC):
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                # Extract text from all pages
-                raw_text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        raw_text += page_text + "\n"
-                
-                if not raw_text.strip():
-                    raise ValueError("No text could be extracted from the PDF")
-                
-                # Extract structured information
-                name = self._extract_name(raw_text)
-                email = self._extract_email(raw_text)
-                skills = self._extract_skills(raw_text)
-                
-                logger.info(f"Successfully parsed resume: {pdf_path}")
+            with zipfile.ZipFile(stream) as archive:
+                is_docx = "word/document.xml" in archive.namelist()
+        except zipfile.BadZipFile:
+            is_docx = False
+        finally:
+            stream.seek(0)
+        if is_docx:
+            return DOCX_FORMAT
+        raise UnsupportedFormatError(
+            f"Unsupported file format: {label} is a ZIP archive but not a DOCX document"
+        )
+    if head.startswith(_OLE_MAGIC):
+        raise UnsupportedFormatError(
+            f"Unsupported file format: {label} is a legacy .doc file. Supported formats: PDF, DOCX, TXT"
+        )
+    if b"\x00" in head:
+        raise UnsupportedFormatError(
+            f"Unsupported file format: {label}. Supported formats: PDF, DOCX, TXT"
+        )
+    return TXT_FORMAT
+
+
+def _iter_pdf_text(stream: BinaryIO, max_pages: int) -> Iterator[str]:
+    """
+    Yield the text of each PDF page, flushing page caches as it goes.
+    
+    Pages are created lazily and their layout objects are released as soon as
+    their text has been read, so memory stays bounded by a single page.
+    Images and vector graphics are never turned into layout objects.
+    """
+    import pdfplumber
+    from pdfminer.pdfpage import PDFPage
+    from .pdf_layout import TextOnlyPage
+    
+    # Closed even when parsing stops early; the caller still owns the stream
+    with pdfplumber.PDF(stream, stream_is_external=True) as pdf:
+        doctop = 0
+        
+        for page_number, page_obj in enumerate(PDFPage.create_pages(pdf.doc), start=1):
+            if page_number > max_pages:
+                raise ResumeParserError(f"Document has too many pages (limit {max_pages})")
+            
+            page = TextOnlyPage(pdf, page_obj, page_number=page_number, initial_doctop=doctop)
+            doctop += page.height
+            yield page.extract_text() or ""
+            # Release the parsed layout objects before moving to the next page
+            page.close()
+
+
+def _iter_docx_xml_text(stream: BinaryIO, max_xml_bytes: int) -> Iterator[str]:
+    """
+    Yield DOCX paragraph text in document order by stream-parsing word/document.xml.
+    
+    Paragraphs in the body and in table cells are emitted once each, so merged
+    cells are not repeated. Text box fallback copies (mc:Fallback) are skipped.
+    Each paragraph is discarded after it is read, keeping memory flat.
+    """
+    from lxml import etree
+    
+    with zipfile.ZipFile(stream) as archive:
+        info = archive.getinfo("word/document.xml")
+        # zipfile never inflates past the declared size, so this also caps zip bombs
+        if info.file_size > max_xml_bytes:
+            raise ResumeParserError(
+                f"DOCX content is too large ({info.file_size} bytes uncompressed, "
+                f"limit {max_xml_bytes} bytes)"
+            )
+        
+        with archive.open(info) as xml_file:
+            fallback_depth = 0
+            for event, elem in etree.iterparse(
+                xml_file,
+                events=("start", "end"),
+                tag=(_W_P, _MC_FALLBACK),
+                resolve_entities=False,
+                no_network=True,
+            ):
+                if elem.tag == _MC_FALLBACK:
+                    fallback_depth += 1 if event == "start" else -1
+                    continue
+                if event == "start":
+                    continue
                 
-                return ResumeData(
-                    raw_text=raw_text,
-                    name=name,
-                    email=email,
-                    skills=skills
-                )
+                if not fallback_depth:
+                    parts = []
+                    for node in elem.iter(_W_T, _W_TAB, _W_BR, _W_CR):
+                        if node.tag == _W_T:
+                            parts.append(node.text or "")
+                        else:
+                            parts.append("\t" if node.tag == _W_TAB else "\n")
+                    yield "".join(parts)
                 
-        except Exception as e:
-            logger.error(f"Error parsing PDF {pdf_path}: {str(e)}")
-            raise Exception(f"Failed to parse resume: {str(e)}")
+                # Drop the paragraph and any already-processed siblings
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+
+def _iter_docx_object_model_text(stream: BinaryIO) -> Iterator[str]:
+    """Yield DOCX text through python-docx's object model (fallback path)."""
+    from docx import Document
     
-    def parse_pdf_bytes(self, pdf_bytes: bytes) -> ResumeData:
+    doc = Document(stream)
+    
+    for paragraph in doc.paragraphs:
+        yield paragraph.text
+    
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                yield cell.text
+
+
+def _iter_docx_text(stream: BinaryIO, max_xml_bytes: int) -> Iterator[str]:
+    """
+    Yield DOCX text using the streaming XML reader, falling back to python-docx.
+    
+    The fallback is only used when the fast path fails before producing any text.
+    """
+    produced = False
+    try:
+        for chunk in _iter_docx_xml_text(stream, max_xml_bytes):
+            produced = True
+            yield chunk
+    except ResumeParserError:
+        raise
+    except Exception as e:
+        if produced:
+            raise
+        logger.warning(f"Streaming DOCX reader failed ({str(e)}), falling back to python-docx")
+        record_fallback("docx_object_model")
+        stream.seek(0)
+        yield from _iter_docx_object_model_text(stream)
+
+
+def _iter_txt_text(stream: BinaryIO) -> Iterator[str]:
+    """Yield the decoded content of a UTF-8 text document."""
+    yield stream.read().decode("utf-8-sig")
+
+
+class ResumeParser:
+    """Parse resumes and other documents and extract structured information."""
+    
+    def __init__(
+        self,
+        max_pages: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        skill_matcher: Optional[SkillMatcher] = None,
+        max_xml_bytes: Optional[int] = None,
+        normalize_text: Optional[bool] = None
+    ):
         """
-        Parse a PDF resume from bytes.
+        Initialize the resume parser.
         
         Args:
-            pdf_bytes: PDF file content as bytes
-            
-        Returns:
-            ResumeData object with extracted information
+            max_pages: Maximum number of PDF pages to parse (defaults to config)
+            max_bytes: Maximum document size in bytes (defaults to config)
+            timeout_seconds: Maximum wall-clock time per parse (defaults to config)
+            skill_matcher: Skill matcher to use (defaults to the shared taxonomy matcher)
+            max_xml_bytes: Maximum uncompressed DOCX body size in bytes (defaults to config)
+            normalize_text: Run the text normalization stage after extraction (defaults to config)
         """
-        try:
-            import io
-            pdf_file = io.BytesIO(pdf_bytes)
-            
-            with pdfplumber.open(pdf_file) as pdf:
-                raw_text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        raw_text += page_text + "\n"
-                
-                if not raw_text.strip():
-                    raise ValueError("No text could be extracted from the PDF")
-                
-                name = self._extract_name(raw_text)
-                email = self._extract_email(raw_text)
-                skills = self._extract_skills(raw_text)
-                
-                logger.info("Successfully parsed resume from bytes")
-                
-                return ResumeData(
-                    raw_text=raw_text,
-                    name=name,
-                    email=email,
-                    skills=skills
-                )
-                
-        except Exception as e:
-            logger.error(f"Error parsing PDF bytes: {str(e)}")
-            raise Exception(f"Failed to parse resume: {str(e)}")
+        self.max_pages = max_pages or settings.parse_max_pages
+        self.max_bytes = max_bytes or settings.parse_max_bytes
+        self.timeout_seconds = timeout_seconds or settings.parse_timeout_seconds
+        self.skill_matcher = skill_matcher or get_skill_matcher()
+        self.max_xml_bytes = max_xml_bytes or settings.parse_max_uncompressed_bytes
+        self.normalize_text = settings.parse_normalize_text if normalize_text is None else normalize_text
+        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+        self.phone_pattern = re.compile(r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+        self.name_exclusions = ('resume', 'cv', 'curriculum', 'email', 'phone', 'address')
     
-    def parse_docx(self, docx_path: str) -> ResumeData:
+    def parse(self, source: DocumentSource, file_name: Optional[str] = None) -> ResumeData:
         """
-        Parse a DOCX (Word) resume and extract text content.
+        Parse a resume from any supported source, detecting the format from its content.
         
         Args:
-            docx_path: Path to the DOCX file
+            source: File path, raw bytes or a seekable binary stream
+            file_name: Original file name, used for logging and error messages
             
         Returns:
             ResumeData object with extracted information
             
         Raises:
-            FileNotFoundError: If the DOCX file doesn't exist
-            Exception: If DOCX parsing fails
+            FileNotFoundError: If a path is given and the file doesn't exist
+            UnsupportedFormatError: If the document is not PDF, DOCX or TXT
+            ResumeParserError: If parsing fails or exceeds the configured limits
         """
-        path = Path(docx_path)
-        if not path.exists():
-            raise FileNotFoundError(f"Resume file not found: {docx_path}")
+        raw_text, parse_stats = self._extract(source, file_name, "Failed to parse resume")
         
-        try:
-            doc = Document(docx_path)
-            
-            # Extract text from all paragraphs
-            raw_text = ""
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    raw_text += paragraph.text + "\n"
-            
-            # Also extract text from tables if any
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            raw_text += cell.text + "\n"
-            
-            if not raw_text.strip():
-                raise ValueError("No text could be extracted from the DOCX file")
-            
-            # Extract structured information
-            name = self._extract_name(raw_text)
-            email = self._extract_email(raw_text)
-            skills = self._extract_skills(raw_text)
-            
-            logger.info(f"Successfully parsed resume: {docx_path}")
-            
-            return ResumeData(
-                raw_text=raw_text,
-                name=name,
-                email=email,
-                skills=skills
-            )
-                
-        except Exception as e:
-            logger.error(f"Error parsing DOCX {docx_path}: {str(e)}")
-            raise Exception(f"Failed to parse resume: {str(e)}")
+        resume_data = self._build_resume_data(raw_text)
+        resume_data.metadata = {
+            "parse_stats": parse_stats,
+            "fingerprint": f"{simhash(raw_text):016x}",
+        }
+        
+        logger.info(f"Successfully parsed resume: {file_name or parse_stats['format']}")
+        return resume_data
     
-    def parse_docx_bytes(self, docx_bytes: bytes) -> ResumeData:
+    def extract_text(self, source: DocumentSource, file_name: Optional[str] = None) -> str:
         """
-        Parse a DOCX resume from bytes.
+        Extract plain text from a document (for JDs or other documents).
         
         Args:
-            docx_bytes: DOCX file content as bytes
+            source: File path, raw bytes or a seekable binary stream
+            file_name: Original file name, used for logging and error messages
             
         Returns:
-            ResumeData object with extracted information
-        """
-        try:
-            import io
-            docx_file = io.BytesIO(docx_bytes)
-            
-            doc = Document(docx_file)
-            
-            # Extract text from all paragraphs
-            raw_text = ""
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    raw_text += paragraph.text + "\n"
-            
-            # Also extract text from tables if any
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            raw_text += cell.text + "\n"
-            
-            if not raw_text.strip():
-                raise ValueError("No text could be extracted from the DOCX file")
-            
-            name = self._extract_name(raw_text)
-            email = self._extract_email(raw_text)
-            skills = self._extract_skills(raw_text)
-            
-            logger.info("Successfully parsed resume from DOCX bytes")
+            Extracted text as string
             
-            return ResumeData(
-                raw_text=raw_text,
-                name=name,
-                email=email,
-                skills=skills
-            )
-                
-        except Exception as e:
-            logger.error(f"Error parsing DOCX bytes: {str(e)}")
-            raise Exception(f"Failed to parse resume: {str(e)}")
+        Raises:
+            UnsupportedFormatError: If the document is not PDF, DOCX or TXT
+            ResumeParserError: If extraction fails or exceeds the configured limits
+        """
+        raw_text, parse_stats = self._extract(source, file_name, "Failed to extract text")
+        
+        logger.info(f"Successfully extracted text from {parse_stats['format'].upper()}")
+        return raw_text.strip()
+    
+    def parse_pdf(self, pdf_path: str) -> ResumeData:
+        """Parse a PDF resume from a file path."""
+        return self.parse(pdf_path, pdf_path)
+    
+    def parse_pdf_bytes(self, pdf_bytes: bytes) -> ResumeData:
+        """Parse a PDF resume from bytes."""
+        return self.parse(pdf_bytes)
+    
+    def parse_docx(self, docx_path: str) -> ResumeData:
+        """Parse a DOCX (Word) resume from a file path."""
+        return self.parse(docx_path, docx_path)
+    
+    def parse_docx_bytes(self, docx_bytes: bytes) -> ResumeData:
+        """Parse a DOCX resume from bytes."""
+        return self.parse(docx_bytes)
     
     def parse_txt(self, txt_path: str) -> ResumeData:
+        """Parse a TXT resume from a file path."""
+        return self.parse(txt_path, txt_path)
+    
+    def parse_txt_bytes(self, txt_bytes: bytes) -> ResumeData:
+        """Parse a TXT resume from bytes."""
+        return self.parse(txt_bytes)
+    
+    def parse_resume_bytes(self, file_bytes: bytes, file_name: str) -> ResumeData:
         """
-        Parse a TXT resume and extract text content.
+        Parse a resume from bytes, detecting the format from the content.
         
         Args:
-            txt_path: Path to the TXT file
+            file_bytes: File content as bytes
+            file_name: Original file name (used for logging only)
             
         Returns:
             ResumeData object with extracted information
-            
-        Raises:
-            FileNotFoundError: If the TXT file doesn't exist
-            Exception: If TXT parsing fails
         """
-        path = Path(txt_path)
-        if not path.exists():
-            raise FileNotFoundError(f"Resume file not found: {txt_path}")
-        
-        try:
-            with open(txt_path, 'r', encoding='utf-8') as f:
-                raw_text = f.read()
-            
-            if not raw_text.strip():
-                raise ValueError("No text could be extracted from the TXT file")
-            
-            # Extract structured information
-            name = self._extract_name(raw_text)
-            email = self._extract_email(raw_text)
-            skills = self._extract_skills(raw_text)
-            
-            logger.info(f"Successfully parsed resume: {txt_path}")
-            
-            return ResumeData(
-                raw_text=raw_text,
-                name=name,
-                email=email,
-                skills=skills
-            )
-                
-        except Exception as e:
-            logger.error(f"Error parsing TXT {txt_path}: {str(e)}")
-            raise Exception(f"Failed to parse resume: {str(e)}")
+        return self.parse(file_bytes, file_name)
     
-    def parse_txt_bytes(self, txt_bytes: bytes) -> ResumeData:
+    def extract_text_from_pdf(self, pdf_bytes: bytes) -> str:
+        """Extract plain text from a PDF file."""
+        return self.extract_text(pdf_bytes)
+    
+    def extract_text_from_docx(self, docx_bytes: bytes) -> str:
+        """Extract plain text from a DOCX file."""
+        return self.extract_text(docx_bytes)
+    
+    def extract_text_from_file(self, file_bytes: bytes, file_name: str) -> str:
         """
-        Parse a TXT resume from bytes.
+        Extract text from a document file, detecting the format from the content.
         
         Args:
-            txt_bytes: TXT file content as bytes
+            file_bytes: File content as bytes
+            file_name: Original file name (used for logging only)
             
         Returns:
-            ResumeData object with extracted information
+            Extracted text as string
+        """
+        return self.extract_text(file_bytes, file_name)
+    
+    @contextmanager
+    def _open_source(self, source: DocumentSource) -> Iterator[Tuple[BinaryIO, int]]:
+        """Yield a seekable binary stream and its size for any document source."""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            yield io.BytesIO(source), len(source)
+        elif isinstance(source, (str, Path)):
+            path = Path(source)
+            if not path.exists():
+                raise FileNotFoundError(f"Resume file not found: {source}")
+            with open(path, 'rb') as stream:
+                yield stream, path.stat().st_size
+        else:
+            source.seek(0, io.SEEK_END)
+            size = source.tell()
+            source.seek(0)
+            yield source, size
+    
+    def _extract(
+        self,
+        source: DocumentSource,
+        file_name: Optional[str],
+        error_prefix: str
+    ) -> Tuple[str, dict]:
+        """
+        Run the extraction pipeline: sniff the format, collect text chunks, then normalize.
+        
+        Returns:
+            Tuple of (extracted text, parse stats dict)
         """
         try:
-            raw_text = txt_bytes.decode('utf-8')
-            
-            if not raw_text.strip():
-                raise ValueError("No text could be extracted from the TXT file")
-            
-            name = self._extract_name(raw_text)
-            email = self._extract_email(raw_text)
-            skills = self._extract_skills(raw_text)
-            
-            logger.info("Successfully parsed resume from TXT bytes")
-            
-            return ResumeData(
-                raw_text=raw_text,
-                name=name,
-                email=email,
-                skills=skills
-            )
+            with self._open_source(source) as (stream, size):
+                if size > self.max_bytes:
+                    raise ResumeParserError(
+                        f"Document is too large ({size} bytes, limit {self.max_bytes} bytes)"
+                    )
+                
+                doc_format = detect_format(stream, file_name)
+                started = time.monotonic()
+                rss = _RssSampler()
+                chunks: List[str] = []
+                chunk_count = 0
                 
+                with timed("parse_extract", format=doc_format):
+                    for chunk in self._iter_chunks(stream, doc_format):
+                        chunk_count += 1
+                        rss.sample()
+                        if chunk.strip():
+                            chunks.append(chunk)
+                        if time.monotonic() - started > self.timeout_seconds:
+                            raise ResumeParserError(
+                                f"Document parsing exceeded the {self.timeout_seconds}s time limit"
+                            )
+            
+            if not chunks:
+                raise ValueError(f"No text could be extracted from the {doc_format.upper()} file")
+            
+            if self.normalize_text:
+                # PDF chunks are pages; other formats are treated as a single page
+                pages = chunks if doc_format == PDF_FORMAT else ["\n".join(chunks)]
+                with timed("parse_normalize", format=doc_format):
+                    text, normalization = normalize_pages(pages)
+            else:
+                # A single join keeps extraction linear in document size
+                text, normalization = "\n".join(chunks), None
+            
+            parse_stats = {
+                "format": doc_format,
+                "pages" if doc_format == PDF_FORMAT else "chunks": chunk_count,
+                "bytes": size,
+                "parse_ms": round((time.monotonic() - started) * 1000, 1),
+                **rss.stats(),
+            }
+            if normalization is not None:
+                parse_stats["normalization"] = normalization
+            logger.info(f"Parse stats for {file_name or doc_format}: {parse_stats}")
+            
+            return text + "\n", parse_stats
+            
+        except (ResumeParserError, FileNotFoundError, MemoryError):
+            raise
         except Exception as e:
-            logger.error(f"Error parsing TXT bytes: {str(e)}")
-            raise Exception(f"Failed to parse resume: {str(e)}")
+            logger.error(f"Error parsing {file_name or 'document'}: {str(e)}")
+            raise ResumeParserError(f"{error_prefix}: {str(e)}")
     
-    def parse_resume_bytes(self, file_bytes: bytes, file_name: str) -> ResumeData:
+    def _iter_chunks(self, stream: BinaryIO, doc_format: str) -> Iterator[str]:
+        """Dispatch to the chunk reader for a detected format."""
+        if doc_format == PDF_FORMAT:
+            return _iter_pdf_text(stream, self.max_pages)
+        if doc_format == DOCX_FORMAT:
+            return _iter_docx_text(stream, self.max_xml_bytes)
+        return _iter_txt_text(stream)
+    
+    def _build_resume_data(self, text: str) -> ResumeData:
         """
-        Parse a resume from bytes, automatically detecting the file format.
+        Run all field extractors over the text.
         
-        Args:
-            file_bytes: File content as bytes
-            file_name: File name with extension (used to determine format)
-            
-        Returns:
-            ResumeData object with extracted information
-            
-        Raises:
-            ValueError: If file format is not supported
-            Exception: If parsing fails
+        The name is taken from the first few lines, the email from the first
+        line that contains one, skills from the taxonomy matcher, and
+        education, work history and experience from section segmentation.
         """
-        file_lower = file_name.lower()
+        name = None
+        email = None
         
-        if file_lower.endswith('.pdf'):
-            return self.parse_pdf_bytes(file_bytes)
-        elif file_lower.endswith('.docx'):
-            return self.parse_docx_bytes(file_bytes)
-        elif file_lower.endswith('.txt'):
-            return self.parse_txt_bytes(file_bytes)
-        else:
-            raise ValueError(f"Unsupported file format: {file_name}. Supported formats: PDF, DOCX, TXT")
+        for index, line in enumerate(text.split('\n')):
+            if name is None and index < 5:
+                name = self._match_name(line)
+            if email is None:
+                match = self.email_pattern.search(line)
+                if match:
+                    email = match.group(0)
+            if email is not None and (name is not None or index >= 5):
+                break
+        
+        segments = segment_resume(text)
+        
+        return ResumeData(
+            raw_text=text,
+            name=name,
+            email=email,
+            skills=self._extract_skills(text),
+            experience_years=segments.experience_years,
+            education=segments.education,
+            work_history=segments.work_history,
+            sections=segments.sections
+        )
     
     def _extract_email(self, text: str) -> Optional[str]:
         """Extract email address from text."""
@@ -326,145 +536,35 @@ class ResumeParser:
         Extract candidate name from resume text.
         Assumes name is in the first few lines.
         """
-        lines = text.split('\n')
-        for line in lines[:5]:
-            line = line.strip()
-            # Simple heuristic: name is usually short and at the top
-            if line and len(line.split()) <= 4 and len(line) < 50:
-                # Avoid lines with common resume keywords
-                if not any(keyword in line.lower() for keyword in 
-                          ['resume', 'cv', 'curriculum', 'email', 'phone', 'address']):
-                    return line
+        for line in text.split('\n')[:5]:
+            name = self._match_name(line)
+            if name:
+                return name
+        return None
+    
+    def _match_name(self, line: str) -> Optional[str]:
+        """Return the line if it looks like a candidate name."""
+        line = line.strip()
+        # Simple heuristic: name is usually short and at the top
+        if line and len(line.split()) <= 4 and len(line) < 50:
+            # Avoid lines with common resume keywords
+            if not any(keyword in line.lower() for keyword in self.name_exclusions):
+                return line
         return None
     
     def _extract_skills(self, text: str) -> list:
         """
         Extract technical skills from resume text.
-        This is a simple keyword-based approach.
-        """
-        # Common technical skills and technologies
-        skill_keywords = [
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go', 'rust',
-            'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'fastapi',
-            'sql', 'postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch',
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform',
-            'git', 'jenkins', 'ci/cd', 'agile', 'scrum',
-            'machine learning', 'deep learning', 'ai', 'nlp', 'computer vision',
-            'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
-            'rest api', 'graphql', 'microservices', 'linux', 'bash'
-        ]
-        
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in skill_keywords:
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        return list(set(found_skills))  # Remove duplicates
-
-    def extract_text_from_pdf(self, pdf_bytes: bytes) -> str:
-        """
-        Extract plain text from a PDF file (for JD or other documents).
-        
-        Args:
-            pdf_bytes: PDF file content as bytes
-            
-        Returns:
-            Extracted text as string
-            
-        Raises:
-            Exception: If PDF parsing fails
-        """
-        try:
-            import io
-            pdf_file = io.BytesIO(pdf_bytes)
-            
-            with pdfplumber.open(pdf_file) as pdf:
-                raw_text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        raw_text += page_text + "\n"
-            
-            if not raw_text.strip():
-                raise ValueError("No text could be extracted from the PDF")
-            
-            logger.info("Successfully extracted text from PDF")
-            return raw_text.strip()
-                
-        except Exception as e:
-            logger.error(f"Error extracting text from PDF: {str(e)}")
-            raise Exception(f"Failed to extract text from PDF: {str(e)}")
-
-    def extract_text_from_docx(self, docx_bytes: bytes) -> str:
-        """
-        Extract plain text from a DOCX file (for JD or other documents).
-        
-        Args:
-            docx_bytes: DOCX file content as bytes
-            
-        Returns:
-            Extracted text as string
-            
-        Raises:
-            Exception: If DOCX parsing fails
+        Uses the compiled taxonomy matcher, so cost is independent of taxonomy size.
         """
-        try:
-            import io
-            docx_file = io.BytesIO(docx_bytes)
-            
-            doc = Document(docx_file)
-            
-            raw_text = ""
-            # Extract text from all paragraphs
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    raw_text += paragraph.text + "\n"
-            
-            # Also extract text from tables if any
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            raw_text += cell.text + "\n"
-            
-            if not raw_text.strip():
-                raise ValueError("No text could be extracted from the DOCX file")
-            
-            logger.info("Successfully extracted text from DOCX")
-            return raw_text.strip()
-                
-        except Exception as e:
-            logger.error(f"Error extracting text from DOCX: {str(e)}")
-            raise Exception(f"Failed to extract text from DOCX: {str(e)}")
-
-    def extract_text_from_file(self, file_bytes: bytes, file_name: str) -> str:
-        """
-        Extract text from a document file, automatically detecting the format.
-        Supports PDF and DOCX formats.
-        
-        Args:
-            file_bytes: File content as bytes
-            file_name: File name with extension (used to determine format)
-            
-        Returns:
-            Extracted text as string
-            
-        Raises:
-            ValueError: If file format is not supported
-            Exception: If extraction fails
-        """
-        file_lower = file_name.lower()
-        
-        if file_lower.endswith('.pdf'):
-            return self.extract_text_from_pdf(file_bytes)
-        elif file_lower.endswith('.docx'):
-            return self.extract_text_from_docx(file_bytes)
-        else:
-            raise ValueError(f"Unsupported file format: {file_name}. Supported formats: PDF, DOCX")
+        return self.skill_matcher.find(text)
 
 
 class ResumeParserError(Exception):
     """Custom exception for resume parsing errors."""
     pass
+
+
+class UnsupportedFormatError(ResumeParserError, ValueError):
+    """Raised when a document is not in a supported format."""
+    pass
@@ -0,0 +1,199 @@
+"""Resume section segmentation and experience extraction."""
+
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+
+# Section names produced by the segmenter; lines before the first heading go to "header"
+HEADER = "header"
+SUMMARY = "summary"
+EXPERIENCE = "experience"
+EDUCATION = "education"
+SKILLS = "skills"
+PROJECTS = "projects"
+CERTIFICATIONS = "certifications"
+
+_HEADING_PATTERN = re.compile(
+    r"(?P<summary>(?:professional |career |executive )?(?:summary|profile|objective)"
+    r"|about(?: me)?|overview)"
+    r"|(?P<experience>(?:professional |work |relevant |industry )?experience"
+    r"|(?:employment|work|career|professional) history|employment)"
+    r"|(?P<education>education(?:al background)?|academic (?:background|qualifications)"
+    r"|qualifications)"
+    r"|(?P<skills>(?:technical |core |key )?(?:skills|competencies|proficiencies)"
+    r"|technologies|tech stack|tools(?: (?:and|&) technologies)?)"
+    r"|(?P<projects>(?:personal |selected |key |academic |side )?projects)"
+    r"|(?P<certifications>certifications?(?: (?:and|&) (?:licenses|awards))?|licenses|awards)",
+    re.IGNORECASE,
+)
+
+_HEADING_STRIP = re.compile(r"^[\W_]+|[\W_]+$")
+_WHITESPACE = re.compile(r"\s+")
+_BULLET = re.compile(r"^\s*(?:[-*•▪●◦‣⁃–>]|\d+[.)])\s+")
+
+_MONTH = (
+    r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+)
+_DATE_RANGE = re.compile(
+    rf"(?:(?P<start_month>{_MONTH})\.?,?\s+|(?P<start_num>\d{{1,2}})[/.-])?"
+    rf"(?P<start_year>(?:19|20)\d{{2}})"
+    r"\s*(?:-|–|—|to|until|till|through)\s*"
+    rf"(?:(?:(?P<end_month>{_MONTH})\.?,?\s+|(?P<end_num>\d{{1,2}})[/.-])?"
+    r"(?P<end_year>(?:19|20)\d{2})\b"
+    r"|(?P<present>present|current|now|today|date))",
+    re.IGNORECASE,
+)
+_STATED_YEARS = re.compile(r"(\d{1,2})\+?\s*(?:years?|yrs?)\.?\s+(?:of\s+)?experience", re.IGNORECASE)
+
+_MONTHS = {
+    name: index
+    for index, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"],
+        start=1,
+    )
+}
+
+
+class ResumeSections(BaseModel):
+    """Structured view of a resume produced by a single pass over its lines."""
+    sections: Dict[str, str] = Field(default_factory=dict)
+    education: List[str] = Field(default_factory=list)
+    work_history: List[str] = Field(default_factory=list)
+    experience_years: Optional[int] = None
+
+
+def classify_heading(line: str) -> Optional[str]:
+    """
+    Return the section a line introduces, or None if it is not a heading.
+
+    Args:
+        line: A single line of resume text
+    """
+    if len(line) > 50:
+        return None
+    candidate = _WHITESPACE.sub(" ", _HEADING_STRIP.sub("", line)).lower()
+    if not candidate or len(candidate.split()) > 5:
+        return None
+    match = _HEADING_PATTERN.fullmatch(candidate)
+    return match.lastgroup if match else None
+
+
+def _month_index(match: re.Match, prefix: str, today: date) -> int:
+    """Convert one side of a date range match into a month index."""
+    if prefix == "end" and match.group("present"):
+        return today.year * 12 + today.month - 1
+    year = int(match.group(f"{prefix}_year"))
+    month_name = match.group(f"{prefix}_month")
+    month_num = match.group(f"{prefix}_num")
+    if month_name:
+        month = _MONTHS[month_name[:3].lower()]
+    elif month_num and 1 <= int(month_num) <= 12:
+        month = int(month_num)
+    else:
+        month = 1
+    return year * 12 + month - 1
+
+
+def extract_date_ranges(text: str, today: Optional[date] = None) -> List[Tuple[int, int]]:
+    """
+    Extract date ranges such as "Jan 2019 - Present" or "03/2017 - 05/2020".
+
+    Args:
+        text: Text to scan
+        today: Date used for open-ended ranges (defaults to today)
+
+    Returns:
+        List of (start, end) month indices (year * 12 + month - 1)
+    """
+    today = today or date.today()
+    ranges = []
+    for match in _DATE_RANGE.finditer(text):
+        start = _month_index(match, "start", today)
+        end = _month_index(match, "end", today)
+        if end >= start:
+            ranges.append((start, end))
+    return ranges
+
+
+def total_experience_years(ranges: List[Tuple[int, int]]) -> Optional[int]:
+    """Sum date ranges in whole years, counting overlapping periods once."""
+    if not ranges:
+        return None
+    total_months = 0
+    current_start, current_end = None, None
+    for start, end in sorted(ranges):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total_months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    total_months += current_end - current_start
+    return total_months // 12
+
+
+def segment_resume(text: str, today: Optional[date] = None) -> ResumeSections:
+    """
+    Segment resume text into sections and derive education, work history and experience.
+
+    Every line is classified once: headings switch the current section, date
+    ranges inside the experience section mark job entries, and non-bullet
+    lines inside the education section become education entries.
+
+    Args:
+        text: Extracted resume text
+        today: Date used for open-ended ranges (defaults to today)
+
+    Returns:
+        ResumeSections with the section text and derived fields
+    """
+    today = today or date.today()
+    section_lines: Dict[str, List[str]] = {}
+    current = HEADER
+    education: List[str] = []
+    work_history: List[str] = []
+    experience_ranges: List[Tuple[int, int]] = []
+    previous_line = None
+
+    for raw_line in text.split("\n"):
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        heading = classify_heading(line)
+        if heading:
+            current = heading
+            previous_line = None
+            continue
+
+        section_lines.setdefault(current, []).append(line)
+        is_bullet = bool(_BULLET.match(line))
+
+        if current == EXPERIENCE and not is_bullet:
+            line_ranges = extract_date_ranges(line, today)
+            if line_ranges:
+                experience_ranges.extend(line_ranges)
+                entry = line
+                # A line holding only dates belongs to the title or company line above it
+                if previous_line and len(_DATE_RANGE.sub("", line).strip(" |,-–—")) < 3:
+                    entry = f"{previous_line} | {line}"
+                work_history.append(entry)
+            previous_line = line
+        elif current == EDUCATION and not is_bullet:
+            education.append(line)
+
+    experience_years = total_experience_years(experience_ranges)
+    if experience_years is None:
+        stated = [int(years) for years in _STATED_YEARS.findall(text)]
+        experience_years = max(stated) if stated else None
+
+    return ResumeSections(
+        sections={name: "\n".join(lines) for name, lines in section_lines.items()},
+        education=education,
+        work_history=work_history,
+        experience_years=experience_years,
+    )
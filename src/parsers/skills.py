@@ -0,0 +1,309 @@
+"""Skill extraction using an Aho-Corasick automaton over a loadable skill taxonomy."""
+
+import logging
+import re
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..config import settings
+from ..models import SkillGap
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).parent / "data" / "skills.txt"
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Prefix marking a surface form that only matches with the case written in the taxonomy
+CASE_SENSITIVE_PREFIX = "~"
+
+# Taxonomy categories whose skills are extracted but never become focus areas
+NON_TECHNICAL_CATEGORIES = frozenset({"methodologies and process", "certifications (general)"})
+
+# "# --- Category ---" headings in a taxonomy file
+_CATEGORY_HEADING = re.compile(r"^#\s*---\s*(.+?)\s*---\s*$")
+
+
+def _read_taxonomy(path: Optional[str]) -> Tuple[Dict[str, List[str]], Dict[str, str]]:
+    """Read a taxonomy file into (aliases by canonical name, category by canonical name)."""
+    taxonomy_path = Path(path) if path else DEFAULT_TAXONOMY_PATH
+    taxonomy: Dict[str, List[str]] = {}
+    categories: Dict[str, str] = {}
+    category = None
+
+    with open(taxonomy_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            heading = _CATEGORY_HEADING.match(line)
+            if heading:
+                category = heading.group(1).lower()
+                continue
+            if not line or line.startswith("#"):
+                continue
+            canonical, _, aliases = line.partition("|")
+            canonical = _surface_form(canonical)
+            taxonomy[canonical] = [
+                _surface_form(alias) for alias in aliases.split(",") if alias.strip()
+            ]
+            if category:
+                categories[_skill_name(canonical)] = category
+
+    return taxonomy, categories
+
+
+def load_skill_taxonomy(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Load a skill taxonomy file.
+
+    Each non-comment line holds a canonical skill name, optionally followed by
+    ``|`` and a comma-separated list of aliases. Names and aliases are
+    lowercased, except those with a leading ``~``, which keep their prefix
+    and case because they match case-sensitively (see SkillMatcher).
+
+    Args:
+        path: Path to the taxonomy file (defaults to the bundled taxonomy)
+
+    Returns:
+        Mapping of canonical skill name to its aliases
+    """
+    return _read_taxonomy(path)[0]
+
+
+def load_skill_categories(path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Load the category of every skill in a taxonomy file.
+
+    A skill belongs to the nearest ``# --- Category ---`` heading above it.
+
+    Args:
+        path: Path to the taxonomy file (defaults to the bundled taxonomy)
+
+    Returns:
+        Mapping of reported skill name to its lowercased category
+    """
+    return _read_taxonomy(path)[1]
+
+
+def _surface_form(form: str) -> str:
+    """Normalize a taxonomy name or alias, keeping the case of case-sensitive forms."""
+    form = _WHITESPACE.sub(" ", form.strip())
+    return form if form.startswith(CASE_SENSITIVE_PREFIX) else form.lower()
+
+
+def _skill_name(canonical: str) -> str:
+    """Name a canonical taxonomy entry is reported under."""
+    return canonical.lstrip(CASE_SENSITIVE_PREFIX).strip().lower()
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class SkillMatcher:
+    """
+    Multi-pattern skill matcher built on an Aho-Corasick automaton.
+
+    The text is scanned once regardless of how many skills the taxonomy holds.
+    Matches must sit on word boundaries, so ``go`` does not match ``google``
+    and ``ai`` does not match ``maintain``. Aliases are reported under their
+    canonical name. An alias hit that lies inside a longer match is dropped,
+    so ``js`` in ``node.js`` does not also report javascript.
+
+    Canonical names of one character are reported but only matched through
+    their aliases. Names and aliases written with a leading ``~`` (skills
+    that are also everyday words, such as ``~Go`` or ``~React``) match only
+    with the case they are written in, so "React, Go" in a skills list is
+    found but "react to feedback" and "go the extra mile" are not.
+    """
+
+    def __init__(self, taxonomy: Mapping[str, Iterable[str]], categories: Optional[Mapping[str, str]] = None):
+        """
+        Build the automaton for a taxonomy.
+
+        Args:
+            taxonomy: Mapping of canonical skill name to its aliases
+            categories: Mapping of skill name to its taxonomy category, if known
+        """
+        self.categories = dict(categories or {})
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per node: (pattern length, canonical name, whether the pattern is an
+        # alias, exact text required for a case-sensitive pattern)
+        self._outputs: List[List[Tuple[int, str, bool, Optional[str]]]] = [[]]
+        self.pattern_count = 0
+
+        for canonical, aliases in taxonomy.items():
+            canonical = _surface_form(canonical)
+            name = _skill_name(canonical)
+            surface_forms = {_surface_form(alias): True for alias in aliases}
+            # Single characters such as "c" or "r" are too ambiguous to match bare
+            if len(name) > 1:
+                # A case-sensitive name is an everyday word; let longer matches cover it
+                surface_forms[canonical] = canonical.startswith(CASE_SENSITIVE_PREFIX)
+            for surface, is_alias in surface_forms.items():
+                self._add_pattern(surface, name, is_alias)
+
+        self._build_failure_links()
+        self.skill_count = len(taxonomy)
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None) -> "SkillMatcher":
+        """Build a matcher from a taxonomy file (defaults to the bundled taxonomy)."""
+        return cls(*_read_taxonomy(path))
+
+    def is_technical(self, skill: str) -> bool:
+        """Return False for skills in NON_TECHNICAL_CATEGORIES, such as agile or pmp."""
+        return self.categories.get(skill) not in NON_TECHNICAL_CATEGORIES
+
+    def _add_pattern(self, pattern: str, canonical: str, is_alias: bool) -> None:
+        """Insert a surface form into the trie."""
+        exact = None
+        if pattern.startswith(CASE_SENSITIVE_PREFIX):
+            exact = pattern[len(CASE_SENSITIVE_PREFIX):].strip()
+            pattern = exact.lower()
+        if not pattern:
+            return
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        self._outputs[node].append((len(pattern), canonical, is_alias, exact))
+        self.pattern_count += 1
+
+    def _build_failure_links(self) -> None:
+        """Compute failure links breadth-first and merge suffix outputs."""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child].extend(self._outputs[self._fail[child]])
+
+    def find(self, text: str) -> List[str]:
+        """
+        Find canonical skills mentioned in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Canonical skill names in order of first appearance
+        """
+        original = _WHITESPACE.sub(" ", text)
+        text = original.lower()
+        # Lowercasing a few non-ASCII characters changes the length; case-sensitive
+        # forms then cannot be checked against the original and do not match
+        cased = original if len(original) == len(text) else None
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        text_length = len(text)
+        matches: List[Tuple[int, int, str, bool]] = []
+        node = 0
+
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not outputs[node]:
+                continue
+
+            end = index + 1
+            if end < text_length and _is_word_char(text[end]) and _is_word_char(char):
+                continue
+            for length, canonical, is_alias, exact in outputs[node]:
+                start = end - length
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                if exact is not None and (cased is None or cased[start:end] != exact):
+                    continue
+                matches.append((start, end, canonical, is_alias))
+
+        # In order of start, longest first: a match is covered when an earlier
+        # one reaches at least as far with a different span
+        matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+        found: Dict[str, None] = {}
+        cover_start = cover_end = -1
+        for start, end, canonical, is_alias in matches:
+            if end > cover_end:
+                cover_start, cover_end = start, end
+            elif is_alias and (start, end) != (cover_start, cover_end):
+                continue
+            found.setdefault(canonical, None)
+
+        return list(found)
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher(path: Optional[str] = None) -> SkillMatcher:
+    """
+    Return the shared skill matcher, building it on first use.
+
+    Args:
+        path: Taxonomy file path (defaults to the configured or bundled taxonomy)
+    """
+    matcher = SkillMatcher.from_file(path or settings.skills_taxonomy_path)
+    logger.info(
+        f"Built skill matcher with {matcher.skill_count} skills "
+        f"({matcher.pattern_count} patterns)"
+    )
+    return matcher
+
+
+def analyze_skill_gap(
+    resume_text: str,
+    job_description: str,
+    skill_matcher: Optional[SkillMatcher] = None,
+    max_focus_areas: Optional[int] = None
+) -> SkillGap:
+    """
+    Compare the skills in a resume with those a job description asks for.
+
+    Focus areas are the job's technical skills the candidate claims (worth
+    probing in depth) followed by the ones the resume lacks, in the order the
+    job description mentions them. Process skills and certifications (see
+    NON_TECHNICAL_CATEGORIES) are reported but never become focus areas.
+
+    Args:
+        resume_text: Resume text
+        job_description: Job description text
+        skill_matcher: Skill matcher to use (defaults to the shared matcher)
+        max_focus_areas: Maximum number of focus areas (defaults to config)
+
+    Returns:
+        SkillGap with the overlap, gaps and derived focus areas
+    """
+    skill_matcher = skill_matcher or get_skill_matcher()
+    max_focus_areas = max_focus_areas or settings.auto_focus_areas_max
+
+    job_skills = skill_matcher.find(job_description)
+    resume_skills = skill_matcher.find(resume_text)
+    resume_set = set(resume_skills)
+    job_set = set(job_skills)
+
+    matched = [skill for skill in job_skills if skill in resume_set]
+    missing = [skill for skill in job_skills if skill not in resume_set]
+    focus_areas = [skill for skill in matched + missing if skill_matcher.is_technical(skill)][:max_focus_areas]
+
+    return SkillGap(
+        job_skills=job_skills,
+        resume_skills=resume_skills,
+        matched_skills=matched,
+        missing_skills=missing,
+        extra_skills=[skill for skill in resume_skills if skill not in job_set],
+        focus_areas=focus_areas,
+        domain=", ".join(focus_areas) or None,
+    )
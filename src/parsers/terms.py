@@ -0,0 +1,49 @@
+"""Hashed term vectors used for match scoring."""
+
+import re
+import zlib
+from collections import Counter
+from typing import TYPE_CHECKING, List, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+# Common words that carry no signal about fit; IDF handles the rest
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the their "
+    "this to was we were will with you your".split()
+)
+
+# Terms are hashed into 2**HASH_BITS columns, so no shared vocabulary has to be built per request
+HASH_BITS = 20
+_HASH_MASK = (1 << HASH_BITS) - 1
+
+# (term column ids, term counts) for one document
+TermVector = Tuple["np.ndarray", "np.ndarray"]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase text and split it into terms, keeping tokens like "c++", "c#" and "node.js"."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def term_vector(text: str) -> TermVector:
+    """
+    Return the sparse term counts of a document as (column ids, counts) arrays.
+
+    Columns are CRC32 hashes of the terms, so vectors computed separately
+    (and cached with the resume) can be stacked without re-tokenizing.
+    """
+    import numpy as np
+
+    counts: dict = {}
+    for term, count in Counter(tokenize(text)).items():
+        column = zlib.crc32(term.encode()) & _HASH_MASK
+        counts[column] = counts.get(column, 0) + count
+    return (
+        np.fromiter(counts.keys(), dtype=np.int64, count=len(counts)),
+        np.fromiter(counts.values(), dtype=np.float64, count=len(counts)),
+    )
@@ -1,5 +1,5 @@
 """Prompts package for interview question generation."""
 
-from .templates import PROMPT_TEMPLATES
+from .templates import FOLLOW_UP_PROMPT, PROMPT_TEMPLATES
 
-__all__ = ['PROMPT_TEMPLATES']
+__all__ = ['FOLLOW_UP_PROMPT', 'PROMPT_TEMPLATES']
@@ -227,6 +227,20 @@ Generate exactly {num_questions} questions."""
 )
 
 
+# Later turns of an interview session; the resume, job description and
+# earlier questions are already in the conversation
+FOLLOW_UP_PROMPT = SimplePromptTemplate(
+    input_variables=["request", "difficulty", "num_questions"],
+    template="""The interviewer asks for more questions: {request}
+
+Build on the candidate resume, the job description and the questions you have already generated.
+Do not repeat earlier questions. Unless the interviewer asks otherwise, keep the difficulty level at {difficulty}.
+
+Format your response as a JSON array with the same structure as before.
+{num_questions}"""
+)
+
+
 # Mapping of round types to prompts
 PROMPT_TEMPLATES = {
     "technical": TECHNICAL_INTERVIEW_PROMPT,
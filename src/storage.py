@@ -0,0 +1,123 @@
+"""Document store for parsed resumes and job descriptions referenced by id."""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+from .cache import TTLCache
+from .config import settings
+from .models import StoredDocument
+
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentStore:
+    """Interface shared by the document store backends."""
+
+    def put(self, document: StoredDocument) -> None:
+        """Store a document, replacing any document with the same id."""
+        raise NotImplementedError
+
+    def get(self, document_id: str) -> Optional[StoredDocument]:
+        """Return a stored document, or None if it is unknown or expired."""
+        raise NotImplementedError
+
+    def delete(self, document_id: str) -> bool:
+        """Delete a document; returns False if there was none."""
+        raise NotImplementedError
+
+
+class MemoryDocumentStore(DocumentStore):
+    """Process-local store; documents are lost on restart."""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            max_entries: Documents kept before the least recently used is evicted (defaults to config)
+            ttl_seconds: Seconds a document lives (defaults to config)
+        """
+        self._documents = TTLCache(
+            max_entries or settings.document_store_max_entries,
+            ttl_seconds or settings.document_ttl_seconds,
+        )
+
+    def put(self, document: StoredDocument) -> None:
+        self._documents.set(document.document_id, document)
+
+    def get(self, document_id: str) -> Optional[StoredDocument]:
+        return self._documents.get(document_id)
+
+    def delete(self, document_id: str) -> bool:
+        return self._documents.pop(document_id) is not None
+
+
+class SQLiteDocumentStore(DocumentStore):
+    """
+    SQLite-backed store that survives restarts and is shared by every
+    process pointing at the same database file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Database file path
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._connection()
+        logger.info(f"Opened document store at {path}")
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not cross a fork; each worker process opens its own
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "document_id TEXT PRIMARY KEY, kind TEXT NOT NULL, body TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS documents_expires_at ON documents (expires_at)")
+            self._pid = os.getpid()
+        return self._conn
+
+    def put(self, document: StoredDocument) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM documents WHERE expires_at <= ?", (time.time(),))
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (document_id, kind, body, expires_at) VALUES (?, ?, ?, ?)",
+                (
+                    document.document_id,
+                    document.kind.value,
+                    document.model_dump_json(),
+                    document.expires_at.timestamp(),
+                ),
+            )
+
+    def get(self, document_id: str) -> Optional[StoredDocument]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT body FROM documents WHERE document_id = ? AND expires_at > ?",
+                (document_id, time.time()),
+            ).fetchone()
+        return StoredDocument.model_validate_json(row[0]) if row else None
+
+    def delete(self, document_id: str) -> bool:
+        with self._lock:
+            cursor = self._connection().execute("DELETE FROM documents WHERE document_id = ?", (document_id,))
+        return cursor.rowcount > 0
+
+
+@lru_cache(maxsize=None)
+def get_document_store() -> DocumentStore:
+    """Return the configured document store: SQLite when a path is set, in-memory otherwise."""
+    if settings.document_store_path:
+        return SQLiteDocumentStore(settings.document_store_path)
+    return MemoryDocumentStore()
@@ -1,5 +1,83 @@
 // Enhanced JavaScript functionality for Interview Assistant
 
+// Ids of documents the server has already parsed, so regenerating with new
+// settings sends ids instead of re-uploading unchanged files
+const documentIds = {
+    entries: {},
+
+    fileKey(input) {
+        const file = input && input.files && input.files[0];
+        return file ? `${file.name}:${file.size}:${file.lastModified}` : null;
+    },
+
+    jobDescriptionKey(form) {
+        const fileKey = this.fileKey(form.querySelector('#job_description_file'));
+        if (fileKey) return `file:${fileKey}`;
+        const text = form.querySelector('#job_description');
+        return text && text.value.trim() ? `text:${text.value.trim()}` : null;
+    },
+
+    // Swap unchanged documents in the form data for their ids; returns true if any were swapped
+    apply(form, formData) {
+        let used = false;
+        const resume = this.entries.resume;
+        if (resume && resume.key === this.fileKey(form.querySelector('#resume'))) {
+            formData.delete('resume');
+            formData.set('resume_id', resume.id);
+            used = true;
+        }
+        const jobDescription = this.entries.jobDescription;
+        if (jobDescription && jobDescription.key === this.jobDescriptionKey(form)) {
+            formData.delete('job_description');
+            formData.delete('job_description_file');
+            formData.set('job_description_id', jobDescription.id);
+            used = true;
+        }
+        return used;
+    },
+
+    remember(form, metadata) {
+        if (!metadata) return;
+        const resumeKey = this.fileKey(form.querySelector('#resume'));
+        if (metadata.resume && resumeKey) {
+            // Document mode reports a document_id instead, which is not a resume id:
+            // the original file has to be sent again, so nothing is remembered for it
+            const resumeId = metadata.resume.resume_id;
+            if (resumeId) {
+                this.entries.resume = { key: resumeKey, id: resumeId };
+            } else {
+                delete this.entries.resume;
+            }
+        }
+        const jobDescriptionKey = this.jobDescriptionKey(form);
+        if (metadata.job_description_id && jobDescriptionKey) {
+            this.entries.jobDescription = { key: jobDescriptionKey, id: metadata.job_description_id };
+        }
+    },
+
+    clear() {
+        this.entries = {};
+    }
+};
+
+async function postGenerationForm(form) {
+    const formData = new FormData(form);
+    const usedIds = documentIds.apply(form, formData);
+    let response = await fetch('/api/v1/generate-questions', {
+        method: 'POST',
+        body: formData
+    });
+    // Stored documents expire; fall back to a full upload once
+    if (response.status === 404 && usedIds) {
+        documentIds.clear();
+        response = await fetch('/api/v1/generate-questions', {
+            method: 'POST',
+            body: new FormData(form)
+        });
+    }
+    return response;
+}
+
 class InterviewAssistant {
     constructor() {
         this.init();
@@ -390,8 +468,6 @@ class InterviewAssistant {
         this.showLoading();
         
         try {
-            const formData = new FormData(form);
-            
             // Add progress indicator
             const progressSteps = [
                 'Uploading resume...',
@@ -403,10 +479,7 @@ class InterviewAssistant {
             
             this.showProgressSteps(progressSteps);
             
-            const response = await fetch('/api/v1/generate-questions', {
-                method: 'POST',
-                body: formData
-            });
+            const response = await postGenerationForm(form);
 
             if (!response.ok) {
                 const errorData = await response.json();
@@ -414,6 +487,7 @@ class InterviewAssistant {
             }
 
             const result = await response.json();
+            documentIds.remember(form, result.metadata);
             this.displayQuestions(result);
             this.showToast('Questions generated successfully!', 'success');
             
@@ -0,0 +1,65 @@
+"""Shared fixtures for the Interview Assistant tests."""
+
+import pytest
+
+
+def build_pdf(pages):
+    """Build a minimal multi-page PDF with one line of text per entry in ``pages``."""
+    page_objects = []
+    kids = []
+    next_id = 4
+    for text in pages:
+        content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
+        page_objects.append(
+            (content_id, b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        )
+        page_objects.append((page_id, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode()))
+        kids.append(f"{page_id} 0 R")
+
+    objects = [
+        (1, b"<< /Type /Catalog /Pages 2 0 R >>"),
+        (2, f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()),
+        (3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"),
+    ] + page_objects
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for obj_id, body in objects:
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % obj_id + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref
+    )
+    return bytes(out)
+
+
+@pytest.fixture
+def make_pdf():
+    """Factory fixture returning PDF bytes for a list of page texts."""
+    return build_pdf
+
+
+@pytest.fixture
+def make_docx():
+    """Factory fixture returning DOCX bytes for a list of paragraphs."""
+    def build(paragraphs):
+        import io
+        from docx import Document
+
+        doc = Document()
+        for paragraph in paragraphs:
+            doc.add_paragraph(paragraph)
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+
+    return build
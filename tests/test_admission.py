@@ -0,0 +1,120 @@
+"""Tests for admission control."""
+
+import asyncio
+
+import pytest
+
+from src.api.admission import (
+    AdmissionControl,
+    AdmissionControlMiddleware,
+    AdmissionRejected,
+    ConcurrencyLimiter,
+)
+
+
+def test_limiter_rejects_when_queue_full_or_wait_expires():
+    """Test that a full queue is rejected at once and a queued request gives up after its wait."""
+    async def scenario():
+        limiter = ConcurrencyLimiter("test", limit=1, max_queue=1, max_wait_seconds=0.05)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.stats()["queued"] == 1
+        assert limiter.saturation() == 2.0
+
+        with pytest.raises(AdmissionRejected) as full:
+            await limiter.acquire()
+        with pytest.raises(AdmissionRejected) as timeout:
+            await waiter
+        return limiter, full.value, timeout.value
+
+    limiter, full, timeout = asyncio.run(scenario())
+
+    assert full.reason == "queue_full"
+    assert timeout.reason == "queue_timeout"
+    assert limiter.stats() == {"active": 1, "queued": 0, "limit": 1, "max_queue": 1, "saturation": 1.0}
+
+
+def test_limiter_hands_slots_to_waiters_in_order():
+    """Test that a released slot goes to the longest waiter without exceeding the limit."""
+    async def scenario():
+        limiter = ConcurrencyLimiter("test", limit=1, max_queue=5, max_wait_seconds=5)
+        admitted = []
+
+        async def request(name):
+            await limiter.acquire()
+            admitted.append(name)
+            await asyncio.sleep(0.01)
+            limiter.release()
+
+        await limiter.acquire()
+        tasks = [asyncio.ensure_future(request(name)) for name in "abc"]
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*tasks)
+        return limiter, admitted
+
+    limiter, admitted = asyncio.run(scenario())
+
+    assert admitted == ["a", "b", "c"]
+    assert limiter.active == 0 and limiter.queued == 0
+
+
+def test_middleware_sheds_load_with_retry_after():
+    """Test that a saturated route is answered with 503 and Retry-After, while other paths pass."""
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def call(middleware, path):
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "POST", "path": path, "headers": []}
+        await middleware(scope, None, send)
+        return messages[0]
+
+    async def scenario():
+        admission = AdmissionControl(
+            max_concurrent=10,
+            route_limits={"/api/v1/parse-resumes": 1},
+            max_queue=0,
+            max_queue_seconds=1,
+            retry_after_seconds=7
+        )
+        middleware = AdmissionControlMiddleware(app, admission=admission)
+        held = await admission.acquire("/api/v1/parse-resumes")
+        results = (
+            await call(middleware, "/api/v1/parse-resumes"),
+            await call(middleware, "/api/v1/generate-questions"),
+            await call(middleware, "/health"),
+        )
+        admission.release(held)
+        return admission, results
+
+    admission, (rejected, other_route, health) = asyncio.run(scenario())
+
+    assert rejected["status"] == 503
+    assert (b"retry-after", b"7") in rejected["headers"]
+    assert other_route["status"] == 200
+    assert health["status"] == 200
+    # Neither the rejected nor the admitted requests left a slot held
+    assert admission.stats()["global"]["active"] == 0
+
+
+def test_limits_are_split_between_worker_processes():
+    """Test that each worker process enforces its share of the server-wide limits, rounded up."""
+    admission = AdmissionControl(
+        max_concurrent=64,
+        route_limits={"/api/v1/parse-resumes": 4, "/api/v1/match-resumes": 3},
+        max_queue=10,
+        processes=4
+    )
+    stats = admission.stats()
+
+    assert stats["global"]["limit"] == 16
+    assert stats["global"]["max_queue"] == 3
+    assert stats["/api/v1/parse-resumes"]["limit"] == 1
+    assert stats["/api/v1/match-resumes"]["limit"] == 1
@@ -0,0 +1,54 @@
+"""Tests for the interview agent's document mode, using the local backend."""
+
+from src.agent import InterviewQuestionAgent
+from src.config import settings
+from src.models import RoundType
+
+
+RESUME = b"Jordan Lee\njordan@example.com\nBuilt streaming pipelines with Apache Kafka and Spark."
+
+
+def test_document_upload_reused_by_content_hash(monkeypatch):
+    """Test that a resume document is uploaded once and its file handle reused."""
+    monkeypatch.setattr(settings, "gemini_inline_max_bytes", 0)
+    agent = InterviewQuestionAgent(api_key="test-reuse", backend="local")
+    uploads_before = agent.client.files.upload_count
+
+    responses = [
+        agent.generate_questions(
+            resume_text="",
+            job_description="Streaming data engineer",
+            round_type=RoundType.TECHNICAL,
+            num_questions=3,
+            resume_document=RESUME,
+            resume_mime_type="text/plain",
+        )
+        for _ in range(2)
+    ]
+
+    assert agent.client.files.upload_count == uploads_before + 1
+    assert responses[0].metadata["resume_document"]["reused_upload"] is False
+    assert responses[1].metadata["resume_document"]["reused_upload"] is True
+    # The local backend read the uploaded document, not extracted resume text
+    assert responses[0].total_questions == 3
+    assert "apache kafka" in responses[0].questions[0].expected_topics
+
+
+def test_small_document_sent_inline(monkeypatch):
+    """Test that documents under the inline limit are not uploaded."""
+    monkeypatch.setattr(settings, "gemini_inline_max_bytes", 1024 * 1024)
+    agent = InterviewQuestionAgent(api_key="test-inline", backend="local")
+    uploads_before = agent.client.files.upload_count
+
+    response = agent.generate_questions(
+        resume_text="",
+        job_description="Streaming data engineer",
+        round_type=RoundType.TECHNICAL,
+        num_questions=2,
+        resume_document=RESUME,
+        resume_mime_type="text/plain",
+    )
+
+    assert agent.client.files.upload_count == uploads_before
+    assert response.metadata["resume_document"]["transport"] == "inline"
+    assert response.total_questions == 2
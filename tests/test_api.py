@@ -0,0 +1,639 @@
+"""Tests for the REST API endpoints."""
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from src.api.main import admission, app
+from src.config import settings
+
+
+@pytest.fixture
+def client():
+    """Test client for the FastAPI app."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def fake_agent(monkeypatch):
+    """Replace the Gemini agent with a stub; returns the list of generate_questions calls."""
+    from src.api import main
+    from src.models import DifficultyLevel, QuestionGenerationResponse, RoundType
+
+    calls = []
+
+    class FakeAgent:
+        def __init__(self, api_key=None):
+            pass
+
+        def generate_questions(self, **kwargs):
+            calls.append(kwargs)
+            return QuestionGenerationResponse(
+                questions=[], total_questions=0,
+                round_type=RoundType.TECHNICAL, difficulty=DifficultyLevel.INTERMEDIATE
+            )
+
+    monkeypatch.setattr(main, "InterviewQuestionAgent", FakeAgent)
+    return calls
+
+
+def test_parse_resume_from_spooled_upload(client):
+    """Test that a resume upload is parsed from the spooled file."""
+    response = client.post(
+        "/api/v1/parse-resume",
+        files={"resume": ("resume.txt", b"Jane Doe\njane@example.com\nPython\n", "text/plain")},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "jane@example.com"
+
+
+def test_parsed_resume_id_resolves_without_local_cache(client):
+    """Test that a resume_id from a parse resolves through the document store, as in another worker."""
+    from src.cache import get_resume_cache
+
+    response = client.post(
+        "/api/v1/parse-resume",
+        files={"resume": ("resume.txt", b"Noa Kim\nnoa@example.com\nRust and Kafka\n", "text/plain")},
+    )
+    resume_id = response.json()["cache"]["resume_id"]
+    get_resume_cache.cache_clear()
+
+    document = client.get(f"/api/v1/documents/{resume_id}")
+
+    assert document.status_code == 200
+    assert document.json()["resume"]["email"] == "noa@example.com"
+
+
+def test_large_upload_reaches_parse_worker_as_path(client, monkeypatch):
+    """Test that an upload past the spool threshold is parsed from its temp file, not copied bytes."""
+    from src.parsers import get_parse_pool
+
+    monkeypatch.setattr(settings, "upload_spool_memory_bytes", 64)
+    pool = get_parse_pool()
+    sources = []
+    parse = pool.parse
+
+    async def recording_parse(source, file_name=None):
+        sources.append(source)
+        return await parse(source, file_name)
+
+    monkeypatch.setattr(pool, "parse", recording_parse)
+    body = b"Sam Roe\nsam@example.com\n" + b"Python and PostgreSQL engineer.\n" * 20
+
+    response = client.post("/api/v1/parse-resume", files={"resume": ("resume.txt", body, "text/plain")})
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "sam@example.com"
+    assert len(sources) == 1 and isinstance(sources[0], str)
+
+
+def test_oversized_upload_rejected(client, monkeypatch):
+    """Test that uploads above the size cap are rejected with 413."""
+    monkeypatch.setattr(settings, "upload_max_bytes", 1024)
+
+    response = client.post(
+        "/api/v1/parse-resume",
+        files={"resume": ("resume.txt", b"x" * 4096, "text/plain")},
+    )
+
+    assert response.status_code == 413
+
+
+def test_oversized_request_body_rejected(client, monkeypatch):
+    """Test that request bodies above the cap are refused before parsing."""
+    monkeypatch.setattr(settings, "upload_max_request_bytes", 2048)
+
+    response = client.post(
+        "/api/v1/parse-resume",
+        files={"resume": ("resume.txt", b"x" * 4096, "text/plain")},
+    )
+
+    assert response.status_code == 413
+
+
+def test_bulk_parse_streams_ndjson(client, make_docx):
+    """Test that bulk parsing streams one record per resume, including zip members."""
+    import io
+    import json
+    import zipfile
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.txt", "Ana Lima\nana@example.com\n")
+        zf.writestr("b.docx", make_docx(["Bo Chen", "bo@example.com"]))
+
+    response = client.post(
+        "/api/v1/parse-resumes",
+        files=[
+            ("resumes", ("jane.txt", b"Jane Doe\njane@example.com\n", "text/plain")),
+            ("resumes", ("empty.txt", b"   ", "text/plain")),
+            ("resumes", ("batch.zip", archive.getvalue(), "application/zip")),
+        ],
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = sorted(
+        (json.loads(line) for line in response.text.splitlines()), key=lambda r: r["index"]
+    )
+    assert [r["status"] for r in records] == ["ok", "error", "ok", "ok"]
+    assert records[0]["resume"]["email"] == "jane@example.com"
+    assert records[2]["file_name"] == "batch.zip/a.txt"
+    assert records[3]["resume"]["email"] == "bo@example.com"
+
+
+def test_parse_over_budget_returns_422(client, monkeypatch):
+    """Test that a parse killed by the watchdog is reported as 422."""
+    from src.api import main
+    from src.parsers import ParseBudgetExceededError
+
+    async def killed(data, file_name=None):
+        raise ParseBudgetExceededError("Document parsing exceeded the 45.0s time limit")
+
+    monkeypatch.setattr(main.parse_pool, "parse", killed)
+    response = client.post(
+        "/api/v1/parse-resume",
+        files={"resume": ("resume.pdf", b"%PDF-1.7 ...", "application/pdf")},
+    )
+
+    assert response.status_code == 422
+    assert "time limit" in response.json()["detail"]
+    assert "killed_parses" in client.get("/health").json()["parse_pool"]
+
+
+def test_generation_reused_for_near_duplicate_resume(client, fake_agent):
+    """Test that a re-exported resume reuses the earlier parse and generated questions."""
+    lines = ["Sam Park", "sam@example.com", "Experience"]
+    lines += [f"- Built data pipeline {i} in Spark and Airflow serving {i * 10} teams." for i in range(30)]
+    original = "\n".join(lines).encode()
+    reexported = original + b"\n"
+
+    responses = [
+        client.post(
+            "/api/v1/generate-questions",
+            files={"resume": ("resume.txt", content, "text/plain")},
+            data={"job_description": "Data engineer", "round_type": "technical", "api_key": "test"},
+        ).json()
+        for content in (original, reexported)
+    ]
+
+    assert len(fake_agent) == 1
+    assert responses[1]["metadata"]["cached_generation"] is True
+    assert responses[1]["metadata"]["resume"]["reused_parse"] is True
+    assert responses[1]["metadata"]["resume"]["resume_id"] == responses[0]["metadata"]["resume"]["resume_id"]
+
+
+def test_match_resumes_ranks_uploads(client):
+    """Test that uploaded resumes are ranked against the job description."""
+    response = client.post(
+        "/api/v1/match-resumes",
+        files=[
+            ("resumes", ("chef.txt", b"Sam Lee\nPastry chef and bakery manager\n", "text/plain")),
+            ("resumes", ("dev.txt", b"Ada Park\nGo and Kubernetes platform engineer\n", "text/plain")),
+            ("resumes", ("bad.txt", b"\x00\x01binary", "text/plain")),
+        ],
+        data={"job_description": "Platform engineer: Kubernetes, Go"},
+    )
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["matches"][0]["file_name"] == "dev.txt"
+    assert body["matches"][0]["index"] == 1
+    assert body["errors"][0]["file_name"] == "bad.txt"
+
+
+def test_registered_job_description_referenced_by_id(client, fake_agent):
+    """Test that a registered JD is sent as its digest when referenced by id."""
+    jd = (
+        "Platform Engineer\n"
+        "Responsibilities\n"
+        "- Run Kubernetes clusters with Terraform\n"
+        "Benefits\n"
+        "- Free lunch, a gym membership and a very long list of other perks we offer\n"
+    ).encode()
+
+    registered = client.post(
+        "/api/v1/job-descriptions",
+        files={"job_description_file": ("jd.txt", jd, "text/plain")},
+    ).json()
+    response = client.post(
+        "/api/v1/generate-questions",
+        files={"resume": ("resume.txt", b"Ana Lima\nana@example.com\nTerraform\n", "text/plain")},
+        data={
+            "job_description_id": registered["job_description_id"],
+            "round_type": "technical",
+            "api_key": "test",
+        },
+    )
+
+    assert registered["title"] == "Platform Engineer"
+    assert response.status_code == 200
+    assert fake_agent[0]["job_description"] == registered["text"]
+    assert "perks" not in registered["text"]
+    assert response.json()["metadata"]["job_description_id"] == registered["job_description_id"]
+    assert client.get("/api/v1/job-descriptions/jd_unknown").status_code == 404
+
+
+def test_generation_from_stored_documents(client, fake_agent):
+    """Test that stored documents are referenced by id without re-uploading."""
+    resume = client.post(
+        "/api/v1/documents",
+        data={"kind": "resume", "text": "Lee Chen\nlee@example.com\nRust and Go developer\n"},
+    )
+    jd = client.post(
+        "/api/v1/documents",
+        data={"kind": "job_description", "text": "Systems engineer working in Rust"},
+    )
+    resume_id = resume.json()["document_id"]
+
+    response = client.post(
+        "/api/v1/generate-questions",
+        data={
+            "resume_id": resume_id,
+            "job_description_id": jd.json()["document_id"],
+            "round_type": "technical",
+            "api_key": "test",
+        },
+    )
+
+    assert resume.status_code == 201
+    assert resume.json()["resume"]["email"] == "lee@example.com"
+    assert response.status_code == 200
+    assert "Lee Chen" in fake_agent[0]["resume_text"]
+    assert fake_agent[0]["job_description"] == "Systems engineer working in Rust"
+    assert client.delete(f"/api/v1/documents/{resume_id}").status_code == 204
+    assert client.get(f"/api/v1/documents/{resume_id}").status_code == 404
+
+
+def test_generate_questions_in_document_mode(client, monkeypatch):
+    """Test that document mode sends the upload to the model without parsing it."""
+    from src.api import main
+
+    async def fail_parse(*args, **kwargs):
+        raise AssertionError("resume should not be parsed in document mode")
+
+    monkeypatch.setattr(settings, "gemini_backend", "local")
+    monkeypatch.setattr(main, "load_resume", fail_parse)
+
+    response = client.post(
+        "/api/v1/generate-questions",
+        files={"resume": ("resume.txt", b"Riley Chen\nBuilt ETL jobs in Apache Airflow.", "text/plain")},
+        data={
+            "job_description": "Workflow engineer",
+            "round_type": "technical",
+            "num_questions": "2",
+            "resume_mode": "document",
+            "api_key": "test",
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_questions"] == 2
+    assert body["metadata"]["resume_mode"] == "document"
+    assert body["metadata"]["resume"]["document_id"].startswith("doc_")
+
+
+def test_document_mode_parses_docx_locally(client, fake_agent, make_docx):
+    """Test that DOCX uploads fall back to local parsing in document mode."""
+    response = client.post(
+        "/api/v1/generate-questions",
+        files={"resume": ("resume.docx", make_docx(["Riley Chen", "Python developer"]), "application/octet-stream")},
+        data={"job_description": "Python developer", "round_type": "technical", "resume_mode": "document", "api_key": "test"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["metadata"]["resume_mode"] == "text"
+    assert fake_agent[0]["resume_document"] is None
+    assert "Python developer" in fake_agent[0]["resume_text"]
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [("gzip", "gzip"), ("br, gzip", "br"), ("br;q=0, gzip", "gzip")])
+def test_large_responses_are_compressed(client, monkeypatch, accept_encoding, expected):
+    """Test that JSON responses above the size threshold are compressed as negotiated."""
+    monkeypatch.setattr(settings, "gemini_backend", "local")
+    response = client.post(
+        "/api/v1/generate-questions",
+        files={"resume": ("resume.txt", b"Casey Diaz\nPython and Kubernetes engineer", "text/plain")},
+        data={"job_description": "Platform engineer", "round_type": "technical", "num_questions": "20", "api_key": "test"},
+        headers={"Accept-Encoding": accept_encoding},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == expected
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json()["total_questions"] == 20
+
+
+def test_small_responses_are_not_compressed(client):
+    """Test that responses under the threshold are sent as is."""
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_streamed_ndjson_is_compressed(client):
+    """Test that streamed bulk results are compressed and still decode line by line."""
+    response = client.post(
+        "/api/v1/parse-resumes",
+        files=[("resumes", (f"r{i}.txt", f"Candidate {i}\nPython developer".encode(), "text/plain")) for i in range(3)],
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.text.strip().splitlines()) == 3
+
+
+def test_results_served_with_etag_and_304(client, fake_agent):
+    """Test that a generation result can be fetched by id and revalidated with If-None-Match."""
+    data = {"job_description": "Backend engineer", "round_type": "technical", "api_key": "test"}
+    files = {"resume": ("resume.txt", b"Morgan Blake\nGo and Postgres engineer", "text/plain")}
+    first = client.post("/api/v1/generate-questions", files=files, data=data).json()
+    again = client.post("/api/v1/generate-questions", files=files, data=data).json()
+    result_id = first["metadata"]["result_id"]
+
+    response = client.get(f"/api/v1/results/{result_id}")
+    etag = response.headers["etag"]
+    revalidated = client.get(f"/api/v1/results/{result_id}", headers={"If-None-Match": etag})
+    weak = client.get(f"/api/v1/results/{result_id}", headers={"If-None-Match": f"W/{etag}"})
+
+    assert again["metadata"]["result_id"] == result_id
+    assert len(fake_agent) == 1
+    assert response.status_code == 200
+    assert response.json()["metadata"]["result_id"] == result_id
+    assert not etag.startswith("W/")
+    assert "max-age" in response.headers["cache-control"]
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    assert weak.status_code == 304
+    assert client.get("/api/v1/results/res_unknown").status_code == 404
+
+
+def test_compressed_results_keep_strong_etags(client, fake_agent, monkeypatch):
+    """Test that each content encoding of a result gets its own strong ETag and revalidates."""
+    monkeypatch.setattr(settings, "compression_minimum_bytes", 0)
+    files = {"resume": ("resume.txt", b"Riley Chen\nRust and Kafka engineer", "text/plain")}
+    data = {"job_description": "Streaming engineer", "round_type": "technical", "api_key": "test"}
+    result_id = client.post("/api/v1/generate-questions", files=files, data=data).json()["metadata"]["result_id"]
+    url = f"/api/v1/results/{result_id}"
+
+    responses = {
+        encoding: client.get(url, headers={"Accept-Encoding": encoding})
+        for encoding in ("br", "gzip", "identity")
+    }
+    tags = {encoding: response.headers["etag"] for encoding, response in responses.items()}
+    revalidated = client.get(url, headers={"Accept-Encoding": "br", "If-None-Match": tags["br"]})
+    mismatched = client.get(url, headers={"Accept-Encoding": "br", "If-None-Match": tags["gzip"]})
+
+    assert responses["br"].headers["content-encoding"] == "br"
+    assert responses["gzip"].headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in responses["identity"].headers
+    assert not any(tag.startswith("W/") for tag in tags.values())
+    assert len(set(tags.values())) == 3
+    assert tags["br"].endswith('-br"')
+    assert responses["br"].json()["metadata"]["result_id"] == result_id
+    assert revalidated.status_code == 304 and revalidated.headers["etag"] == tags["br"]
+    assert mismatched.status_code == 200
+
+
+def test_metrics_include_worker_parse_stages(client):
+    """Test that /metrics exposes parse stages recorded in worker processes and templated routes."""
+    client.post("/api/v1/parse-resume", files={"resume": ("r.txt", b"Ana Ruiz\nPython developer", "text/plain")})
+    client.get("/api/v1/results/res_missing")
+
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'stage="parse_extract",round_type="",format="txt"' in response.text
+    assert 'route="/api/v1/results/{result_id}",method="GET",status="404"' in response.text
+    assert "interview_parse_pool_killed_total" in response.text
+
+
+def test_generation_reports_stage_timings(client, monkeypatch):
+    """Test that generation responses carry a Server-Timing header and a timings breakdown."""
+    monkeypatch.setattr(settings, "gemini_backend", "local")
+    response = client.post(
+        "/api/v1/generate-questions",
+        files={"resume": ("resume.txt", b"Jamie Fox\nRust and WebAssembly developer", "text/plain")},
+        data={"job_description": "Systems engineer", "round_type": "technical", "num_questions": "2", "api_key": "test"},
+    )
+
+    timings = response.json()["metadata"]["timings"]
+    server_timing = response.headers["server-timing"]
+
+    for stage in ("upload_read", "resume_parse", "parse_extract", "prompt_format", "gemini_call", "parse_questions"):
+        assert stage in timings["stages_ms"]
+        assert f"{stage};dur=" in server_timing
+    assert timings["cache"]["generation"] == "miss"
+    assert 'cache-generation;desc="miss"' in server_timing
+    assert "total;dur=" in server_timing
+
+
+def test_idempotency_key_replays_response(client, fake_agent):
+    """Test that a retried Idempotency-Key returns the first response and rejects a different body."""
+    data = {"job_description": "Data engineer", "round_type": "technical", "api_key": "test"}
+    files = {"resume": ("resume.txt", b"Riley Chen\nSpark and Airflow engineer", "text/plain")}
+    headers = {"Idempotency-Key": "retry-test-1"}
+
+    first = client.post("/api/v1/generate-questions", files=files, data=data, headers=headers)
+    retry = client.post("/api/v1/generate-questions", files=files, data=data, headers=headers)
+    changed = client.post(
+        "/api/v1/generate-questions", files=files, data={**data, "num_questions": "3"}, headers=headers
+    )
+    other_caller = client.post(
+        "/api/v1/generate-questions", files=files, data={**data, "api_key": "other"}, headers=headers
+    )
+
+    assert first.status_code == 200
+    assert "idempotent-replayed" not in first.headers
+    assert retry.status_code == 200
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    assert changed.status_code == 409
+    assert other_caller.status_code == 200
+    assert "idempotent-replayed" not in other_caller.headers
+    assert len(fake_agent) == 1
+
+
+def test_idempotency_key_released_after_failure(client, fake_agent, monkeypatch):
+    """Test that a failed generation does not pin its Idempotency-Key."""
+    from src.api import main
+    from src.agent import InterviewAgentError
+
+    class FailingAgent:
+        def __init__(self, api_key=None):
+            pass
+
+        def generate_questions(self, **kwargs):
+            raise InterviewAgentError("upstream unavailable")
+
+    data = {"job_description": "Platform engineer", "round_type": "technical", "api_key": "test"}
+    files = {"resume": ("resume.txt", b"Sam Ortiz\nKubernetes and Terraform engineer", "text/plain")}
+    headers = {"Idempotency-Key": "retry-test-2"}
+
+    with monkeypatch.context() as patch:
+        patch.setattr(main, "InterviewQuestionAgent", FailingAgent)
+        failed = client.post("/api/v1/generate-questions", files=files, data=data, headers=headers)
+    retried = client.post("/api/v1/generate-questions", files=files, data=data, headers=headers)
+    replayed = client.post("/api/v1/generate-questions", files=files, data=data, headers=headers)
+
+    assert failed.status_code == 500
+    assert retried.status_code == 200
+    assert "idempotent-replayed" not in retried.headers
+    assert replayed.headers["idempotent-replayed"] == "true"
+    assert replayed.json()["metadata"]["result_id"] == retried.json()["metadata"]["result_id"]
+    assert len(fake_agent) == 1
+
+
+def test_slow_generation_does_not_block_health(monkeypatch):
+    """Test that a blocking Gemini call runs off the event loop, so /health answers meanwhile."""
+    import asyncio
+    import threading
+
+    import httpx
+
+    from src.api import main
+    from src.models import DifficultyLevel, QuestionGenerationResponse, RoundType
+
+    started, release = threading.Event(), threading.Event()
+    order = []
+
+    class SlowAgent:
+        def __init__(self, api_key=None):
+            pass
+
+        def generate_questions(self, **kwargs):
+            started.set()
+            release.wait(timeout=5)
+            order.append("generated")
+            return QuestionGenerationResponse(
+                questions=[], total_questions=0,
+                round_type=RoundType.TECHNICAL, difficulty=DifficultyLevel.INTERMEDIATE
+            )
+
+    monkeypatch.setattr(main, "InterviewQuestionAgent", SlowAgent)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            generation = asyncio.ensure_future(http.post(
+                "/api/v1/generate-questions",
+                files={"resume": ("resume.txt", b"Slow Agent\nPython developer", "text/plain")},
+                data={"job_description": "Slow backend role", "round_type": "technical", "api_key": "test"},
+            ))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            health = await http.get("/health")
+            order.append("health")
+            release.set()
+            return health, await generation
+
+    health, generation = asyncio.run(scenario())
+
+    assert health.status_code == 200
+    assert generation.status_code == 200
+    assert order == ["health", "generated"]
+
+
+def test_interview_session_streams_follow_ups(client, monkeypatch):
+    """Test that a WebSocket session answers follow-ups sent without the resume or job description."""
+    monkeypatch.setattr(settings, "gemini_backend", "local")
+
+    def receive_turn(ws):
+        deltas = []
+        while True:
+            message = ws.receive_json()
+            if message["type"] != "delta":
+                return "".join(deltas), message
+            deltas.append(message["text"])
+
+    with client.websocket_connect("/api/v1/sessions") as ws:
+        ws.send_json({"type": "follow_up", "message": "more please"})
+        early = ws.receive_json()
+        ws.send_json({
+            "type": "start", "api_key": "test", "round_type": "technical", "num_questions": 2,
+            "resume_text": "Dana Reyes\nPython and Docker developer", "job_description": "Backend engineer",
+        })
+        first_text, first = receive_turn(ws)
+        ws.send_json({"type": "follow_up", "message": "give me 3 more on Kubernetes", "num_questions": 3})
+        _, follow_up = receive_turn(ws)
+        ws.send_json({"type": "end"})
+
+    assert early["type"] == "error"
+    assert first["type"] == "questions" and first["turn"] == 1
+    assert first_text.startswith("[")
+    assert first["total_questions"] == 2
+    assert follow_up["turn"] == 2
+    assert follow_up["total_questions"] == 3
+    assert follow_up["metadata"]["session_questions"] == 5
+    assert "kubernetes" in follow_up["questions"][0]["expected_topics"]
+
+
+def test_interview_session_limits(client, monkeypatch):
+    """Test that session turns pass admission control and sessions close when idle or out of turns."""
+    monkeypatch.setattr(settings, "gemini_backend", "local")
+    monkeypatch.setattr(settings, "session_max_turns", 1)
+    start = {
+        "type": "start", "api_key": "test", "round_type": "technical", "num_questions": 1,
+        "resume_text": "Dana Reyes\nPython developer", "job_description": "Backend engineer",
+    }
+
+    def receive_until_questions(ws):
+        while True:
+            message = ws.receive_json()
+            if message["type"] != "delta":
+                return message
+
+    limiter = admission.global_limiter
+    with client.websocket_connect("/api/v1/sessions") as ws:
+        monkeypatch.setattr(limiter, "active", limiter.limit)
+        monkeypatch.setattr(limiter, "max_queue", 0)
+        ws.send_json(start)
+        shed = ws.receive_json()
+        monkeypatch.setattr(limiter, "active", 0)
+
+        ws.send_json(start)
+        first = receive_until_questions(ws)
+        ws.send_json({"type": "follow_up", "message": "one more"})
+        with pytest.raises(WebSocketDisconnect) as too_many:
+            ws.receive_json()
+
+    monkeypatch.setattr(settings, "session_idle_timeout_seconds", 0.05)
+    with client.websocket_connect("/api/v1/sessions") as ws:
+        with pytest.raises(WebSocketDisconnect) as idle:
+            ws.receive_json()
+
+    assert shed["type"] == "error" and "capacity" in shed["detail"]
+    assert first["type"] == "questions"
+    assert too_many.value.code == 1008
+    assert idle.value.code == 1000
+    assert limiter.active == 0
+
+
+def test_static_assets_fingerprinted_and_precompressed(client):
+    """Test that pages link fingerprinted assets served precompressed with immutable caching."""
+    import re
+
+    page = client.get("/")
+    script_url = re.search(r'src="(/static/js/app\.[0-9a-f]{12}\.js)"', page.text).group(1)
+
+    brotli = client.get(script_url, headers={"Accept-Encoding": "br"})
+    gzipped = client.get(script_url, headers={"Accept-Encoding": "gzip"})
+    plain = client.get(script_url, headers={"Accept-Encoding": "identity"})
+    revalidated = client.get(script_url, headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]})
+    original = client.get("/static/js/app.js", headers={"Accept-Encoding": "identity"})
+
+    assert page.status_code == 200
+    assert 'href="/static/css/custom.' in page.text
+    assert brotli.headers["content-encoding"] == "br"
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert brotli.content == gzipped.content == plain.content
+    assert int(brotli.headers["content-length"]) < len(plain.content)
+    assert "immutable" in plain.headers["cache-control"]
+    assert "Accept-Encoding" in plain.headers["vary"]
+    assert revalidated.status_code == 304
+    assert original.content == plain.content
+    assert original.headers["cache-control"] == "no-cache"
+    assert client.get("/static/js/missing.js").status_code == 404
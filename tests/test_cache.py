@@ -0,0 +1,130 @@
+"""Tests for the resume and generation caches."""
+
+import time
+
+from src.cache import ResumeCache, SQLiteCache, TTLCache, content_hash
+from src.models import ResumeData
+from src.parsers import hamming_distance, simhash
+
+
+def _resume_text(phone="555-123-4567"):
+    lines = ["Jane Doe", f"jane@example.com | {phone}", "Summary", "Backend engineer building payment platforms."]
+    lines += [
+        f"- Led project {i}: migrated service {i} to Kubernetes, cutting latency by {i * 3}%."
+        for i in range(25)
+    ]
+    return "\n".join(lines)
+
+
+def test_simhash_separates_near_and_unrelated_documents():
+    """Test that small edits move the fingerprint a few bits and unrelated text many."""
+    original = simhash(_resume_text())
+
+    assert hamming_distance(original, simhash(_resume_text(phone="555-987-6543"))) <= 3
+    assert hamming_distance(original, simhash("Completely different document about gardening " * 20)) > 10
+
+
+def test_resume_cache_reuses_near_duplicates():
+    """Test exact-content hits and near-duplicate mapping onto the first parse."""
+    cache = ResumeCache(max_distance=3, max_entries=10, ttl_seconds=60)
+    first = ResumeData(raw_text=_resume_text())
+    edited = ResumeData(raw_text=_resume_text(phone="555-987-6543"))
+
+    added = cache.add(content_hash(b"v1"), first)
+    duplicate = cache.add(content_hash(b"v2"), edited)
+
+    assert not added.reused
+    assert duplicate.reused and duplicate.resume_id == added.resume_id
+    assert duplicate.resume.raw_text == first.raw_text
+    assert duplicate.similarity == 1 - duplicate.distance / 64
+    assert cache.find(content_hash(b"v2")).resume_id == added.resume_id
+    assert cache.find(content_hash(b"v3")) is None
+
+
+def test_resume_cache_finds_near_duplicates_across_processes(tmp_path):
+    """Test that a near duplicate is found in the shared file when another worker parsed the first upload."""
+    path = str(tmp_path / "cache.sqlite3")
+    first_worker = ResumeCache(max_distance=3, max_entries=10, ttl_seconds=60, path=path)
+    second_worker = ResumeCache(max_distance=3, max_entries=10, ttl_seconds=60, path=path)
+    resume = ResumeData(raw_text=_resume_text(), metadata={"fingerprint": f"{simhash(_resume_text()):016x}"})
+
+    added = first_worker.add(content_hash(b"v1"), resume)
+    duplicate = second_worker.add(content_hash(b"v2"), ResumeData(raw_text=_resume_text(phone="555-987-6543")))
+
+    assert duplicate.resume_id == added.resume_id and duplicate.reused
+    assert first_worker.find(content_hash(b"v2")).resume.raw_text == resume.raw_text
+    assert second_worker.get(added.resume_id).metadata == resume.metadata
+
+
+def test_ttl_cache_expires_and_evicts():
+    """Test LRU eviction, expiry and the eviction callback."""
+    evicted = []
+    cache = TTLCache(max_entries=2, ttl_seconds=0.05, on_evict=lambda key, value: evicted.append(key))
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert evicted == ["b"]
+
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert "a" in evicted
+
+
+def test_sqlite_cache_shared_between_instances(tmp_path):
+    """Test that two caches on one file (as in two workers) see each other's entries."""
+    path = str(tmp_path / "cache.sqlite3")
+    writer = SQLiteCache(path, "generations", max_entries=2, ttl_seconds=60)
+    reader = SQLiteCache(path, "generations", max_entries=2, ttl_seconds=60)
+    other = SQLiteCache(path, "job_descriptions", max_entries=2, ttl_seconds=60)
+
+    writer.set(("a", 1), {"questions": [1, 2]})
+    writer.set("b", "two")
+    writer.set("c", "three")
+
+    assert reader.get(("a", 1)) is None  # Evicted: only max_entries are kept
+    assert reader.get("c") == "three"
+    assert len(reader) == 2
+    assert other.get("c") is None
+    assert reader.pop("b") == "two"
+    assert writer.get("b") is None
+
+
+def test_cache_add_claims_a_key_once(tmp_path):
+    """Test that add() stores a value only while the key holds no live entry, in either cache."""
+    path = str(tmp_path / "cache.sqlite3")
+    first = SQLiteCache(path, "idempotency", max_entries=10, ttl_seconds=60)
+    second = SQLiteCache(path, "idempotency", max_entries=10, ttl_seconds=60)
+    local = TTLCache(max_entries=10, ttl_seconds=60)
+
+    for claimant, rival in ((first, second), (local, local)):
+        assert claimant.add("key", "first", ttl_seconds=0.05)
+        assert not rival.add("key", "second")
+        assert rival.get("key") == "first"
+        time.sleep(0.06)
+        assert rival.add("key", "second")
+        assert claimant.get("key") == "second"
+
+
+def test_sqlite_cache_stores_models_as_json(tmp_path):
+    """Test that shared cache values are JSON validated into their model, and foreign data is ignored."""
+    import pickle
+    import sqlite3
+
+    from src.models import UploadedFile
+
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, "uploaded_files", max_entries=10, ttl_seconds=60, value_type=UploadedFile)
+    cache.set(("owner", "abc"), UploadedFile(name="files/1", uri="local://files/1"))
+
+    with sqlite3.connect(path) as conn:
+        stored = conn.execute("SELECT value FROM cache").fetchone()[0]
+        conn.execute(
+            "INSERT INTO cache VALUES (?, ?, ?, ?)",
+            ("uploaded_files", repr("pickled"), pickle.dumps(object()), time.time() + 60),
+        )
+
+    assert stored.startswith(b"{")
+    assert cache.get(("owner", "abc")) == UploadedFile(name="files/1", uri="local://files/1")
+    assert cache.get("pickled") is None
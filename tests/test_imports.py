@@ -0,0 +1,25 @@
+"""Tests that heavy dependencies stay out of the entry points' import path."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_MODULES = ("google.genai", "pdfplumber", "pdfminer", "docx", "lxml.etree", "numpy")
+
+
+@pytest.mark.parametrize("statement", [
+    "import src.api.main",
+    "import cli, src.agent, src.parsers, src.models",
+    "import src.parsers.pool",
+])
+def test_heavy_dependencies_imported_lazily(statement):
+    """Test that importing an entry point does not import the Gemini SDK or document libraries."""
+    check = f"{statement}; import sys; print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", check], cwd=ROOT, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
@@ -0,0 +1,41 @@
+"""Tests for resume-to-job-description match scoring."""
+
+from src.matching import rank_resumes, tfidf_scores
+from src.models import ResumeData
+from src.parsers import ResumeParser
+from src.parsers.terms import term_vector
+
+
+def test_tfidf_scores_rank_relevant_documents_first():
+    """Test that cosine scores favour documents sharing rare job terms."""
+    scores = tfidf_scores(
+        term_vector("Kubernetes platform engineer, Terraform and Go"),
+        [
+            term_vector("Pastry chef with bakery management experience"),
+            term_vector("Platform engineer running Kubernetes clusters with Terraform in Go"),
+            term_vector(""),
+        ],
+    )
+
+    assert scores[1] > scores[0]
+    assert scores[2] == 0
+    assert 0 <= scores.min() and scores.max() <= 1
+
+
+def test_rank_resumes_reports_matched_and_missing_skills():
+    """Test ranking order, top_k and skill overlap for parsed resumes."""
+    parser = ResumeParser()
+    resumes = [
+        parser.parse(b"Ana Lima\nJava developer using Spring and Oracle.\n", "a.txt"),
+        parser.parse(b"Jane Doe\nPython and Django engineer deploying with Docker.\n", "b.txt"),
+        ResumeData(raw_text="Unparsed python text", skills=[]),
+    ]
+
+    ranking = rank_resumes("Python engineer with Django, Docker and Kubernetes", resumes, top_k=2)
+
+    assert ranking.total_resumes == 3
+    assert [match.index for match in ranking.matches][0] == 1
+    assert len(ranking.matches) == 2
+    best = ranking.matches[0]
+    assert {"python", "django", "docker"} <= {skill.lower() for skill in best.matched_skills}
+    assert [skill.lower() for skill in best.missing_skills] == ["kubernetes"]
@@ -0,0 +1,104 @@
+"""Tests for the metrics registry and timing helper."""
+
+import pytest
+
+from src.metrics import (
+    ERRORS,
+    STAGE_SECONDS,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    mark_process_dead,
+    recording,
+    replay,
+    timed,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test the Prometheus text rendering of a labelled histogram."""
+    registry = Registry()
+    histogram = Histogram("test_seconds", "Test latency", ["stage"], buckets=(0.1, 1.0), registry=registry)
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, stage="parse")
+
+    text = registry.render()
+
+    assert "# TYPE test_seconds histogram" in text
+    assert 'test_seconds_bucket{stage="parse",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{stage="parse",le="1"} 2' in text
+    assert 'test_seconds_bucket{stage="parse",le="+Inf"} 3' in text
+    assert 'test_seconds_count{stage="parse"} 3' in text
+
+
+def test_recorded_samples_replay_into_another_registry():
+    """Test that operations recorded in one process can be applied in another."""
+    worker, supervisor = Registry(), Registry()
+    Counter("test_fallbacks_total", "Fallbacks", ["fallback"], registry=worker)
+    counter = Counter("test_fallbacks_total", "Fallbacks", ["fallback"], registry=supervisor)
+
+    with recording() as samples:
+        worker.get("test_fallbacks_total").inc(fallback="docx")
+    replay(samples, registry=supervisor)
+
+    assert counter.value(fallback="docx") == 1
+
+
+def test_timed_counts_errors_and_observes_duration():
+    """Test that a failing stage is timed and counted by exception class."""
+    before = STAGE_SECONDS.value(stage="test_stage", format="txt")
+
+    with pytest.raises(KeyError):
+        with timed("test_stage", format="txt"):
+            raise KeyError("missing")
+
+    assert STAGE_SECONDS.value(stage="test_stage", format="txt") == before + 1
+    assert ERRORS.value(stage="test_stage", error="KeyError") >= 1
+
+
+def _worker_registry(directory, process_id):
+    registry = Registry()
+    Counter("test_requests_total", "Requests", ["route"], registry=registry)
+    Gauge("test_in_flight", "In flight", registry=registry)
+    Histogram("test_seconds", "Latency", buckets=(1.0,), registry=registry)
+    registry.share(str(directory), flush_seconds=0, process_id=process_id)
+    return registry
+
+
+def test_shared_registries_render_the_sum_of_every_worker(tmp_path):
+    """Test that a scrape on one worker covers every worker, including exited ones."""
+    first, second = _worker_registry(tmp_path, 1), _worker_registry(tmp_path, 2)
+    for registry, requests in ((first, 2), (second, 3)):
+        for _ in range(requests):
+            registry.get("test_requests_total").inc(route="/health")
+        registry.get("test_in_flight").inc()
+        registry.get("test_seconds").observe(0.5)
+    second.flush()
+
+    text = first.render()
+    assert 'test_requests_total{route="/health"} 5' in text
+    assert "test_in_flight 2" in text
+    assert 'test_seconds_bucket{le="1"} 2' in text
+
+    mark_process_dead(str(tmp_path), 2)
+    text = first.render()
+    assert 'test_requests_total{route="/health"} 5' in text
+    assert "test_in_flight 1" in text
+    assert "test_seconds_count 2" in text
+
+
+def test_shared_metrics_are_json_and_never_unpickled(tmp_path):
+    """Test that worker snapshots are JSON files and a planted pickle is skipped, not loaded."""
+    import json
+    import pickle
+
+    registry = _worker_registry(tmp_path, 1)
+    registry.get("test_requests_total").inc(route="/health")
+    registry.flush()
+    (tmp_path / "metrics-2.json").write_bytes(pickle.dumps({"test_requests_total": ("counter", {})}))
+
+    with open(tmp_path / "metrics-1.json", encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["test_requests_total"] == {"kind": "counter", "values": [[["/health"], 1.0]]}
+    assert 'test_requests_total{route="/health"} 1' in registry.render()
@@ -0,0 +1,241 @@
+"""Tests for document parsing."""
+
+import pytest
+
+from src.parsers import ResumeParser, ResumeParserError
+
+
+def test_pdf_parse_reports_stats(make_pdf):
+    """Test that PDF parsing extracts every page and reports resource stats."""
+    pdf_bytes = make_pdf(["Jane Doe", "Python engineer jane@example.com"])
+
+    resume = ResumeParser().parse_pdf_bytes(pdf_bytes)
+
+    assert "Jane Doe" in resume.raw_text
+    assert resume.email == "jane@example.com"
+    stats = resume.metadata["parse_stats"]
+    assert stats["pages"] == 2
+    assert stats["bytes"] == len(pdf_bytes)
+    # Measured over this parse only, not the process lifetime
+    assert stats["peak_rss_mb"] > 0
+    assert 0 <= stats["rss_growth_mb"] <= stats["peak_rss_mb"]
+
+
+def test_pdf_parse_limits(make_pdf):
+    """Test that page and size limits are enforced."""
+    pdf_bytes = make_pdf(["one", "two", "three"])
+
+    with pytest.raises(ResumeParserError):
+        ResumeParser(max_pages=2).parse_pdf_bytes(pdf_bytes)
+    with pytest.raises(ResumeParserError):
+        ResumeParser(max_bytes=100).parse_pdf_bytes(pdf_bytes)
+
+
+def test_pdf_closed_after_parsing(make_pdf, monkeypatch):
+    """Test that the PDF is closed after a successful parse and after a rejected one."""
+    import pdfplumber
+
+    closed = []
+    close = pdfplumber.PDF.close
+    monkeypatch.setattr(pdfplumber.PDF, "close", lambda pdf: closed.append(pdf) or close(pdf))
+    pdf_bytes = make_pdf(["one", "two", "three"])
+
+    ResumeParser().parse_pdf_bytes(pdf_bytes)
+    with pytest.raises(ResumeParserError):
+        ResumeParser(max_pages=2).parse_pdf_bytes(pdf_bytes)
+
+    assert len(closed) == 2
+
+
+def test_format_detected_from_content(make_pdf, make_docx):
+    """Test that mislabelled uploads are parsed by their real format."""
+    parser = ResumeParser()
+
+    pdf_resume = parser.parse(make_pdf(["Jane Doe", "Kubernetes"]), "resume.docx")
+    docx_resume = parser.parse(make_docx(["John Smith", "john@example.com"]), "resume.pdf")
+    txt_resume = parser.parse(b"Ana Lima\nana@example.com\n", "resume.pdf")
+
+    assert pdf_resume.metadata["parse_stats"]["format"] == "pdf"
+    assert docx_resume.metadata["parse_stats"]["format"] == "docx"
+    assert docx_resume.email == "john@example.com"
+    assert txt_resume.name == "Ana Lima"
+    assert parser.extract_text(make_docx(["Senior Engineer"]), "jd.txt") == "Senior Engineer"
+
+
+def test_unsupported_format_rejected():
+    """Test that binary, non-document content is rejected."""
+    from src.parsers import UnsupportedFormatError
+
+    with pytest.raises(UnsupportedFormatError):
+        ResumeParser().parse(b"\x00\x01\x02binary", "resume.txt")
+
+
+def test_resume_sections_populate_structured_fields():
+    """Test that section segmentation fills education, work history and experience."""
+    from datetime import date
+    from src.parsers import segment_resume
+
+    text = (
+        "Jane Doe\n"
+        "Summary\n"
+        "Backend engineer.\n"
+        "Professional Experience\n"
+        "Senior Engineer, Acme Corp\n"
+        "Jan 2019 - Present\n"
+        "- Built the Kubernetes platform\n"
+        "Software Engineer, Initech   Jun 2016 - Dec 2019\n"
+        "Education:\n"
+        "B.S. Computer Science, State University, 2012 - 2016\n"
+        "Skills\n"
+        "Python, Go\n"
+    )
+
+    sections = segment_resume(text, today=date(2024, 6, 1))
+
+    assert sections.experience_years == 8
+    assert sections.work_history == [
+        "Senior Engineer, Acme Corp | Jan 2019 - Present",
+        "Software Engineer, Initech   Jun 2016 - Dec 2019",
+    ]
+    assert sections.education == ["B.S. Computer Science, State University, 2012 - 2016"]
+    assert sections.sections["skills"] == "Python, Go"
+    assert sections.sections["summary"] == "Backend engineer."
+
+    resume = ResumeParser().parse(text.encode())
+    assert resume.education == sections.education
+    assert resume.experience_years is not None
+
+
+def test_docx_streaming_reader_emits_merged_cells_once():
+    """Test that DOCX text comes out once per cell, in document order."""
+    import io
+    from docx import Document
+
+    doc = Document()
+    doc.add_paragraph("Jane Doe")
+    table = doc.add_table(rows=2, cols=3)
+    table.cell(0, 0).merge(table.cell(0, 2)).text = "Python"
+    table.cell(1, 0).text = "Go"
+    doc.add_paragraph("References available")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+
+    resume = ResumeParser().parse(buffer.getvalue())
+
+    assert resume.raw_text == "Jane Doe\nPython\nGo\nReferences available\n"
+
+
+def test_docx_uncompressed_size_limit(make_docx):
+    """Test that oversized DOCX bodies are rejected before inflating them."""
+    docx_bytes = make_docx(["Jane Doe"] * 50)
+
+    with pytest.raises(ResumeParserError):
+        ResumeParser(max_xml_bytes=100).parse(docx_bytes)
+
+
+def test_normalization_strips_repeated_page_furniture():
+    """Test that repeated headers, page numbers, bullet glyphs and duplicate lines are removed."""
+    from src.parsers import normalize_pages
+
+    pages = [
+        "Jane Doe | jane@example.com\nSummary\n•   Backend   engineer\n\n\n\nPage 1 of 2",
+        "Jane Doe | jane@example.com\nShipped the payments platform twice\n"
+        "Shipped the payments platform twice\nPage 2 of 2",
+    ]
+
+    text, stats = normalize_pages(pages)
+
+    assert text.count("Jane Doe") == 1
+    assert "Page" not in text
+    assert "- Backend engineer" in text
+    assert text.count("Shipped the payments platform twice") == 1
+    assert "\n\n\n" not in text
+    assert stats["repeated_lines_removed"] == 1
+    assert stats["page_number_lines_removed"] == 2
+    assert stats["duplicate_lines_removed"] == 1
+    assert stats["chars_removed"] == stats["chars_before"] - stats["chars_after"] > 0
+
+
+def test_normalization_keeps_dated_entries_across_pages():
+    """Test that date-range lines differing only in their years are not mistaken for page furniture."""
+    from src.parsers import normalize_pages, segment_resume
+
+    pages = [
+        "Sam Park | sam@example.com | Page 1 of 2\nExperience\n"
+        "Staff Engineer, Acme\n2017 - 2020\n- Led the billing rewrite\n"
+        "Senior Engineer, Globex\n2014 - 2017\n- Built the data pipeline",
+        "Sam Park | sam@example.com | Page 2 of 2\n"
+        "Engineer, Initech\n2011 - 2014\n- Maintained the reporting stack\n"
+        "Education\nBSc Computer Science",
+    ]
+
+    text, stats = normalize_pages(pages)
+
+    assert text.count("Sam Park") == 1
+    assert stats["repeated_lines_removed"] == 1
+    for dates in ("2017 - 2020", "2014 - 2017", "2011 - 2014"):
+        assert dates in text
+    assert segment_resume(text).experience_years == 9
+
+
+def test_normalization_stats_in_parse_stats():
+    """Test that the parser reports normalization stats and can skip the stage."""
+    text = b"Ana Lima\n\n\n\n\xe2\x80\xa2 Python\n"
+
+    resume = ResumeParser().parse(text, "resume.txt")
+    raw = ResumeParser(normalize_text=False).parse(text, "resume.txt")
+
+    assert resume.raw_text == "Ana Lima\n\n- Python\n"
+    assert resume.metadata["parse_stats"]["normalization"]["chars_removed"] > 0
+    assert "normalization" not in raw.metadata["parse_stats"]
+
+
+def test_job_description_digest_keeps_role_content():
+    """Test that the digest keeps title, skills and responsibilities and drops boilerplate."""
+    from src.parsers import digest_job_description, job_description_id
+
+    text = (
+        "Senior Backend Engineer\n"
+        "About us\n"
+        "We are a fintech company that loves Salesforce.\n"
+        "What you'll do:\n"
+        "- Design payment APIs in Python and Golang\n"
+        "- Own PostgreSQL performance\n"
+        "Requirements\n"
+        "- 5+ years of backend experience with Kubernetes\n"
+        "Benefits\n"
+        "- Unlimited PTO and a generous learning budget for every single engineer\n"
+    )
+
+    digest = digest_job_description(text)
+
+    assert digest.title == "Senior Backend Engineer"
+    assert digest.required_skills == ["python", "go", "postgresql", "kubernetes"]
+    assert digest.responsibilities == ["Design payment APIs in Python and Golang", "Own PostgreSQL performance"]
+    assert digest.experience == "5+ years"
+    assert "PTO" not in digest.text and len(digest.text) < len(text)
+
+
+def test_job_description_digest_keeps_prose_descriptions():
+    """Test that a job description without headings or bullets keeps its prose in the digest."""
+    from src.parsers import digest_job_description
+    from src.parsers.job_description import MAX_DESCRIPTION_LENGTH
+
+    text = (
+        "Backend Engineer, Payments\n"
+        "We're hiring a backend engineer to own our payment ledger. You will design and operate "
+        "services in Go and PostgreSQL that move money for thousands of merchants, lead incident "
+        "reviews, and work with finance on reconciliation. You have shipped distributed systems "
+        "in production, are comfortable on call, and care about correctness under failure.\n"
+    )
+    long_text = text + ("Our team values careful reviews and clear written design documents. " * 40)
+
+    digest = digest_job_description(text)
+    long_digest = digest_job_description(long_text)
+
+    assert digest.title == "Backend Engineer, Payments"
+    assert "hiring" not in digest.required_skills
+    assert "reconciliation" in digest.text and "correctness under failure" in digest.text
+    assert "Description:" in long_digest.text and "reconciliation" in long_digest.text
+    assert len(long_digest.text) < len(long_text)
+    assert len(long_digest.text) <= MAX_DESCRIPTION_LENGTH + 200
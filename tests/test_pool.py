@@ -0,0 +1,43 @@
+"""Tests for the supervised parse worker pool."""
+
+import asyncio
+
+import pytest
+
+from src.parsers import ParseBudgetExceededError, ParsePool, UnsupportedFormatError
+
+
+@pytest.fixture
+def pool():
+    """Single-worker parse pool, shut down after the test."""
+    parse_pool = ParsePool(workers=1, timeout_seconds=0.05)
+    yield parse_pool
+    parse_pool.shutdown()
+
+
+def test_pool_parses_and_reraises_parser_errors(pool):
+    """Test that results and parser errors cross the process boundary."""
+    pool.timeout_seconds = 30
+    resume = asyncio.run(pool.parse(b"Jane Doe\njane@example.com\n", "resume.txt"))
+
+    assert resume.email == "jane@example.com"
+    with pytest.raises(UnsupportedFormatError):
+        asyncio.run(pool.parse(b"\x00\x01binary", "resume.txt"))
+    assert pool.stats()["killed_parses"] == 0
+
+
+def test_pool_kills_and_replaces_slow_worker(pool):
+    """Test that a parse over the time budget is killed and the worker replaced."""
+    slow_document = ("Python engineer building distributed systems at scale\n" * 150_000).encode()
+    pool.timeout_seconds = 30
+    asyncio.run(pool.parse(b"warm up", "warmup.txt"))
+    pool.timeout_seconds = 0.05
+
+    with pytest.raises(ParseBudgetExceededError):
+        asyncio.run(pool.parse(slow_document, "huge.txt"))
+
+    assert pool.stats()["killed_parses"] == 1
+    pool.timeout_seconds = 30
+    resume = asyncio.run(pool.parse(b"Ana Lima\nana@example.com\n", "resume.txt"))
+    assert resume.name == "Ana Lima"
+    assert pool.stats()["started"] == 1
@@ -0,0 +1,47 @@
+"""Tests for the prefork production server setup."""
+
+import os
+import stat
+
+import pytest
+
+from src.api.server import configure_shared_state, private_state_dir
+from src.config import settings
+
+
+def test_shared_state_splits_parse_workers(monkeypatch, tmp_path):
+    """Test that shared state files are configured and parse processes and limits are divided between workers."""
+    monkeypatch.setattr(settings, "document_store_path", None)
+    monkeypatch.setattr(settings, "shared_cache_path", None)
+    monkeypatch.setattr(settings, "parse_workers", None)
+    monkeypatch.setattr(settings, "admission_processes", 1)
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+
+    state_dir = configure_shared_state(str(tmp_path), workers=4)
+
+    assert state_dir == str(tmp_path)
+    assert settings.document_store_path == os.path.join(state_dir, "documents.sqlite3")
+    assert settings.shared_cache_path == os.path.join(state_dir, "cache.sqlite3")
+    assert settings.parse_workers == 2
+    assert settings.admission_processes == 4
+
+
+def test_state_dir_must_be_private(monkeypatch, tmp_path):
+    """Test that shared state never lives in a directory other users can write."""
+    monkeypatch.setattr(settings, "server_state_dir", None)
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+
+    with pytest.raises(PermissionError):
+        private_state_dir(str(shared))
+
+    created = private_state_dir(str(tmp_path / "new"))
+    defaults = [private_state_dir(), private_state_dir()]
+    try:
+        assert stat.S_IMODE(os.stat(created).st_mode) == 0o700
+        assert stat.S_IMODE(os.stat(defaults[0]).st_mode) == 0o700
+        assert defaults[0] != defaults[1]
+    finally:
+        for path in defaults:
+            os.rmdir(path)
@@ -0,0 +1,133 @@
+"""Tests for the taxonomy-backed skill matcher."""
+
+from src.parsers import SkillMatcher, get_skill_matcher
+
+
+def test_word_boundaries_and_aliases():
+    """Test that matches respect word boundaries and aliases normalize."""
+    matcher = get_skill_matcher()
+
+    skills = matcher.find("Worked at Google to maintain K8s clusters backed by Postgres and C++")
+
+    assert "go" not in skills
+    assert "artificial intelligence" not in skills
+    assert "kubernetes" in skills
+    assert "postgresql" in skills
+    assert "c++" in skills
+
+
+def test_everyday_words_and_nested_aliases_are_ignored():
+    """Test that everyday-word skills match only as written and aliases inside longer matches are dropped."""
+    matcher = get_skill_matcher()
+
+    assert matcher.find("Willing to go the extra mile and react to feedback that sparks ideas") == []
+    assert matcher.find("Strong communication skills; experience hiring and mentoring engineers") == []
+    assert matcher.find("Golang and React.js services on Node.js") == ["go", "react", "node.js"]
+    assert matcher.find("JS and TypeScript") == ["javascript", "typescript"]
+
+
+def test_comma_separated_skills_line():
+    """Test that short skill names that are also everyday words are found in a skills list."""
+    matcher = get_skill_matcher()
+
+    assert matcher.find("Skills: React, TypeScript, Go, Spark, Swift") == [
+        "react", "typescript", "go", "apache spark", "swift"
+    ]
+
+
+def test_bundled_taxonomy_is_large():
+    """Test that the bundled taxonomy loads thousands of surface forms."""
+    matcher = get_skill_matcher()
+
+    assert matcher.skill_count > 1000
+    assert matcher.pattern_count > 2000
+
+
+def test_custom_taxonomy():
+    """Test building a matcher from an in-memory taxonomy."""
+    matcher = SkillMatcher({"kubernetes": ["k8s"], "~Go": ["golang"], "r": ["rstats"]})
+
+    assert matcher.find("Golang services on k8s, analysis in R and rstats") == [
+        "go", "kubernetes", "r"
+    ]
+    assert matcher.find("Go services, ready to go") == ["go"]
+    assert matcher.find("ready to go") == []
+
+
+def test_skill_gap_derives_focus_areas():
+    """Test overlap, gaps and focus areas derived from a resume and a job description."""
+    from src.parsers import analyze_skill_gap
+
+    gap = analyze_skill_gap(
+        "Backend engineer: Python, Django, PostgreSQL and React.js.",
+        "We need Kubernetes, Python and PostgreSQL experience; Terraform is a plus.",
+        max_focus_areas=3,
+    )
+
+    assert gap.matched_skills == ["python", "postgresql"]
+    assert gap.missing_skills == ["kubernetes", "terraform"]
+    assert "react" in gap.extra_skills
+    assert gap.focus_areas == ["python", "postgresql", "kubernetes"]
+    assert gap.domain == "python, postgresql, kubernetes"
+
+
+def test_skill_gap_on_realistic_resume_and_job_description():
+    """Test focus areas for a real-world resume and job posting, with prose, soft skills and process."""
+    from src.parsers import analyze_skill_gap
+
+    resume = (
+        "Priya Natarajan\n"
+        "Senior Software Engineer | priya@example.com\n\n"
+        "Summary\n"
+        "Backend engineer who likes to go deep on reliability and react quickly to incidents.\n\n"
+        "Experience\n"
+        "Staff Engineer, Ledgerly (2019 - 2024)\n"
+        "- Built payment services in Go backed by PostgreSQL, deployed on Kubernetes\n"
+        "- Led hiring for the platform team and mentored four engineers\n"
+        "Software Engineer, Shoply (2015 - 2019)\n"
+        "- Built the storefront in React and TypeScript\n\n"
+        "Skills\n"
+        "Go, React, TypeScript, PostgreSQL, Kubernetes, Docker, Agile"
+    )
+    job_description = (
+        "We're hiring a Senior Backend Engineer to join our payments team. You will design "
+        "and operate services written in Go, store data in PostgreSQL and run everything on "
+        "Kubernetes with Terraform. We work in an agile, Scrum-based process. You have strong "
+        "communication skills, enjoy mentoring others and can go from idea to production quickly. "
+        "Experience with Kafka is a plus."
+    )
+
+    gap = analyze_skill_gap(resume, job_description, max_focus_areas=6)
+
+    assert {"go", "react", "postgresql", "kubernetes"} <= set(gap.resume_skills)
+    assert "agile" in gap.matched_skills and "scrum" in gap.missing_skills
+    assert gap.focus_areas == ["go", "postgresql", "kubernetes", "payments", "terraform", "apache kafka"]
+    for soft in ("hiring", "communication skills", "mentoring"):
+        assert soft not in gap.job_skills
+
+
+def test_agent_fills_focus_areas_and_domain_from_skill_gap():
+    """Test that generation derives the domain and focus areas when none are given."""
+    from types import SimpleNamespace
+
+    from src.agent import InterviewQuestionAgent
+    from src.models import RoundType
+
+    prompts = []
+
+    def generate_content(model, contents, config):
+        prompts.append(contents)
+        return SimpleNamespace(text="[]")
+
+    agent = InterviewQuestionAgent(api_key="test")
+    agent.client = SimpleNamespace(models=SimpleNamespace(generate_content=generate_content))
+
+    response = agent.generate_questions(
+        resume_text="Data engineer using PySpark and Airflow",
+        job_description="Apache Spark and Kafka streaming",
+        round_type=RoundType.DOMAIN_SPECIFIC,
+    )
+
+    assert "DOMAIN FOCUS: apache spark, apache kafka" in prompts[0]
+    assert response.metadata["focus_areas_derived"] is True
+    assert response.metadata["skill_gap"]["missing_skills"] == ["apache kafka"]
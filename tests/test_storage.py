@@ -0,0 +1,51 @@
+"""Tests for the document store backends."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.models import DocumentKind, ResumeData, StoredDocument
+from src.storage import MemoryDocumentStore, SQLiteDocumentStore
+
+
+def _document(document_id, ttl_seconds=60):
+    now = datetime.now(timezone.utc)
+    return StoredDocument(
+        document_id=document_id,
+        kind=DocumentKind.RESUME,
+        created_at=now,
+        expires_at=now + timedelta(seconds=ttl_seconds),
+        resume=ResumeData(raw_text="Jane Doe", skills=["python"]),
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Each document store backend."""
+    if request.param == "sqlite":
+        return SQLiteDocumentStore(str(tmp_path / "documents.db"))
+    return MemoryDocumentStore(max_entries=10, ttl_seconds=60)
+
+
+def test_store_round_trip_and_delete(store):
+    """Test that documents are stored, returned intact and deleted."""
+    store.put(_document("abc"))
+
+    document = store.get("abc")
+
+    assert document.resume.skills == ["python"]
+    assert store.delete("abc") is True
+    assert store.get("abc") is None
+    assert store.delete("abc") is False
+
+
+def test_sqlite_store_persists_and_expires(tmp_path):
+    """Test that SQLite documents survive reopening and expire by their deadline."""
+    path = str(tmp_path / "documents.db")
+    SQLiteDocumentStore(path).put(_document("kept"))
+    SQLiteDocumentStore(path).put(_document("expired", ttl_seconds=-1))
+
+    reopened = SQLiteDocumentStore(path)
+
+    assert reopened.get("kept").resume.raw_text == "Jane Doe"
+    assert reopened.get("expired") is None